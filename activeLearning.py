@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+전처리된 VacTran 결과(4단계 CSV)로 저비용 대리 모델(surrogate)을 학습하고,
+모델 간 예측 불일치가 큰 형상을 다음 시뮬레이션 배치로 고르는 능동 학습(active learning) 모듈.
+
+대리 모델은 log(형상 파라미터), log(압력) -> log(컨덕턴스)를 2차 다항식 + 랜덤 푸리에 특징(RBF 커널 근사)으로
+릿지 회귀한 모델이며, 모델마다 다른 랜덤 특징과 SampleID 단위 부트스트랩 표본으로 학습한 앙상블입니다 (NumPy만 사용).
+2차 다항식만으로는 분자류-점성류 전이 구간을 따라가지 못해 데이터를 늘려도 오차가 줄지 않으므로 랜덤 특징을 더합니다.
+    - 정확도: 각 모델이 학습에 쓰지 않은(out-of-bag) 샘플에 대한 log 컨덕턴스 RMSE -> 상대 오차로 환산
+    - 불일치도: 후보 형상에 대해 압력 격자 전체에서 앙상블 예측값 표준편차의 평균
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from itertools import combinations_with_replacement
+
+FEATURE_COLUMNS = {
+    "pipe": ["Diameter_cm", "Length_cm"],
+    "elbow": ["Diameter_cm", "BendAngle_deg"],
+    "reducer": ["D1_cm", "D2_cm", "Length_cm"],
+    "expander": ["D1_cm", "D2_cm", "Length_cm"],
+}
+PRESSURE_COLUMN = "Pressure_Torr"
+TARGET_COLUMN = "Conductance_L_per_min"
+
+def load_training_rows(csv_paths, item_type):
+    """
+    4단계 CSV들을 읽어 학습에 사용할 행만 남깁니다 ('#' 주석 헤더 허용).
+    여러 CSV의 SampleID는 파일마다 1부터 시작하므로 파일 순서대로 오프셋을 더해 고유하게 만듭니다.
+    """
+    columns = ["SampleID"] + FEATURE_COLUMNS[item_type] + [PRESSURE_COLUMN, TARGET_COLUMN]
+    frames = []
+    id_offset = 0
+    for path in csv_paths:
+        df = pd.read_csv(path, comment="#")
+        if df.empty:
+            continue
+        df = df[columns].apply(pd.to_numeric, errors="coerce").dropna()
+        df = df[(df[columns[1:]] > 0).all(axis=1)]
+        df["SampleID"] = df["SampleID"].astype(np.int64) + id_offset
+        id_offset = int(df["SampleID"].max()) if not df.empty else id_offset
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+def polynomial_features(z, degree=2):
+    """표준화된 입력 z (n, d)에 대해 상수항 포함 degree차 이하 모든 단항식 특징을 만듭니다."""
+    n, d = z.shape
+    feats = [np.ones(n)]
+    for deg in range(1, degree + 1):
+        for combo in combinations_with_replacement(range(d), deg):
+            feats.append(np.prod(z[:, combo], axis=1))
+    return np.column_stack(feats)
+
+def log_inputs(geometry, pressure):
+    """형상 배열 (n, d)와 압력 배열 (n,)을 log 입력 (n, d+1)로 변환합니다."""
+    return np.log(np.column_stack([geometry, pressure]))
+
+def fit_ridge(x, y, ridge):
+    """릿지 회귀 계수 (상수항은 규제하지 않음)."""
+    penalty = ridge * np.eye(x.shape[1])
+    penalty[0, 0] = 0.0
+    return np.linalg.solve(x.T @ x + penalty, x.T @ y)
+
+def random_fourier_features(z, weights, phases):
+    """RBF 커널을 근사하는 랜덤 푸리에 특징 sqrt(2/m) * cos(z W + b)."""
+    return np.sqrt(2.0 / weights.shape[1]) * np.cos(z @ weights + phases)
+
+def surrogate_features(z, member):
+    """앙상블 멤버 하나의 설계 행렬: 2차 다항식 특징 + 멤버 고유의 랜덤 푸리에 특징."""
+    return np.hstack([polynomial_features(z, 2), random_fourier_features(z, member["weights"], member["phases"])])
+
+def fit_surrogate(rows, item_type, n_models=16, n_fourier=400, length_scale=0.7, ridge=1e-4, seed=None):
+    """
+    SampleID 단위 부트스트랩 앙상블 대리 모델을 학습합니다.
+
+    :param rows: load_training_rows 결과
+    :param n_fourier: 멤버당 랜덤 푸리에 특징 수
+    :param length_scale: 표준화된 log 입력 공간에서의 RBF 커널 길이 척도
+    :return: 대리 모델 dict (mean, std, members, oob_rmse, oob_rel_error, n_samples, pressure_grid)
+    """
+    features = FEATURE_COLUMNS[item_type]
+    inputs = log_inputs(rows[features].to_numpy(float), rows[PRESSURE_COLUMN].to_numpy(float))
+    target = np.log(rows[TARGET_COLUMN].to_numpy(float))
+    mean, std = inputs.mean(axis=0), inputs.std(axis=0)
+    std[std == 0] = 1.0
+    z = (inputs - mean) / std
+
+    sample_ids = rows["SampleID"].to_numpy()
+    unique_ids, row_group = np.unique(sample_ids, return_inverse=True)
+    rng = np.random.default_rng(seed)
+
+    members = []
+    oob_sq_err, oob_count = 0.0, 0
+    for _ in range(n_models):
+        member = {
+            "weights": rng.normal(0.0, 1.0 / length_scale, size=(z.shape[1], n_fourier)),
+            "phases": rng.uniform(0.0, 2 * np.pi, size=n_fourier),
+        }
+        x = surrogate_features(z, member)
+        draw = rng.integers(0, len(unique_ids), size=len(unique_ids))
+        counts = np.bincount(draw, minlength=len(unique_ids))[row_group].astype(float)
+        in_bag = counts > 0
+        sw = np.sqrt(counts[in_bag])
+        member["coef"] = fit_ridge(x[in_bag] * sw[:, None], target[in_bag] * sw, ridge)
+        members.append(member)
+        if (~in_bag).any():
+            residual = x[~in_bag] @ member["coef"] - target[~in_bag]
+            oob_sq_err += float(residual @ residual)
+            oob_count += residual.size
+
+    oob_rmse = float(np.sqrt(oob_sq_err / oob_count)) if oob_count else float("nan")
+    return {
+        "item_type": item_type,
+        "mean": mean,
+        "std": std,
+        "members": members,
+        "oob_rmse": oob_rmse,
+        "oob_rel_error": float(np.expm1(oob_rmse)),
+        "n_samples": len(unique_ids),
+        "pressure_grid": pressure_grid(rows[PRESSURE_COLUMN].to_numpy(float)),
+    }
+
+def pressure_grid(pressures, max_points=16):
+    """학습 데이터 압력 분포의 log 분위수로 불일치도 평가용 압력 격자를 만듭니다."""
+    log_p = np.log(pressures)
+    return np.unique(np.exp(np.quantile(log_p, np.linspace(0, 1, max_points))))
+
+def predict_ensemble(surrogate, geometry, pressure):
+    """앙상블 각 모델의 log 컨덕턴스 예측값 (n_models, n)."""
+    z = (log_inputs(geometry, pressure) - surrogate["mean"]) / surrogate["std"]
+    return np.array([surrogate_features(z, member) @ member["coef"] for member in surrogate["members"]])
+
+def disagreement_scores(surrogate, candidates_df):
+    """후보 형상별 불일치도: 압력 격자 전체에서 앙상블 log 컨덕턴스 예측 표준편차의 평균."""
+    geometry = candidates_df[FEATURE_COLUMNS[surrogate["item_type"]]].to_numpy(float)
+    grid = surrogate["pressure_grid"]
+    n, n_p = len(geometry), len(grid)
+    preds = predict_ensemble(surrogate, np.repeat(geometry, n_p, axis=0), np.tile(grid, n))
+    return preds.reshape(len(preds), n, n_p).std(axis=0).mean(axis=1)
+
+def select_next_batch(surrogate, candidates_df, batch_size, min_distance=0.05):
+    """
+    불일치도가 큰 순서로 batch_size개의 후보를 고릅니다.
+    이미 고른 후보와 log 형상 공간(학습 데이터 기준 표준화)에서 min_distance보다 가까운 후보는 건너뛰어
+    한 영역에 배치가 몰리지 않도록 합니다.
+
+    :return: (선택된 후보 DataFrame (disagreement 컬럼 포함), 전체 후보 불일치도 배열)
+    """
+    features = FEATURE_COLUMNS[surrogate["item_type"]]
+    scores = disagreement_scores(surrogate, candidates_df)
+    n_feat = len(features)
+    z = (np.log(candidates_df[features].to_numpy(float)) - surrogate["mean"][:n_feat]) / surrogate["std"][:n_feat]
+
+    chosen = []
+    for idx in np.argsort(-scores, kind="stable"):
+        if len(chosen) >= batch_size:
+            break
+        if chosen and np.min(np.linalg.norm(z[chosen] - z[idx], axis=1)) < min_distance:
+            continue
+        chosen.append(idx)
+
+    selected = candidates_df.iloc[chosen].copy()
+    selected["disagreement"] = scores[chosen]
+    return selected.reset_index(drop=True), scores
+
+def main():
+    parser = argparse.ArgumentParser(description="4단계 CSV로 대리 모델을 학습하고 후보 샘플 중 다음 시뮬레이션 배치를 선택합니다.")
+    parser.add_argument("item_type", choices=list(FEATURE_COLUMNS), help="아이템 타입")
+    parser.add_argument("csv_paths", nargs="+", help="학습에 사용할 4단계 전처리 CSV 파일들")
+    parser.add_argument("--candidates", required=True, help="후보 샘플 테이블 (.npz/.parquet/.feather/.csv/.xlsx)")
+    parser.add_argument("--batch_size", type=int, default=50, help="선택할 샘플 수 (기본값: 50)")
+    parser.add_argument("-o", "--output", default="next_batch.npz", help="선택된 샘플 테이블 출력 경로")
+    parser.add_argument("--seed", type=int, default=42, help="부트스트랩 난수 시드")
+    args = parser.parse_args()
+
+    from sampleTable import read_sample_table, write_sample_table
+    rows = load_training_rows(args.csv_paths, args.item_type)
+    surrogate = fit_surrogate(rows, args.item_type, seed=args.seed)
+    print(f"Surrogate: {surrogate['n_samples']} samples, OOB relative error={surrogate['oob_rel_error']:.4%}")
+    selected, scores = select_next_batch(surrogate, read_sample_table(args.candidates), args.batch_size)
+    selected["SampleID"] = np.arange(1, len(selected) + 1)
+    write_sample_table(selected.drop(columns=["disagreement"]), args.output)
+    print(f"Selected {len(selected)} samples (disagreement {selected['disagreement'].min():.4g}-{selected['disagreement'].max():.4g}, "
+          f"candidate mean {scores.mean():.4g}) -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+3단계(VacTran 자동화) 작업 큐의 동시 실행 수를 실행 중에 조절하는 AIMD 제어기.
+
+고정된 동시 실행 수는 워크스테이션마다 맞지 않습니다. 너무 크면 포커스/클립보드 구간이 충돌하고 CPU가 포화되어 실패가 늘고,
+너무 작으면 기계가 놉니다. 제어기는 min_slots개 슬롯으로 시작해 구간(window)마다 files/min과 실패율을 재고
+    - 실패율 > max_failure_rate          : 곱셈 감소 (슬롯 수 절반, min_slots 이상. 실패가 ADAPT_MIN_FAILURES개 이상일 때만)
+    - 직전 증가가 처리량을 늘리지 못함     : 슬롯 하나 되돌리고 ADAPT_HOLD_WINDOWS 구간 동안 유지
+    - 그 외                              : 덧셈 증가 (슬롯 하나 추가, max_slots 이하)
+로 활성 슬롯 수를 바꿉니다. 구간은 활성 슬롯 수의 ADAPT_WINDOW_PER_SLOT배 (최소 ADAPT_MIN_WINDOW) 파일이 끝나면 닫힙니다.
+autoVacModule.run_work_queue는 max_slots개의 작업 스레드를 띄우고, 번호가 활성 슬롯 수보다 큰 스레드는
+다음 파일을 꺼내지 않고 기다립니다 (처리 중인 파일은 끝까지 처리). 슬롯 수가 바뀔 때마다 구간 통계와 함께 출력합니다.
+"""
+
+import time
+import threading
+from typing import Dict, Any
+
+ADAPT_MIN_WINDOW = 8 # 구간 하나의 최소 파일 수
+ADAPT_WINDOW_PER_SLOT = 3 # 구간 크기 = 활성 슬롯 수 x 이 값 (슬롯마다 파일 세 개 정도를 본 뒤 판단)
+ADAPT_MIN_FAILURES = 2 # 구간 하나의 우연한 실패 한 건으로 슬롯 수를 절반으로 줄이지 않도록
+ADAPT_MIN_GAIN = 0.05 # 슬롯을 늘린 뒤 files/min이 이 비율 이상 늘지 않으면 늘리기 전으로 되돌림
+ADAPT_HOLD_WINDOWS = 3 # 되돌린 뒤 다시 늘려 보기 전까지 유지할 구간 수
+DEFAULT_MAX_FAILURE_RATE = 0.1 # 구간 실패율이 이 값을 넘으면 슬롯 수를 절반으로
+
+def new_controller(min_slots: int, max_slots: int, max_failure_rate: float = DEFAULT_MAX_FAILURE_RATE) -> Dict[str, Any]:
+    """min_slots개 활성 슬롯으로 시작하는 제어기 상태 (슬롯 수는 [min_slots, max_slots] 안에서 조절)"""
+    if not 1 <= min_slots <= max_slots:
+        raise ValueError(f"동시 실행 범위가 올바르지 않습니다: {min_slots}..{max_slots}")
+    return {
+        'slots': min_slots,
+        'min_slots': min_slots,
+        'max_slots': max_slots,
+        'max_failure_rate': max_failure_rate,
+        'cond': threading.Condition(),
+        'window_started': time.perf_counter(),
+        'window_done': 0,
+        'window_failed': 0,
+        'prev_files_per_min': None,
+        'last_change': None, # "increase" | "decrease" | "revert"
+        'hold': 0,
+        'windows': 0,
+        'changes': [], # 슬롯 수 변경 기록 (run_vactran_automation 요약에 포함)
+    }
+
+
+def slot_active(controller: Dict[str, Any], slot: int) -> bool:
+    """슬롯 번호(1부터)가 현재 활성 슬롯 수 안에 있는지"""
+    return slot <= controller['slots']
+
+
+def record_outcome(controller: Dict[str, Any], status: str):
+    """파일 하나의 결과(status: "done"/"failed")를 현재 구간에 더하고, 구간이 끝났으면 슬롯 수를 조절합니다."""
+    with controller['cond']:
+        controller['window_done' if status == "done" else 'window_failed'] += 1
+        finished = controller['window_done'] + controller['window_failed']
+        if finished >= max(ADAPT_MIN_WINDOW, ADAPT_WINDOW_PER_SLOT * controller['slots']):
+            close_window(controller)
+            controller['cond'].notify_all()
+
+
+def close_window(controller: Dict[str, Any]):
+    """구간 통계로 다음 슬롯 수를 정하고 (바뀌면 출력/기록) 새 구간을 시작합니다. controller['cond']를 잡은 상태에서 호출합니다."""
+    now = time.perf_counter()
+    elapsed = now - controller['window_started']
+    done, failed = controller['window_done'], controller['window_failed']
+    files_per_min = done / elapsed * 60 if elapsed > 0 else 0.0
+    failure_rate = failed / (done + failed)
+    prev = controller['prev_files_per_min']
+    slots = controller['slots']
+    controller['windows'] += 1
+
+    new_slots, reason = slots, None
+    if failure_rate > controller['max_failure_rate'] and failed >= ADAPT_MIN_FAILURES:
+        if slots > controller['min_slots']:
+            new_slots, reason = max(controller['min_slots'], slots // 2), "decrease"
+    elif controller['last_change'] == "increase" and prev is not None and files_per_min < prev * (1 + ADAPT_MIN_GAIN):
+        new_slots, reason = slots - 1, "revert"
+        controller['hold'] = ADAPT_HOLD_WINDOWS
+    elif controller['hold'] > 0:
+        controller['hold'] -= 1
+    elif slots < controller['max_slots']:
+        new_slots, reason = slots + 1, "increase"
+
+    controller['last_change'] = reason
+    if reason is not None:
+        change = {'window': controller['windows'], 'files': done + failed, 'seconds': round(elapsed, 2),
+                  'files_per_min': round(files_per_min, 2), 'failure_rate': round(failure_rate, 3),
+                  'from': slots, 'to': new_slots, 'reason': reason}
+        controller['changes'].append(change)
+        prev_text = f", 이전 구간 {prev:.2f} files/min" if prev is not None else ""
+        print(f"  [adaptive] window {change['window']}: {done + failed} files in {elapsed:.1f}s, {files_per_min:.2f} files/min, "
+              f"실패율 {failure_rate:.0%}{prev_text} -> slots {slots} -> {new_slots} ({reason})")
+    controller['slots'] = new_slots
+    controller['prev_files_per_min'] = files_per_min
+    controller['window_started'] = now
+    controller['window_done'] = controller['window_failed'] = 0
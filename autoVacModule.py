@@ -1,114 +1,423 @@
 import os
+import re
 import time
-import clipboard
-from pywinauto import Application, Desktop, keyboard
+import uuid
+import json
+import queue
+import importlib
+import threading
 import argparse
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+
+import runManifest
+import runTelemetry
+import adaptiveConcurrency
+from vacDriver.waitLog import format_waits, wait_until
+from dataPreprosessor.seriesRouter import split_conductance_blocks, split_model_blocks
 
 # === 환경 설정 ===
-VACTRAN_PATH = r"C:\Program Files (x86)\PEC\VacTran 3\VacTran.exe" # VacTran 설치 경로 확인 필요
 DEFAULT_CONCURRENCY = 4 # 동시에 실행할 기본 프로세스 수
+SCHEDULER_MODES = ["queue", "batch"] # queue: 슬롯이 비는 즉시 다음 파일 시작, batch: concurrency개씩 묶어 동시에 시작/종료
+# VacTran 조작 드라이버: 이름 -> 모듈. 드라이버는 실행 시점에 불러오므로 pywinauto/clipboard가 없어도 이 모듈은 import됩니다.
+# (VacTran 설치 경로, UI 대기 상한 등 실제 UI 설정은 vacDriver/pywinautoDriver.py에 있습니다.)
+DRIVERS = {
+    "pywinauto": "vacDriver.pywinautoDriver", # 실제 VacTran (Windows)
+    "fake": "vacDriver.fakeDriver", # VTSER를 읽어 가짜 결과를 만드는 드라이버 (Linux 테스트/처리량 측정용)
+}
+DEFAULT_DRIVER = "pywinauto"
+# 웜 풀(warm pool): 작업 슬롯마다 VacTran 프로세스 하나를 유지하고 다음 시리즈 파일을 파일 열기 대화상자로 불러옵니다.
+DEFAULT_RECYCLE_AFTER = 20 # 인스턴스 하나로 처리할 최대 파일 수 (넘으면 종료 후 새로 시작)
+# watchdog: 파일 하나가 deadline 안에 끝나지 않으면 (예상하지 못한 모달 대화상자, 그리지 않는 그래프 등) 인스턴스를 강제 종료하고
+# 파일을 실패로 기록한 뒤 최대 max_retries번까지 큐에 다시 넣습니다. 전체 실행 시간을 정하는 긴 꼬리(tail) 지연을 자르기 위한 것입니다.
+DEFAULT_FILE_DEADLINE = 120 # 파일 하나의 최대 처리 시간(초). 포커스(UI_LOCK)나 배치의 순차 처리 차례를 기다린 시간은 제외 (0이면 watchdog 끔)
+DEFAULT_MAX_RETRIES = 2 # 실패한 파일을 다시 처리하는 최대 횟수
+WATCHDOG_INTERVAL = 0.2 # watchdog이 deadline을 확인하는 간격
+
+# 키 입력/클립보드는 포커스된 창 하나에만 전달되므로, 큐 모드에서 포커스가 필요한 구간은 이 잠금으로 직렬화합니다.
+# (새 프로세스의 첫 창도 포커스를 가져가므로 창이 나타날 때까지는 잠금 안에서 시작하고,
+#  메인 창 탐색과 그래프 계산 대기는 잠금 밖에서 슬롯끼리 겹쳐 진행됩니다.)
+UI_LOCK = threading.Lock()
+# 클립보드 브로커: 시스템 클립보드는 프로세스 하나에 하나뿐이므로 표식 쓰기 ~ 복사 ~ 읽기를 이 잠금으로 직렬화하고,
+# 복사한 텍스트는 표식과 다르고 (복사가 실제로 일어남), 연속 두 번의 복사가 같으며 (창이 다 채워짐),
+# VTSER 섹션 수/컴포넌트와 구조가 맞을 때만 저장합니다. 잘리거나 다른 창의 텍스트가 결과 파일에 조용히 쓰이지 않도록 합니다.
+CLIPBOARD_LOCK = threading.Lock()
+CLIPBOARD_POLL_INTERVAL = 0.1 # 복사 재시도 간격 (같은 텍스트가 두 번 나오면 안정된 것으로 봄)
+CLIPBOARD_VERIFY_ATTEMPTS = 3 # 구조 확인에 실패한 텍스트를 다시 복사하는 최대 횟수
+DATA_ROW_PATTERN = re.compile(r'\s*\d+\)\s*([\d\.E+-]+),\s*([\d\.E+-]+)') # Conductance 블록의 데이터 줄 (pipePrepro와 같은 형식)
+MODEL_TAIL_PATTERN = re.compile(r'Molecular flow region at pressures\s*<\s*[\d\.E+-]+') # 모델 블록의 마지막 항목
+
+def load_driver(name: str = DEFAULT_DRIVER, options: Optional[Dict[str, Any]] = None):
+    """
+    이름으로 드라이버 모듈을 불러오고 options를 적용합니다 (driver.configure).
+    드라이버 함수: launch, attach, open_file, generate_graph, wait_graph, show_text_window, copy_selection,
+    read_clipboard, write_clipboard, clipboard_timeout, healthy, popup_text, kill, close, init_thread, configure
+    (vacDriver/pywinautoDriver.py 참고)
+    """
+    if name not in DRIVERS:
+        raise ValueError(f"알 수 없는 드라이버: {name} (가능: {', '.join(DRIVERS)})")
+    try:
+        driver = importlib.import_module(DRIVERS[name])
+    except ImportError as e:
+        if name == "pywinauto":
+            raise ImportError(f"pywinauto 드라이버를 불러올 수 없습니다 ({e}). 실제 VacTran 조작에는 Windows와 "
+                              "pywinauto, clipboard 패키지가 필요합니다 (pip install pywinauto clipboard). "
+                              "VacTran 없이 시험하려면 fake 드라이버를 사용하세요.") from e
+        raise
+    driver.configure(options)
+    return driver
+
+
+def assign_file(proc_info: Dict[str, Any], fname: str, input_dir_path: str, output_dir_path: str, attempt: int = 0):
+    """인스턴스가 처리할 VTSER 파일을 지정합니다 (출력 경로 설정, 파일별 실패 플래그/대기 기록/watchdog 상태 초기화)."""
+    base_fname_no_ext = os.path.splitext(fname)[0]
+    proc_info.update({
+        'in_path': os.path.join(input_dir_path, fname),
+        'out_path': os.path.join(output_dir_path, base_fname_no_ext + '.txt'),
+        'model_out_path': os.path.join(output_dir_path, base_fname_no_ext + '_model.txt'),
+        'output_dir': output_dir_path,
+        'fname': fname,
+        'failed': False,
+        'file_started': time.perf_counter(),
+        'wall_started': time.time(),
+        'waits': {},
+        'phases': [], # 단계별 소요 시간 (runTelemetry)
+        'attempt': attempt, # 0이면 첫 시도, n이면 n번째 재시도
+        'timed_out': None, # watchdog이 강제 종료한 이유
+        'popup': None, # 강제 종료 직전에 떠 있던 대화상자
+        'clipboard_rejects': 0 # 구조 확인에 실패해 다시 복사한 횟수 (클립보드 브로커)
+    })
+    proc_info.pop('paused_at', None)
 
-def find_main_window(app: Application, timeout: int = 20) -> Any:
-    """VacTran 메인 윈도우를 찾습니다."""
-    end_time = time.time() + timeout
-    while time.time() < end_time:
-        # 새로 시작된 프로세스에 속한 창만 대상으로 검색하여 정확도 향상
-        windows = Desktop(backend="uia").windows(process=app.process, title_re=".*VacTran.*", visible_only=True, enabled_only=True)
-        if windows:
-            try:
-                # connect 호출은 특정 창에 대한 제어권을 더 안정적으로 가져올 수 있습니다.
-                return app.connect(handle=windows[0].handle).window(handle=windows[0].handle)
-            except Exception:
-                # 예외 발생 시 이전 방식으로 재시도
-                return app.window(title_re=".*VacTran.*")
-        time.sleep(0.5)
-    raise RuntimeError(f"VacTran 메인 윈도우를 찾지 못했습니다 (프로세스 ID: {app.process}). 프로그램이 정상적으로 실행되었는지 확인하세요.")
 
+def new_proc_info(fname: str, input_dir_path: str, output_dir_path: str, attempt: int = 0) -> Dict[str, Any]:
+    """VTSER 파일 하나의 처리 정보(proc_info)를 만듭니다 (프로세스는 driver.launch에서 시작)."""
+    proc_info: Dict[str, Any] = {'pid': None}
+    assign_file(proc_info, fname, input_dir_path, output_dir_path, attempt)
+    return proc_info
 
-def process_batch(batch_files: List[str], input_dir_path: str, output_dir_path: str):
+
+def start_watchdog(driver, file_deadline: Optional[float]) -> Optional[Dict[str, Any]]:
+    """
+    감시 중인 파일(watch)이 file_deadline초 안에 끝나지 않으면 떠 있는 대화상자를 기록하고(driver.popup_text)
+    인스턴스를 강제 종료하는(driver.kill) watchdog 스레드를 시작합니다. 작업 슬롯은 진행 중이던 드라이버 호출이 실패하면서
+    파일을 실패로 기록하고 재시도합니다. file_deadline이 0/None이면 watchdog을 쓰지 않습니다 (None 반환).
+    """
+    if not file_deadline:
+        return None
+    watchdog = {'deadline': file_deadline, 'active': {}, 'lock': threading.Lock(), 'stop': threading.Event(), 'kills': 0}
+
+    def loop():
+        driver.init_thread()
+        while not watchdog['stop'].wait(WATCHDOG_INTERVAL):
+            now = time.perf_counter()
+            with watchdog['lock']:
+                expired = [proc_info for proc_info in watchdog['active'].values()
+                           if 'paused_at' not in proc_info and now > proc_info['deadline']]
+                for proc_info in expired:
+                    del watchdog['active'][id(proc_info)]
+                    proc_info['timed_out'] = f"{file_deadline:g}초 deadline 초과"
+                watchdog['kills'] += len(expired)
+            for proc_info in expired:
+                kill_stuck(driver, proc_info)
+
+    watchdog['thread'] = threading.Thread(target=loop, name="vactran-watchdog", daemon=True)
+    watchdog['thread'].start()
+    return watchdog
+
+
+def stop_watchdog(watchdog: Optional[Dict[str, Any]]):
+    if watchdog is not None:
+        watchdog['stop'].set()
+        watchdog['thread'].join()
+
+
+def kill_stuck(driver, proc_info: Dict[str, Any]):
+    """deadline을 넘긴 인스턴스의 대화상자를 proc_info['popup']에 기록하고 프로세스를 강제 종료합니다 (watchdog 스레드)."""
+    try:
+        proc_info['popup'] = driver.popup_text(proc_info)
+    except Exception as e:
+        print(f"  [watchdog] Failed to read popups of PID {proc_info['pid']}: {e}")
+    print(f"  [watchdog] {proc_info['fname']}: {proc_info['timed_out']} (PID: {proc_info['pid']})"
+          + (f", popup: '{proc_info['popup']}'" if proc_info['popup'] else "") + " -> killing")
+    try:
+        driver.kill(proc_info)
+    except Exception as e:
+        print(f"  [watchdog] !!! Failed to kill PID {proc_info['pid']}: {e}")
+
+
+def watch(watchdog: Optional[Dict[str, Any]], proc_info: Dict[str, Any]):
+    """지금부터 watchdog['deadline']초를 proc_info 파일의 deadline으로 정하고 감시를 시작합니다."""
+    if watchdog is None:
+        return
+    proc_info['deadline'] = time.perf_counter() + watchdog['deadline']
+    with watchdog['lock']:
+        watchdog['active'][id(proc_info)] = proc_info
+
+
+def unwatch(watchdog: Optional[Dict[str, Any]], proc_info: Dict[str, Any]):
+    if watchdog is None:
+        return
+    with watchdog['lock']:
+        watchdog['active'].pop(id(proc_info), None)
+
+
+def pause_deadline(proc_info: Dict[str, Any]):
+    """다른 인스턴스 차례를 기다리는 동안 deadline 시계를 멈춥니다 (watchdog은 멈춘 파일을 종료하지 않음)."""
+    proc_info['paused_at'] = time.perf_counter()
+
+
+def resume_deadline(proc_info: Dict[str, Any]):
+    """멈춘 시간만큼 deadline을 늦추고 시계를 다시 진행합니다."""
+    paused_at = proc_info.get('paused_at')
+    if paused_at is not None:
+        proc_info['deadline'] = proc_info.get('deadline', 0.0) + time.perf_counter() - paused_at
+        del proc_info['paused_at']
+
+
+def record_phase(proc_info: Dict[str, Any], name: str, start: float, ok: bool):
+    """start(perf_counter)부터 지금까지를 단계 name의 소요 시간으로 proc_info['phases']에 추가합니다."""
+    proc_info['phases'].append({'phase': name, 'offset': start - proc_info['file_started'],
+                                'seconds': time.perf_counter() - start, 'ok': ok})
+
+
+@contextmanager
+def phase(proc_info: Dict[str, Any], name: str):
+    """드라이버 호출 구간 하나의 소요 시간과 성공 여부를 기록합니다 (runTelemetry.PHASE_ORDER)."""
+    start = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        record_phase(proc_info, name, start, ok)
+
+
+@contextmanager
+def focus(proc_info: Dict[str, Any]):
+    """UI_LOCK 구간 (포커스가 필요한 드라이버 호출). 잠금을 기다린 시간은 파일 deadline에서 제외하고 focus_wait 단계로 기록합니다."""
+    pause_deadline(proc_info)
+    start = time.perf_counter()
+    with UI_LOCK:
+        record_phase(proc_info, "focus_wait", start, True)
+        resume_deadline(proc_info)
+        yield
+
+
+@contextmanager
+def batch_turn(proc_info: Dict[str, Any]):
+    """batch 모드의 순차 단계에서 proc_info 차례인 동안만 deadline 시계를 진행합니다."""
+    resume_deadline(proc_info)
+    try:
+        yield
+    finally:
+        pause_deadline(proc_info)
+
+
+def finish_file(driver, proc_info: Dict[str, Any], error: Optional[BaseException] = None) -> str:
+    """파일 하나의 처리 결과(상태, 소요 시간, 시도 횟수, 대기 기록, 출력 체크섬)를 완료 기록(runManifest)에 추가하고 status를 반환합니다."""
+    if error is not None and proc_info['timed_out']:
+        error = f"{proc_info['timed_out']}: {error}"
+    return runManifest.record_file(proc_info['output_dir'], proc_info['fname'], proc_info['in_path'],
+                                   "failed" if error is not None else "done",
+                                   time.perf_counter() - proc_info['file_started'], error,
+                                   pid=proc_info['pid'], driver=driver.__name__, attempt=proc_info['attempt'],
+                                   popup=proc_info['popup'], clipboard_rejects=proc_info.get('clipboard_rejects', 0),
+                                   waits=proc_info.get('waits', {}))
+
+
+def vtser_components(path: str) -> List[str]:
+    """VTSER 파일의 [0], [1], ... 섹션 Description (컴포넌트) 리스트"""
+    components = []
+    in_section = False
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('[') and line.endswith(']'):
+                in_section = line != '[General]'
+            elif in_section and line.startswith('Description='):
+                components.append(line.split('=', 1)[1].strip().upper())
+    return components
+
+
+def check_conductance_text(text: str, components: List[str]) -> Optional[str]:
+    """Conductance 텍스트가 섹션마다 같은 수의 데이터 줄을 가진 블록 하나씩으로 되어 있는지. 문제가 있으면 이유를 반환합니다."""
+    blocks = split_conductance_blocks(text.splitlines())
+    if len(blocks) != len(components):
+        return f"Conductance 블록 {len(blocks)}개 (섹션 {len(components)}개)"
+    rows = [sum(1 for line in block if DATA_ROW_PATTERN.match(line)) for block in blocks]
+    if not rows[0] or len(set(rows)) != 1:
+        return f"블록별 데이터 줄 수가 다릅니다 {rows}"
+    return None
+
+
+def check_model_text(text: str, components: List[str]) -> Optional[str]:
+    """모델 텍스트의 블록 컴포넌트가 VTSER 섹션 순서와 같고 모든 블록이 끝까지 있는지. 문제가 있으면 이유를 반환합니다."""
+    blocks = split_model_blocks(text)
+    found = [component for component, _ in blocks]
+    if found != components:
+        return f"모델 블록 {found} (섹션 {components})"
+    if not all(MODEL_TAIL_PATTERN.search(block) for _, block in blocks):
+        return "마지막 항목이 없는 모델 블록이 있습니다"
+    return None
+
+
+def copy_verified(driver, proc_info: Dict[str, Any], window: str, check) -> str:
+    """
+    현재 텍스트 창 내용을 클립보드 브로커로 복사합니다 (CLIPBOARD_LOCK 안에서).
+    클립보드에 고유한 표식을 넣고 내용이 표식에서 바뀐 뒤 연속 두 번의 복사가 같아질 때까지 폴링하고,
+    check(text)가 문제를 반환하면 최대 CLIPBOARD_VERIFY_ATTEMPTS번 다시 복사합니다. 끝내 확인하지 못하면 RuntimeError.
+    """
+    label = "clipboard_main" if window == "conductance" else "clipboard_model"
+    timeout = driver.clipboard_timeout()
+    problem = None
+    with CLIPBOARD_LOCK:
+        for attempt in range(CLIPBOARD_VERIFY_ATTEMPTS):
+            sentinel = f"<autoVacModule {uuid.uuid4()}>"
+            driver.write_clipboard(sentinel)
+            copied = {}
+
+            def text_copied():
+                # wait_until은 condition의 예외를 '아직 아님'으로 보므로, 인스턴스가 종료되면 오류를 남기고 폴링을 바로 끝냄
+                # (죽은 프로세스를 clipboard_timeout 동안 폴링하며 CLIPBOARD_LOCK을 잡고 있지 않도록)
+                if proc_info.get('timed_out'):
+                    copied['error'] = RuntimeError(f"watchdog이 인스턴스를 종료했습니다: {proc_info['timed_out']}")
+                    return True
+                try:
+                    driver.copy_selection(proc_info)
+                except Exception as e:
+                    copied['error'] = e
+                    return True
+                text = driver.read_clipboard()
+                stable = bool(text) and text != sentinel and text == copied.get('text')
+                copied['text'] = text
+                return stable
+
+            copied_in_time = wait_until(text_copied, timeout, label, proc_info, interval=CLIPBOARD_POLL_INTERVAL)
+            if 'error' in copied:
+                raise copied['error']
+            if not copied_in_time:
+                if copied.get('text') in (None, sentinel):
+                    raise RuntimeError(f"{timeout:.1f}초 안에 클립보드 내용이 바뀌지 않았습니다 ({label}).")
+                problem = f"{timeout:.1f}초 안에 복사한 텍스트가 안정되지 않았습니다"
+                break
+            problem = check(copied['text'])
+            if problem is None:
+                return copied['text']
+            proc_info['clipboard_rejects'] = proc_info.get('clipboard_rejects', 0) + 1
+            print(f"    [clipboard] {proc_info['fname']} {window}: {problem} -> 거부 ({attempt + 1}/{CLIPBOARD_VERIFY_ATTEMPTS})")
+    raise RuntimeError(f"클립보드 텍스트를 확인하지 못했습니다 ({label}): {problem}")
+
+
+def extract_results(driver, proc_info: Dict[str, Any]):
+    """
+    Conductance 데이터(.txt)와 모델 데이터(_model.txt)를 클립보드 브로커로 복사해 저장합니다 (포커스 필요).
+    두 텍스트 모두 VTSER 섹션과 구조가 맞을 때만 쓰므로, 확인에 실패한 파일은 결과 파일 없이 실패로 기록됩니다.
+    """
+    out_path = proc_info['out_path']
+    model_out_path = proc_info['model_out_path']
+    components = vtser_components(proc_info['in_path'])
+
+    # a) Main Text Window (Conductance 데이터) 복사
+    with phase(proc_info, "extract_conductance"):
+        driver.show_text_window(proc_info, "conductance")
+        text_content_main = copy_verified(driver, proc_info, "conductance",
+                                          lambda text: check_conductance_text(text, components))
+
+    # b) Series Text Window (모델 데이터) 복사
+    with phase(proc_info, "extract_model"):
+        driver.show_text_window(proc_info, "model")
+        text_content_model = copy_verified(driver, proc_info, "model",
+                                           lambda text: check_model_text(text, components))
+
+    # 두 텍스트를 모두 확인한 뒤에만 저장 (모델 복사가 실패하면 .txt도 남기지 않음)
+    with open(out_path, 'w', encoding='utf-8') as f:
+        f.write(text_content_main)
+    print(f"    -> Conductance data saved: {os.path.basename(out_path)}")
+    with open(model_out_path, 'w', encoding='utf-8') as f:
+        f.write(text_content_model)
+    print(f"    -> Model data saved: {os.path.basename(model_out_path)}")
+
+
+def recycle_instance(driver, pool: Dict[str, Any], proc_info: Dict[str, Any], reason: str):
+    """웜 인스턴스를 종료하고 인스턴스별 지표를 pool['metrics']에 기록합니다."""
+    driver.close(proc_info)
+    pool['metrics'].append({
+        'slot': proc_info['slot'],
+        'pid': proc_info['pid'],
+        'files': proc_info['files_loaded'],
+        'completed': proc_info['files_done'],
+        'errors': proc_info['errors'],
+        'launch_seconds': proc_info.get('launch_seconds', 0.0),
+        'busy_seconds': proc_info['busy_seconds'],
+        'lifetime_seconds': time.perf_counter() - proc_info['started_at'],
+        'recycle_reason': reason,
+    })
+
+
+def print_pool_metrics(metrics: List[Dict[str, Any]]):
+    """웜 풀 인스턴스별 지표를 출력합니다."""
+    print(f"\n--- Warm pool: {len(metrics)} instances ---")
+    for m in metrics:
+        per_file = m['busy_seconds'] / m['files'] if m['files'] else 0.0
+        print(f"  PID {m['pid']} (slot {m['slot']}): {m['files']} files ({m['completed']} ok, {m['errors']} errors), "
+              f"launch {m['launch_seconds']:.1f}s, busy {m['busy_seconds']:.1f}s ({per_file:.1f}s/file), recycled: {m['recycle_reason']}")
+
+
+def process_batch(driver, batch_files: List[str], input_dir_path: str, output_dir_path: str,
+                  watchdog: Optional[Dict[str, Any]] = None, attempts: Optional[Dict[str, int]] = None) -> List[str]:
     """
     하나의 파일 배치(batch)를 동시에 처리합니다.
     1. 모든 인스턴스 실행
     2. 순차적으로 그래프 생성 명령 전송
     3. 데이터 순차적으로 추출 및 저장
+    각 파일의 deadline 시계는 그 파일 차례인 동안만 진행하므로, watchdog이 멈춘 인스턴스를 종료하면 나머지 파일은 그대로 이어집니다.
+    :return: 실패한 파일 이름 목록
     """
+    attempts = attempts if attempts is not None else {}
     running_processes: List[Dict[str, Any]] = []
+    failed: List[str] = []
 
     # 단계 1: Launch Phase - 배치 내 모든 VacTran 인스턴스를 시작합니다.
     print(f"--- Launching batch of {len(batch_files)} processes ---")
     for fname in batch_files:
-        in_path = os.path.join(input_dir_path, fname)
-        base_fname_no_ext = os.path.splitext(fname)[0]
-        out_path = os.path.join(output_dir_path, base_fname_no_ext + '.txt')
-        model_out_path = os.path.join(output_dir_path, base_fname_no_ext + '_model.txt')
-
+        proc_info = new_proc_info(fname, input_dir_path, output_dir_path, attempts.get(fname, 0))
+        watch(watchdog, proc_info)
         try:
-            app = Application(backend="uia").start(f'"{VACTRAN_PATH}" "{in_path}"')
-            # 프로세스가 시작되고 창을 열 충분한 시간을 줍니다.
-            time.sleep(1)
-
-            for attempt in range(10):
-                try:
-                    # 제목에 'Error'가 포함된 창을 찾습니다 (대소문자 무관).
-                    # timeout=0.5 로 설정하여 창이 없으면 즉시 다음으로 넘어갑니다.
-                    error_window = app.window(title_re=".*[Ee]rror.*", top_level_only=True, timeout=0.5)
-                    
-                    print(f"  -> Error popup detected: '{error_window.window_text()}'. Pressing ENTER. (Attempt {attempt + 1})")
-                    error_window.send_keys('{ENTER}')
-                    time.sleep(0.5)  # 팝업이 닫힐 시간을 줍니다.
-
-                except (TimeoutError, NameError): # pywinauto.timings.TimeoutError, pywinauto.findwindows.ElementNotFoundError
-                    # 'Error' 창을 찾지 못한 경우로, 정상적인 상황입니다.
-                    # 팝업 확인 루프를 중단하고 다음 단계로 진행합니다.
-                    break
-                except Exception as e:
-                    # 예기치 못한 다른 오류가 발생하면 루프를 중단합니다.
-                    print(f"  -> An unexpected error occurred while checking for popups: {e}")
-                    break
-
-            main_win = find_main_window(app)
-            running_processes.append({
-                'app': app,
-                'main_win': main_win,
-                'out_path': out_path,
-                'model_out_path': model_out_path,
-                'fname': fname,
-                'failed': False
-            })
-            print(f"  -> Launched process for: {fname} (PID: {app.process})")
+            with phase(proc_info, "launch"):
+                driver.launch(proc_info)
+            with phase(proc_info, "attach"):
+                driver.attach(proc_info)
+            pause_deadline(proc_info)
+            running_processes.append(proc_info)
+            print(f"  -> Launched process for: {fname} (PID: {proc_info['pid']})")
         except Exception as e:
             print(f"  !!! Failed to launch or find window for {fname}: {e}")
+            unwatch(watchdog, proc_info)
+            finish_file(driver, proc_info, e)
+            failed.append(fname)
+            with phase(proc_info, "close"):
+                driver.close(proc_info)
+            runTelemetry.write_file_events(proc_info, "failed")
 
     # 단계 2: Graph Generation Phase - 각 프로세스에 대해 순차적으로 그래프 생성을 시작합니다.
     print("\n--- Initiating graph generation for all processes in batch ---")
-    for i, proc_info in enumerate(running_processes):
-        main_win = proc_info['main_win']
-        fname = proc_info['fname']
-        print(f"  -> Sending graph generation commands to: {fname}")
+    for proc_info in running_processes:
+        print(f"  -> Sending graph generation commands to: {proc_info['fname']}")
         try:
-            main_win.set_focus()
-
-            # 그래프 생성 키 입력
-            keyboard.send_keys('%W')  # Alt + W
-            time.sleep(0.2)
-            keyboard.send_keys('6')
-            time.sleep(0.2)
-            keyboard.send_keys('{ENTER}')
-            time.sleep(0.5)
-            keyboard.send_keys('%G')  # Alt + G
-            time.sleep(0.5)
-            for _ in range(12):
-                keyboard.send_keys('{UP}')
-                time.sleep(0.02)
-            keyboard.send_keys('{ENTER}')
+            with batch_turn(proc_info), phase(proc_info, "generate_graph"):
+                driver.generate_graph(proc_info)
         except Exception as e:
-            print(f"  !!! Failed to send commands to {fname}: {e}")
+            print(f"  !!! Failed to send commands to {proc_info['fname']}: {e}")
             proc_info['failed'] = True
+            proc_info['error'] = e
 
-    # 단계 3: Wait Phase - 모든 그래프 계산 및 렌더링을 위해 5초 대기합니다.
-    print("\n--- Waiting 3 seconds for graphs to compute and render... ---")
-    time.sleep(3)
+    # 단계 3: Wait Phase - 각 프로세스의 그래프 계산 및 렌더링이 끝날 때까지 기다립니다 (드라이버의 timeout까지).
+    print("\n--- Waiting for graphs to compute and render... ---")
+    for proc_info in running_processes:
+        if not proc_info.get('failed'):
+            with batch_turn(proc_info), phase(proc_info, "wait_graph"):
+                driver.wait_graph(proc_info)
 
     # 단계 4: Data Extraction, Save, and Cleanup Phase - 순차적으로 데이터를 처리하고 종료합니다.
     print("\n--- Extracting data, saving, and closing processes sequentially ---")
@@ -116,109 +425,365 @@ def process_batch(batch_files: List[str], input_dir_path: str, output_dir_path:
         # 실패 플래그가 설정된 프로세스는 건너뜁니다.
         if proc_info.get('failed'):
             print(f"  -> Skipping failed process for: {proc_info['fname']}")
+            unwatch(watchdog, proc_info)
+            status = finish_file(driver, proc_info, proc_info['error'])
         else:
-            main_win = proc_info['main_win']
-            out_path = proc_info['out_path']
-            model_out_path = proc_info['model_out_path']
-            fname = proc_info['fname']
-            print(f"  -> Processing data for: {fname}")
-
+            print(f"  -> Processing data for: {proc_info['fname']}")
             try:
-                main_win.set_focus()
-
-                # a) Main Text Window (Conductance 데이터) 저장
-                time.sleep(0.3)
-                keyboard.send_keys('%W')
-                time.sleep(0.2)
-                keyboard.send_keys('2')
-                time.sleep(0.2)
-                keyboard.send_keys('{ENTER}')
-                time.sleep(0.5)
-
-                keyboard.send_keys('^a')
-                time.sleep(0.3)
-                keyboard.send_keys('^c')
-                time.sleep(0.5)
-                text_content_main = clipboard.paste()
-
-                with open(out_path, 'w', encoding='utf-8') as f:
-                    f.write(text_content_main)
-                print(f"    -> Conductance data saved: {os.path.basename(out_path)}")
-
-                # b) Series Text Window (모델 데이터) 저장
-                main_win.set_focus()
-                time.sleep(0.5)
-                keyboard.send_keys('%W')
-                time.sleep(0.3)
-                keyboard.send_keys('6')
-                time.sleep(1.0)
-                keyboard.send_keys('{ENTER}')
-                time.sleep(0.2)
-                keyboard.send_keys('{ENTER}')
-                time.sleep(0.2)
-                keyboard.send_keys('{RIGHT}')
-                time.sleep(0.2)
-                keyboard.send_keys('{TAB}')
-                time.sleep(0.5)
-
-                keyboard.send_keys('^a')
-                time.sleep(0.3)
-                keyboard.send_keys('^c')
-                time.sleep(0.5)
-                text_content_model = clipboard.paste()
-
-                with open(model_out_path, 'w', encoding='utf-8') as f:
-                    f.write(text_content_model)
-                print(f"    -> Model data saved: {os.path.basename(model_out_path)}")
-
+                with batch_turn(proc_info):
+                    extract_results(driver, proc_info)
+                unwatch(watchdog, proc_info)
+                status = finish_file(driver, proc_info)
             except Exception as e:
-                print(f"    !!! Error during data extraction for {fname}: {e}")
+                print(f"    !!! Error during data extraction for {proc_info['fname']}: {e}")
+                unwatch(watchdog, proc_info)
+                status = finish_file(driver, proc_info, e)
+        if status != "done":
+            failed.append(proc_info['fname'])
+
+        with phase(proc_info, "close"):
+            driver.close(proc_info)
+        runTelemetry.write_file_events(proc_info, status)
+        print(f"    -> Waits for {proc_info['fname']}: {format_waits(proc_info)}")
+    return failed
+
+
+def process_file(driver, slot: int, fname: str, input_dir_path: str, output_dir_path: str,
+                 watchdog: Optional[Dict[str, Any]] = None, attempt: int = 0) -> str:
+    """
+    큐 모드에서 작업 슬롯 하나가 VTSER 파일 하나를 처리합니다.
+    창 탐색/그래프 계산 대기는 다른 슬롯과 겹쳐 진행되고, 키 입력이 필요한 구간과 (포커스를 가져가는) 첫 창 표시까지의
+    프로세스 시작만 UI_LOCK 안에서 실행됩니다.
+    :return: 완료 기록에 남긴 status ("done" 또는 "failed")
+    """
+    start = time.perf_counter()
+    proc_info = new_proc_info(fname, input_dir_path, output_dir_path, attempt)
+    proc_info['slot'] = slot
+    status = "failed"
+    watch(watchdog, proc_info)
+    try:
+        with focus(proc_info), phase(proc_info, "launch"):  # 새 창이 전경 포커스를 가져가므로 창이 나타날 때까지 다른 슬롯의 키 입력과 겹치지 않게 합니다.
+            driver.launch(proc_info)
+        with phase(proc_info, "attach"):
+            driver.attach(proc_info)
+        print(f"  [slot {slot}] Launched process for: {fname} (PID: {proc_info['pid']})")
+
+        with focus(proc_info), phase(proc_info, "generate_graph"):
+            driver.generate_graph(proc_info)
+        with phase(proc_info, "wait_graph"):
+            driver.wait_graph(proc_info)
+
+        with focus(proc_info):
+            print(f"  [slot {slot}] Processing data for: {fname}")
+            extract_results(driver, proc_info)
+        unwatch(watchdog, proc_info)
+        status = finish_file(driver, proc_info)
+        print(f"  [slot {slot}] Done: {fname} ({time.perf_counter() - start:.1f}s)")
+    except Exception as e:
+        print(f"  [slot {slot}] !!! Failed to process {fname}: {e}")
+        unwatch(watchdog, proc_info)
+        status = finish_file(driver, proc_info, e)
+    finally:
+        with phase(proc_info, "close"):
+            driver.close(proc_info)
+        runTelemetry.write_file_events(proc_info, status)
+        print(f"    -> Waits for {fname}: {format_waits(proc_info)}")
+    return status
+
+
+def process_file_warm(driver, slot: int, holder: Dict[str, Any], fname: str, input_dir_path: str, output_dir_path: str,
+                      pool: Dict[str, Any], watchdog: Optional[Dict[str, Any]] = None, attempt: int = 0) -> str:
+    """
+    웜 풀 모드에서 작업 슬롯 하나가 VTSER 파일 하나를 처리합니다.
+    슬롯의 인스턴스(holder['instance'])가 없으면 이 파일로 새로 시작하고, 있으면 상태 확인 후 파일 열기로 불러옵니다.
+    오류가 나거나 pool['recycle_after']개 파일을 처리하면 인스턴스를 종료(재활용)합니다.
+    :return: 완료 기록에 남긴 status ("done" 또는 "failed")
+    """
+    start = time.perf_counter()
+    proc_info = holder.get('instance')
+    if proc_info is not None and not driver.healthy(proc_info):
+        print(f"  [slot {slot}] Health check failed for PID {proc_info['pid']}, relaunching")
+        recycle_instance(driver, pool, proc_info, "health_check")
+        proc_info = holder['instance'] = None
+
+    try:
+        if proc_info is None:
+            proc_info = new_proc_info(fname, input_dir_path, output_dir_path, attempt)
+            proc_info.update({'slot': slot, 'started_at': start, 'files_loaded': 0, 'files_done': 0,
+                              'errors': 0, 'busy_seconds': 0.0})
+            holder['instance'] = proc_info
+            watch(watchdog, proc_info)
+            with focus(proc_info), phase(proc_info, "launch"):  # 새 창이 전경 포커스를 가져가므로 process_file과 같이 잠금 안에서 시작합니다.
+                driver.launch(proc_info)
+            with phase(proc_info, "attach"):
+                driver.attach(proc_info)
+            proc_info['launch_seconds'] = time.perf_counter() - start
+            print(f"  [slot {slot}] Launched warm instance for: {fname} (PID: {proc_info['pid']})")
+        else:
+            assign_file(proc_info, fname, input_dir_path, output_dir_path, attempt)
+            watch(watchdog, proc_info)
+            with focus(proc_info), phase(proc_info, "open_file"):
+                driver.open_file(proc_info)
+            print(f"  [slot {slot}] Loaded {fname} into PID {proc_info['pid']}")
+        proc_info['files_loaded'] += 1
+
+        with focus(proc_info), phase(proc_info, "generate_graph"):
+            driver.generate_graph(proc_info)
+        with phase(proc_info, "wait_graph"):
+            driver.wait_graph(proc_info)
+
+        with focus(proc_info):
+            print(f"  [slot {slot}] Processing data for: {fname}")
+            extract_results(driver, proc_info)
+        unwatch(watchdog, proc_info)
+        status = finish_file(driver, proc_info)
+        proc_info['files_done'] += 1
+        print(f"  [slot {slot}] Done: {fname} ({time.perf_counter() - start:.1f}s)")
+    except Exception as e:
+        print(f"  [slot {slot}] !!! Failed to process {fname}: {e}")
+        unwatch(watchdog, proc_info)
+        proc_info['errors'] += 1
+        proc_info['busy_seconds'] += time.perf_counter() - start
+        status = finish_file(driver, proc_info, e)
+        runTelemetry.write_file_events(proc_info, status)
+        print(f"    -> Waits for {fname}: {format_waits(proc_info)}")
+        recycle_instance(driver, pool, proc_info, "watchdog" if proc_info['timed_out'] else "error")
+        holder['instance'] = None
+        return status
+
+    proc_info['busy_seconds'] += time.perf_counter() - start
+    runTelemetry.write_file_events(proc_info, status)
+    print(f"    -> Waits for {fname}: {format_waits(proc_info)}")
+    if proc_info['files_loaded'] >= pool['recycle_after']:
+        recycle_instance(driver, pool, proc_info, "max_files")
+        holder['instance'] = None
+    return status
 
-        # c) VacTran 종료 (성공 여부와 관계없이 정리)
-        app = proc_info['app']
-        if app and app.is_process_running():
+
+def run_work_queue(driver, vtser_files: List[str], input_dir_path: str, output_dir_path: str, concurrency: int,
+                   warm_pool: bool = False, recycle_after: int = DEFAULT_RECYCLE_AFTER,
+                   watchdog: Optional[Dict[str, Any]] = None, max_retries: int = DEFAULT_MAX_RETRIES,
+                   attempts: Optional[Dict[str, int]] = None,
+                   controller: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    concurrency개의 작업 슬롯(스레드)이 공유 큐에서 VTSER 파일을 하나씩 꺼내 처리합니다. 슬롯이 비면 바로 다음 파일을 시작합니다.
+    실패한 파일은 attempts[fname]을 늘려 최대 max_retries번까지 큐 끝에 다시 넣습니다 (모든 파일이 끝날 때까지 슬롯 유지).
+    warm_pool=True면 슬롯마다 VacTran 인스턴스를 유지하며 재사용하고, 인스턴스별 지표 리스트를 반환합니다.
+    controller(adaptiveConcurrency)가 주어지면 번호가 활성 슬롯 수보다 큰 슬롯은 새 파일을 꺼내지 않고 기다리며
+    (웜 인스턴스는 종료), 파일마다 결과를 제어기에 알려 활성 슬롯 수를 조절하게 합니다.
+    """
+    attempts = attempts if attempts is not None else {}
+    file_queue: "queue.Queue[str]" = queue.Queue()
+    for fname in vtser_files:
+        file_queue.put(fname)
+    pool = {'recycle_after': recycle_after, 'metrics': []}
+    remaining = {'files': len(vtser_files)} # 아직 최종 결과(완료 또는 재시도 소진)가 나지 않은 파일 수
+    remaining_lock = threading.Lock()
+
+    def worker(slot: int):
+        driver.init_thread()
+        holder: Dict[str, Any] = {'instance': None}
+        while True:
+            if controller is not None and not adaptiveConcurrency.slot_active(controller, slot):
+                if holder['instance'] is not None:
+                    recycle_instance(driver, pool, holder['instance'], "scaled_down")
+                    holder['instance'] = None
+                with controller['cond']:
+                    controller['cond'].wait(WATCHDOG_INTERVAL)
+                with remaining_lock:
+                    if remaining['files'] == 0:
+                        break
+                continue
             try:
-                app.kill()
-                print(f"  -> Closed process for: {proc_info['fname']}")
-            except Exception as e_close:
-                print(f"      Error closing process for {proc_info['fname']}: {e_close}")
-        time.sleep(0.5) # 다음 프로세스 처리 전 안정성을 위한 짧은 대기
+                fname = file_queue.get(timeout=WATCHDOG_INTERVAL)
+            except queue.Empty:
+                with remaining_lock:
+                    if remaining['files'] == 0:
+                        break
+                continue
+            attempt = attempts.get(fname, 0)
+            if warm_pool:
+                status = process_file_warm(driver, slot, holder, fname, input_dir_path, output_dir_path, pool, watchdog, attempt)
+            else:
+                status = process_file(driver, slot, fname, input_dir_path, output_dir_path, watchdog, attempt)
+            if controller is not None:
+                adaptiveConcurrency.record_outcome(controller, status)
+            if status != "done" and attempt < max_retries:
+                attempts[fname] = attempt + 1
+                print(f"  [slot {slot}] Requeued {fname} (retry {attempt + 1}/{max_retries})")
+                file_queue.put(fname)
+            else:
+                with remaining_lock:
+                    remaining['files'] -= 1
+        if holder['instance'] is not None:
+            recycle_instance(driver, pool, holder['instance'], "queue_empty")
 
+    threads = [threading.Thread(target=worker, args=(slot,), name=f"vactran-slot-{slot}", daemon=True)
+               for slot in range(1, min(concurrency, len(vtser_files)) + 1)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if warm_pool:
+        print_pool_metrics(pool['metrics'])
+        return pool['metrics']
+    return None
 
-def run_vactran_automation(input_dir_path: str, output_dir_path: str, concurrency: int = DEFAULT_CONCURRENCY):
+
+def run_batches(driver, vtser_files: List[str], input_dir_path: str, output_dir_path: str, concurrency: int,
+                watchdog: Optional[Dict[str, Any]] = None, max_retries: int = DEFAULT_MAX_RETRIES,
+                attempts: Optional[Dict[str, int]] = None):
+    """
+    파일 목록을 concurrency 크기의 배치로 나누어 배치 단위로 동시에 시작하고 종료합니다 (기존 방식).
+    실패한 파일은 최대 max_retries번까지 남은 파일 목록 끝에 다시 넣어 이후 배치에서 처리합니다.
+    """
+    attempts = attempts if attempts is not None else {}
+    pending = list(vtser_files)
+    batch_num = 0
+    while pending:
+        batch, pending = pending[:concurrency], pending[concurrency:]
+        batch_num += 1
+        print(f"\n>>> Processing Batch {batch_num} ({len(batch)} files, {len(pending)} pending) <<<")
+        for fname in process_batch(driver, batch, input_dir_path, output_dir_path, watchdog, attempts):
+            attempt = attempts.get(fname, 0)
+            if attempt < max_retries:
+                attempts[fname] = attempt + 1
+                print(f"  -> Requeued {fname} (retry {attempt + 1}/{max_retries})")
+                pending.append(fname)
+
+
+def count_completed(vtser_files: List[str], output_dir_path: str) -> int:
+    """완료 기록의 마지막 상태가 done인 (.txt/_model.txt가 모두 저장된) VTSER 파일 수"""
+    records = runManifest.load_records(runManifest.manifest_path(output_dir_path))
+    return sum(1 for fname in vtser_files if records.get(fname, {}).get('status') == "done")
+
+
+def select_vtser_files(input_dir_path: str, output_dir_path: str, files: Optional[List[str]] = None,
+                       resume: bool = False) -> Optional[List[str]]:
+    """입력 디렉터리에서 실행할 VTSER 파일 목록 (files로 제한, resume이면 완료 기록이 있는 파일 제외). 실행할 파일이 없으면 None."""
+    if not os.path.isdir(input_dir_path):
+        print(f"오류: VTSER 입력 디렉터리 '{input_dir_path}'를 찾을 수 없습니다.")
+        return None
+
+    vtser_files = [f for f in sorted(os.listdir(input_dir_path)) if f.lower().endswith('.vtser')]
+    if files is not None:
+        requested = set(files)
+        vtser_files = [f for f in vtser_files if f in requested]
+    if not vtser_files:
+        print(f"경고: 입력 디렉터리 '{input_dir_path}'에 VTSER 파일이 없습니다.")
+        return None
+    if resume:
+        done = runManifest.completed_files(input_dir_path, output_dir_path, vtser_files)
+        vtser_files = [f for f in vtser_files if f not in done]
+        print(f"재개: 완료 기록이 있는 {len(done)}개 파일 건너뜀, {len(vtser_files)}개 파일 실행 "
+              f"({runManifest.manifest_path(output_dir_path)})")
+        if not vtser_files:
+            print("모든 VTSER 파일이 이미 완료되었습니다.")
+            return None
+    return vtser_files
+
+
+def run_vactran_automation(input_dir_path: str, output_dir_path: str, concurrency: int = DEFAULT_CONCURRENCY,
+                           files: Optional[List[str]] = None, mode: str = "queue", warm_pool: bool = False,
+                           recycle_after: int = DEFAULT_RECYCLE_AFTER, driver: str = DEFAULT_DRIVER,
+                           driver_options: Optional[Dict[str, Any]] = None, resume: bool = False,
+                           file_deadline: Optional[float] = DEFAULT_FILE_DEADLINE,
+                           max_retries: int = DEFAULT_MAX_RETRIES, adaptive: bool = False, min_concurrency: int = 1,
+                           max_failure_rate: float = adaptiveConcurrency.DEFAULT_MAX_FAILURE_RATE,
+                           queue_dir: Optional[str] = None, lease_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
     """
     VacTran 자동화 프로세스를 실행하여 .txt 결과 파일을 저장합니다.
     지정된 수의 프로세스를 동시에 실행하여 작업을 병렬 처리합니다.
-    
+
     :param input_dir_path: VTSER 파일들이 있는 입력 디렉터리 경로.
     :param output_dir_path: 생성된 TXT 파일들을 저장할 출력 디렉터리 경로.
     :param concurrency: 동시에 실행할 VacTran 프로세스의 수.
+    :param files: 처리할 VTSER 파일 이름 목록 (None이면 입력 디렉터리의 모든 VTSER 파일). 청크 저장소에 결과가 없는 파일만 실행할 때 사용합니다.
+    :param mode: "queue" (작업 큐, 기본값) 또는 "batch" (기존 배치 방식, 처리량 비교용).
+    :param warm_pool: True면 (queue 모드에서) 슬롯마다 VacTran 인스턴스를 유지하고 파일 열기로 다음 파일을 불러옵니다.
+    :param recycle_after: 웜 인스턴스 하나로 처리할 최대 파일 수.
+    :param driver: VacTran 조작 드라이버 이름 ("pywinauto" 실제 VacTran, "fake" Linux 테스트/처리량 측정용).
+    :param driver_options: 드라이버 설정 (pywinauto: {'vactran_path'}, fake: vacDriver/fakeDriver.py의 PROFILE 키).
+    :param resume: True면 출력 디렉터리의 완료 기록(vactran_manifest.jsonl)에서 입력/출력 체크섬이 일치하는 완료 파일을 건너뛰고
+                   결과가 없거나 실패한 파일만 실행합니다. (파일별 완료 기록은 resume과 관계없이 항상 추가됩니다.)
+    :param file_deadline: 파일 하나의 최대 처리 시간(초, 포커스/차례 대기 제외). 넘으면 watchdog이 인스턴스를 강제 종료합니다 (0/None이면 끔).
+    :param max_retries: 실패한 파일(watchdog 종료 포함)을 다시 처리하는 최대 횟수.
+    :param adaptive: True면 (queue 모드에서) min_concurrency개 슬롯으로 시작해 구간별 files/min과 실패율로 활성 슬롯 수를
+                     [min_concurrency, concurrency] 안에서 AIMD 방식으로 조절합니다 (adaptiveConcurrency.py).
+    :param min_concurrency: adaptive 모드의 시작/최소 슬롯 수.
+    :param max_failure_rate: adaptive 모드에서 슬롯 수를 절반으로 줄이는 구간 실패율.
+    :param queue_dir: 주어지면 이 기계에서 VacTran을 실행하지 않고 공유 큐 디렉터리의 코디네이터로 동작합니다
+                      (distributedQueue.py: 다른 기계의 worker가 파일을 임대해 처리하고 결과를 올림).
+                      동시 실행 수/스케줄러/드라이버 옵션은 각 worker가 정합니다.
+    :param lease_seconds: 코디네이터 모드에서 worker heartbeat가 이 시간 동안 없으면 임대한 파일을 다시 큐에 넣습니다.
+    :return: 처리량 요약 {'mode', 'files', 'completed', 'seconds', 'files_per_min', 'instances', 'retries', 'watchdog_kills',
+             'concurrency_changes', 'final_concurrency'} (처리할 파일이 없으면 None)
     """
+    if queue_dir is not None:
+        import distributedQueue # distributedQueue의 worker가 이 모듈을 쓰므로 실행 시점에 불러옵니다.
+        return distributedQueue.run_coordinator(input_dir_path, output_dir_path, queue_dir, files=files, resume=resume,
+                                                lease_seconds=lease_seconds or distributedQueue.DEFAULT_LEASE_SECONDS,
+                                                max_retries=max_retries)
+    if mode not in SCHEDULER_MODES:
+        raise ValueError(f"알 수 없는 스케줄러 모드: {mode} (가능: {', '.join(SCHEDULER_MODES)})")
+    if warm_pool and mode != "queue":
+        raise ValueError("웜 풀(warm_pool)은 queue 모드에서만 사용할 수 있습니다.")
+    if adaptive and mode != "queue":
+        raise ValueError("동시 실행 수 자동 조절(adaptive)은 queue 모드에서만 사용할 수 있습니다.")
+    vac_driver = load_driver(driver, driver_options)
     print(f"VacTran 자동화 시작: 입력 폴더 '{input_dir_path}', 출력 폴더 '{output_dir_path}'")
-    print(f"동시 실행 수: {concurrency}")
+    print(f"동시 실행 수: {concurrency}, 스케줄러: {mode}, 드라이버: {driver}" + (f" (웜 풀, 인스턴스당 최대 {recycle_after}개 파일)" if warm_pool else ""))
+    if adaptive:
+        print(f"동시 실행 수 자동 조절: {min(min_concurrency, concurrency)}개 슬롯으로 시작, 범위 {min(min_concurrency, concurrency)}..{concurrency}, "
+              f"실패율 상한 {max_failure_rate:.0%}")
+    print(f"파일 deadline: {f'{file_deadline:g}초' if file_deadline else '없음'}, 최대 재시도: {max_retries}회")
     os.makedirs(output_dir_path, exist_ok=True)
+    runTelemetry.start_run(output_dir_path)
 
-    if not os.path.isdir(input_dir_path):
-        print(f"오류: VTSER 입력 디렉터리 '{input_dir_path}'를 찾을 수 없습니다.")
-        return
+    vtser_files = select_vtser_files(input_dir_path, output_dir_path, files, resume)
+    if vtser_files is None:
+        return None
 
-    vtser_files = [f for f in sorted(os.listdir(input_dir_path)) if f.lower().endswith('.vtser')]
-    if not vtser_files:
-        print(f"경고: 입력 디렉터리 '{input_dir_path}'에 VTSER 파일이 없습니다.")
-        return
-    
     total_files = len(vtser_files)
     print(f"총 {total_files}개의 VTSER 파일을 처리합니다.")
 
-    # 파일 목록을 concurrency 크기의 배치로 나눕니다.
-    for i in range(0, total_files, concurrency):
-        batch = vtser_files[i:i + concurrency]
-        batch_num = (i // concurrency) + 1
-        total_batches = (total_files + concurrency - 1) // concurrency
-        print(f"\n>>> Processing Batch {batch_num} of {total_batches} <<<")
-        process_batch(batch, input_dir_path, output_dir_path)
+    start = time.perf_counter()
+    instances = None
+    attempts: Dict[str, int] = {}
+    controller = None
+    if adaptive:
+        max_slots = min(concurrency, total_files)
+        controller = adaptiveConcurrency.new_controller(min(min_concurrency, max_slots), max_slots, max_failure_rate)
+    watchdog = start_watchdog(vac_driver, file_deadline)
+    try:
+        if mode == "queue":
+            instances = run_work_queue(vac_driver, vtser_files, input_dir_path, output_dir_path, concurrency, warm_pool,
+                                       recycle_after, watchdog, max_retries, attempts, controller)
+        else:
+            run_batches(vac_driver, vtser_files, input_dir_path, output_dir_path, concurrency, watchdog, max_retries, attempts)
+    finally:
+        stop_watchdog(watchdog)
+    elapsed = time.perf_counter() - start
 
+    completed = count_completed(vtser_files, output_dir_path)
+    summary = {
+        'mode': mode,
+        'files': total_files,
+        'completed': completed,
+        'seconds': elapsed,
+        'files_per_min': completed / elapsed * 60 if elapsed > 0 else 0.0,
+        'instances': instances,
+        'retries': sum(attempts.values()),
+        'watchdog_kills': watchdog['kills'] if watchdog else 0,
+        'concurrency_changes': controller['changes'] if controller else None,
+        'final_concurrency': controller['slots'] if controller else concurrency,
+    }
     print(f"\nVacTran 자동화 완료. 모든 결과는 '{output_dir_path}'에 저장됨.")
+    print(f"처리량 ({mode}): {completed}/{total_files} 파일 완료, {elapsed:.1f}초, {summary['files_per_min']:.2f} files/min")
+    print(f"재시도 {summary['retries']}회, watchdog 강제 종료 {summary['watchdog_kills']}회")
+    if controller:
+        print(f"동시 실행 수 자동 조절: 변경 {len(controller['changes'])}회, 최종 {controller['slots']}개 슬롯")
+    return summary
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="VacTran 자동화 실행 모듈. 여러 프로세스를 동시에 실행합니다.")
@@ -226,6 +791,59 @@ if __name__ == "__main__":
     parser.add_argument("output_dir", help="생성된 TXT 파일들을 저장할 출력 디렉터리")
     parser.add_argument("-n", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
                         help=f"동시에 실행할 프로세스 수 (기본값: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--mode", choices=SCHEDULER_MODES, default="queue",
+                        help="queue: 슬롯이 비는 즉시 다음 파일 시작 (기본값), batch: 기존 배치 방식")
+    parser.add_argument("--compare", action="store_true",
+                        help="같은 파일을 batch 모드와 queue 모드로 각각 실행하여 files/min 처리량을 비교 (결과는 output_dir/batch, output_dir/queue)")
+    parser.add_argument("--warm_pool", action="store_true",
+                        help="queue 모드에서 슬롯마다 VacTran 인스턴스를 유지하고 파일 열기로 다음 파일을 불러옴")
+    parser.add_argument("--recycle_after", type=int, default=DEFAULT_RECYCLE_AFTER,
+                        help=f"웜 인스턴스 하나로 처리할 최대 파일 수 (기본값: {DEFAULT_RECYCLE_AFTER})")
+    parser.add_argument("--driver", choices=list(DRIVERS), default=DEFAULT_DRIVER,
+                        help=f"VacTran 조작 드라이버 (기본값: {DEFAULT_DRIVER}). fake는 VacTran 없이 가짜 결과를 만들어 스케줄링/처리량을 시험")
+    parser.add_argument("--driver_config", default=None,
+                        help="드라이버 설정 JSON 파일 (예: fake 드라이버의 지연/실패 확률 PROFILE, pywinauto의 vactran_path)")
+    parser.add_argument("--resume", action="store_true",
+                        help="output_dir의 완료 기록(vactran_manifest.jsonl)으로 완료된 파일을 건너뛰고 결과가 없거나 실패한 파일만 실행")
+    parser.add_argument("--file_deadline", type=float, default=DEFAULT_FILE_DEADLINE,
+                        help=f"파일 하나의 최대 처리 시간(초). 넘으면 watchdog이 인스턴스를 강제 종료하고 재시도 (0이면 끔, 기본값: {DEFAULT_FILE_DEADLINE})")
+    parser.add_argument("--max_retries", type=int, default=DEFAULT_MAX_RETRIES,
+                        help=f"실패한 파일을 다시 처리하는 최대 횟수 (기본값: {DEFAULT_MAX_RETRIES})")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="queue 모드에서 --min_concurrency개 슬롯으로 시작해 구간별 files/min과 실패율로 동시 실행 수를 "
+                             "--concurrency(상한) 안에서 자동 조절 (AIMD)")
+    parser.add_argument("--min_concurrency", type=int, default=1, help="--adaptive의 시작/최소 동시 실행 수 (기본값: 1)")
+    parser.add_argument("--max_failure_rate", type=float, default=adaptiveConcurrency.DEFAULT_MAX_FAILURE_RATE,
+                        help=f"--adaptive에서 동시 실행 수를 절반으로 줄이는 구간 실패율 (기본값: {adaptiveConcurrency.DEFAULT_MAX_FAILURE_RATE})")
     cli_args = parser.parse_args()
-    
-    run_vactran_automation(cli_args.input_dir, cli_args.output_dir, cli_args.concurrency)
\ No newline at end of file
+    if cli_args.warm_pool and cli_args.mode != "queue":
+        parser.error("--warm_pool은 --mode queue에서만 사용할 수 있습니다.")
+    if cli_args.recycle_after < 1:
+        parser.error("--recycle_after는 1 이상이어야 합니다.")
+    if cli_args.adaptive and cli_args.mode != "queue":
+        parser.error("--adaptive는 --mode queue에서만 사용할 수 있습니다.")
+    if cli_args.min_concurrency < 1:
+        parser.error("--min_concurrency는 1 이상이어야 합니다.")
+    if cli_args.file_deadline < 0 or cli_args.max_retries < 0:
+        parser.error("--file_deadline/--max_retries는 0 이상이어야 합니다.")
+    driver_options = None
+    if cli_args.driver_config:
+        with open(cli_args.driver_config, 'r', encoding='utf-8') as f:
+            driver_options = json.load(f)
+    run_options = {'warm_pool': cli_args.warm_pool, 'recycle_after': cli_args.recycle_after,
+                    'driver': cli_args.driver, 'driver_options': driver_options, 'resume': cli_args.resume,
+                    'file_deadline': cli_args.file_deadline, 'max_retries': cli_args.max_retries,
+                    'adaptive': cli_args.adaptive, 'min_concurrency': cli_args.min_concurrency,
+                    'max_failure_rate': cli_args.max_failure_rate}
+
+    if cli_args.compare:
+        summaries = [run_vactran_automation(cli_args.input_dir, os.path.join(cli_args.output_dir, "batch"), cli_args.concurrency, mode="batch",
+                                            driver=cli_args.driver, driver_options=driver_options,
+                                            file_deadline=cli_args.file_deadline, max_retries=cli_args.max_retries),
+                     run_vactran_automation(cli_args.input_dir, os.path.join(cli_args.output_dir, "queue"), cli_args.concurrency, mode="queue", **run_options)]
+        if all(summaries):
+            batch, queued = summaries
+            speedup = queued['files_per_min'] / batch['files_per_min'] if batch['files_per_min'] > 0 else float('inf')
+            print(f"\n처리량 비교: batch {batch['files_per_min']:.2f} files/min, queue {queued['files_per_min']:.2f} files/min (x{speedup:.2f})")
+    else:
+        run_vactran_automation(cli_args.input_dir, cli_args.output_dir, cli_args.concurrency, mode=cli_args.mode, **run_options)
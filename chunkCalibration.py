@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VTSER 시리즈 파일 하나에 담을 샘플 수(chunk_size)를 실측으로 고르는 보정(calibration) 모듈.
+
+VacTran 실행 한 번에는 샘플 수와 무관한 고정 비용(프로세스 시작, 창 탐색, 키 입력 사이 대기)이 있으므로
+파일당 샘플 수를 늘리면 실행 횟수가 줄어 처리량이 커지지만, 너무 크면 계산/렌더링/클립보드 복사 시간이
+늘어나거나 실행이 실패할 수 있습니다. 후보 크기마다 동시 실행 수(concurrency)만큼의 시리즈 파일을 만들어
+실제 3단계 실행 함수로 처리하고, 결과 TXT가 모두 생성된 후보 중 시간당 처리 컴포넌트 수가 가장 큰 크기를 고릅니다.
+"""
+
+import os
+import time
+import argparse
+import pandas as pd
+
+from genVtser.vtserWriter import write_mixed_series
+
+DEFAULT_CALIBRATION_SIZES = (25, 50, 100, 200)
+CALIBRATION_LOG_NAME = "chunk_calibration.csv"
+
+def parse_sizes(text):
+    """'25,50,100' 형식의 후보 크기 문자열을 정수 리스트로 변환합니다."""
+    sizes = sorted({int(v) for v in str(text).split(",") if v.strip()})
+    if not sizes or sizes[0] < 1:
+        raise ValueError(f"후보 chunk_size는 1 이상의 정수여야 합니다: '{text}'")
+    return sizes
+
+def cycle_tables(tables, n_rows):
+    """
+    {아이템 타입: 샘플 DataFrame}에서 (타입 순서대로 이어 붙인 순서로) n_rows개를 뽑습니다.
+    샘플이 모자라면 처음부터 반복해서 채웁니다.
+    """
+    order = [(item_type, idx) for item_type, df in tables.items() for idx in range(len(df))]
+    if not order:
+        raise ValueError("보정에 사용할 샘플이 없습니다.")
+    picks = [order[k % len(order)] for k in range(n_rows)]
+    picked = {}
+    for item_type, df in tables.items():
+        rows = [idx for picked_type, idx in picks if picked_type == item_type]
+        if rows:
+            picked[item_type] = df.iloc[rows].reset_index(drop=True)
+    return picked
+
+def count_results(txt_dir, vtser_paths):
+    """시리즈 파일별 결과 TXT(.txt)가 비어 있지 않게 생성된 개수"""
+    done = 0
+    for path in vtser_paths:
+        txt_path = os.path.join(txt_dir, os.path.splitext(os.path.basename(path))[0] + ".txt")
+        if os.path.exists(txt_path) and os.path.getsize(txt_path) > 0:
+            done += 1
+    return done
+
+def calibrate_chunk_size(tables, work_dir, run_vactran, sizes=DEFAULT_CALIBRATION_SIZES, concurrency=4):
+    """
+    후보 chunk_size마다 concurrency개의 시리즈 파일을 만들어 run_vactran(vtser_dir, txt_dir, concurrency=...)으로
+    실행 시간을 재고, 시간당 처리 컴포넌트 수가 가장 큰 크기를 반환합니다.
+
+    :param tables: {아이템 타입: 샘플 DataFrame} (단일 타입이면 원소 하나)
+    :param run_vactran: 3단계 실행 함수 (autoVacModule.run_vactran_automation 과 같은 시그니처)
+    :return: (선택된 chunk_size, 후보별 결과 DataFrame)
+    """
+    records = []
+    for size in sizes:
+        size_dir = os.path.join(work_dir, f"chunk_{size:04d}")
+        vtser_dir = os.path.join(size_dir, "vtser")
+        txt_dir = os.path.join(size_dir, "txt")
+        vtser_paths, _ = write_mixed_series(cycle_tables(tables, size * concurrency), vtser_dir, chunk_size=size)
+
+        print(f"\n--- chunk_size={size}: 시리즈 파일 {len(vtser_paths)}개 x {size}개 컴포넌트 실행 ---")
+        start = time.perf_counter()
+        run_vactran(vtser_dir, txt_dir, concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+
+        completed = count_results(txt_dir, vtser_paths)
+        components = size * completed
+        records.append({
+            "chunk_size": size,
+            "files": len(vtser_paths),
+            "completed_files": completed,
+            "seconds": elapsed,
+            "components_per_hour": components / elapsed * 3600 if elapsed > 0 else 0.0,
+        })
+        print(f"chunk_size={size}: {completed}/{len(vtser_paths)} 파일 완료, {elapsed:.1f}초, "
+              f"{records[-1]['components_per_hour']:.0f} 컴포넌트/시간")
+
+    result = pd.DataFrame(records)
+    result.to_csv(os.path.join(work_dir, CALIBRATION_LOG_NAME), index=False)
+    complete = result[result["completed_files"] == result["files"]]
+    if complete.empty:
+        raise RuntimeError(f"모든 후보 chunk_size에서 VacTran 결과가 누락되었습니다: {list(sizes)}")
+    best = int(complete.loc[complete["components_per_hour"].idxmax(), "chunk_size"])
+    print(f"선택된 chunk_size: {best} (결과: {os.path.join(work_dir, CALIBRATION_LOG_NAME)})")
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="후보 chunk_size별로 VacTran 처리량을 측정하여 가장 빠른 크기를 고릅니다.")
+    parser.add_argument("sample_paths", nargs="+", help="보정에 사용할 샘플 테이블 (파일명에 포함된 아이템 타입으로 구분, 예: pipe_samples.npz)")
+    parser.add_argument("--work_dir", required=True, help="보정용 VTSER/TXT 파일과 결과 CSV를 저장할 디렉터리")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_CALIBRATION_SIZES)), help="후보 chunk_size 목록 (기본값: 25,50,100,200)")
+    parser.add_argument("-n", "--concurrency", type=int, default=4, help="VacTran 동시 실행 수 (기본값: 4)")
+    args = parser.parse_args()
+
+    from sampleTable import read_sample_table
+    from genVtser.vtserWriter import ITEM_COMPONENTS
+    from autoVacModule import run_vactran_automation
+    tables = {}
+    for path in args.sample_paths:
+        item_type = next((t for t in ITEM_COMPONENTS if os.path.basename(path).lower().startswith(t)), None)
+        if item_type is None:
+            parser.error(f"파일명에서 아이템 타입을 알 수 없습니다: {path}")
+        tables[item_type] = read_sample_table(path)
+    calibrate_chunk_size(tables, args.work_dir, run_vactran_automation, parse_sizes(args.sizes), args.concurrency)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VTSER 청크(시리즈 파일) 내용의 해시로 VacTran 결과(.txt / _model.txt)를 재사용하는 내용 주소(content-addressed) 저장소.
+
+청크 해시는 파일 이름이 아닌 내용으로 계산하므로 실행 디렉터리(타임스탬프)가 달라도 같은 형상 청크는 같은 해시를 갖습니다.
+저장소 구조:
+    <store_dir>/<해시 앞 2자리>/<해시>.txt
+    <store_dir>/<해시 앞 2자리>/<해시>_model.txt
+3단계에서는 저장소에 결과가 있는 청크는 결과를 복사해 오고, 나머지 청크만 VacTran으로 실행한 뒤 결과를 저장소에 추가합니다.
+저장소에는 완료 기록(runManifest)의 마지막 상태가 done이고 두 결과 파일이 모두 비어 있지 않은 청크만 추가하며,
+두 파일이 모두 있는 청크만 적중으로 봅니다 (실패한 청크의 결과가 저장되어 다음 실행에서 재사용되지 않도록).
+"""
+
+import os
+import time
+import shutil
+import hashlib
+import argparse
+
+STORE_VERSION = "vtser-chunk-v1" # 해시 입력에 포함 (VTSER 형식이나 결과 형식이 바뀌면 올려서 기존 결과를 무효화)
+
+def chunk_hash(vtser_path):
+    """VTSER 파일의 정규화된 내용(줄바꿈 통일, 줄 끝 공백 제거)에 대한 SHA-256 해시"""
+    with open(vtser_path, "r", encoding="utf-8") as f:
+        lines = [line.rstrip() for line in f.read().splitlines()]
+    while lines and not lines[-1]:
+        lines.pop()
+    digest = hashlib.sha256(STORE_VERSION.encode("utf-8"))
+    digest.update("\n".join(lines).encode("utf-8"))
+    return digest.hexdigest()
+
+def store_paths(store_dir, digest):
+    """해시에 대응하는 저장소 내 (.txt, _model.txt) 경로"""
+    base = os.path.join(store_dir, digest[:2], digest)
+    return base + ".txt", base + "_model.txt"
+
+def result_paths(txt_dir, vtser_name):
+    """시리즈 파일 이름에 대응하는 3단계 출력 (.txt, _model.txt) 경로 (autoVacModule과 동일한 규칙)"""
+    base = os.path.join(txt_dir, os.path.splitext(vtser_name)[0])
+    return base + ".txt", base + "_model.txt"
+
+def has_results(paths):
+    """(.txt, _model.txt) 경로가 모두 있고 비어 있지 않은지"""
+    return all(os.path.exists(p) and os.path.getsize(p) > 0 for p in paths)
+
+def copy_atomic(src, dst):
+    """임시 파일에 복사한 뒤 이름을 바꿔, 여러 실행이 같은 저장소를 공유해도 반쯤 쓰인 파일이 보이지 않게 합니다."""
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+def partition_chunks(vtser_dir, store_dir):
+    """
+    vtser_dir의 시리즈 파일을 저장소에 결과가 있는 청크와 없는 청크로 나눕니다.
+    :return: (cached, pending) - 각각 (파일 이름, 해시) 리스트
+    """
+    cached, pending = [], []
+    for fname in sorted(os.listdir(vtser_dir)):
+        if not fname.lower().endswith(".vtser"):
+            continue
+        digest = chunk_hash(os.path.join(vtser_dir, fname))
+        (cached if has_results(store_paths(store_dir, digest)) else pending).append((fname, digest))
+    return cached, pending
+
+def restore_cached(cached, vtser_dir, txt_dir, store_dir):
+    """
+    저장소의 결과를 시리즈 파일 이름으로 txt_dir에 복사하고 완료 기록에 done으로 남깁니다
+    (4단계와 결과 캐시는 완료 기록이 done인 파일의 결과만 사용).
+    """
+    import runManifest # runManifest가 이 모듈의 result_paths를 가져다 쓰므로 함수 안에서 임포트
+    os.makedirs(txt_dir, exist_ok=True)
+    for fname, digest in cached:
+        started = time.perf_counter()
+        for src, dst in zip(store_paths(store_dir, digest), result_paths(txt_dir, fname)):
+            copy_atomic(src, dst)
+        runManifest.record_file(txt_dir, fname, os.path.join(vtser_dir, fname), "done",
+                                time.perf_counter() - started, driver="chunk_store")
+
+def store_results(chunks, vtser_dir, txt_dir, store_dir):
+    """
+    새로 실행한 청크의 결과를 저장소에 추가합니다. 완료 기록(runManifest)의 마지막 상태가 done이고 입력/출력 체크섬이
+    기록과 같으며 .txt/_model.txt가 모두 비어 있지 않은 청크만 저장합니다 (실패했거나 결과가 잘린 청크는 저장하지 않음).
+    :return: 저장한 청크 수
+    """
+    import runManifest
+    done = runManifest.completed_files(vtser_dir, txt_dir, [fname for fname, _ in chunks])
+    stored = 0
+    for fname, digest in chunks:
+        sources = result_paths(txt_dir, fname)
+        if fname not in done or not has_results(sources):
+            continue
+        txt_dst, model_dst = store_paths(store_dir, digest)
+        os.makedirs(os.path.dirname(txt_dst), exist_ok=True)
+        # _model.txt를 먼저 옮겨, .txt만 있는 반쪽 항목이 다른 실행에 보이는 시간을 없앰
+        copy_atomic(sources[1], model_dst)
+        copy_atomic(sources[0], txt_dst)
+        stored += 1
+    return stored
+
+def main():
+    parser = argparse.ArgumentParser(description="VTSER 청크 해시와 청크 저장소 적중 여부를 출력하거나, 기존 결과를 저장소에 등록합니다.")
+    parser.add_argument("vtser_dir", help="VTSER 파일들이 있는 디렉터리")
+    parser.add_argument("store_dir", help="청크 저장소 디렉터리")
+    parser.add_argument("--import_txt_dir", help="이 디렉터리의 기존 VacTran 결과 중 완료 기록(vactran_manifest.jsonl)이 done인 결과를 저장소에 등록")
+    args = parser.parse_args()
+
+    cached, pending = partition_chunks(args.vtser_dir, args.store_dir)
+    if args.import_txt_dir:
+        stored = store_results(pending, args.vtser_dir, args.import_txt_dir, args.store_dir)
+        print(f"{stored}개 청크 결과를 저장소에 등록했습니다: {args.store_dir}")
+        return
+    for fname, digest in cached:
+        print(f"{fname}\t{digest}\tcached")
+    for fname, digest in pending:
+        print(f"{fname}\t{digest}\tpending")
+    print(f"저장소 적중 {len(cached)}개, 미적중 {len(pending)}개")
+
+if __name__ == "__main__":
+    main()
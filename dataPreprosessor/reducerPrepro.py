@@ -54,13 +54,16 @@ def parse_cone_block_data(cone_block_text):
     return data
 
 def parse_reducer_file(path: Path, start_sample_id: int, model_data_blocks: list):
+    with path.open('r', encoding='utf-8') as f:
+        lines = f.readlines()
+    return parse_reducer_lines(lines, start_sample_id, model_data_blocks)
+
+def parse_reducer_lines(lines: list, start_sample_id: int, model_data_blocks: list):
+    """TXT 결과 줄 목록에서 "Data for Conductance" 블록들을 파싱합니다 (seriesRouter에서 블록 단위로도 사용)."""
     rows = []
     assigned_sample_id = start_sample_id
     current_sample_id_in_file = 0
 
-    with path.open('r', encoding='utf-8') as f:
-        lines = f.readlines()
-
     i = 0
     while i < len(lines):
         if re.match(r'Data for Conductance\s+\d+', lines[i].strip()):
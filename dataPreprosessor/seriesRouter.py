@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+혼합 시리즈(MIXED_SERIES_*.VTSER) VacTran 결과를 슬롯 매니페스트에 따라 아이템 타입별 CSV로 나누는 파서.
+
+genVtser/mixedGenerate.py가 만든 매니페스트(file, slot, item_type, component, SampleID)를 기준으로
+    - TXT 결과의 k번째 "Data for Conductance" 블록 -> 해당 파일의 k번째 슬롯
+    - _model.txt의 k번째 "N Pipe(s)/ELBOW(s)/Cone(s)" 블록 -> 해당 파일의 k번째 슬롯
+으로 대응시키고, 각 블록을 기존 타입별 파서(parse_*_lines, parse_*_block_data)로 파싱합니다.
+SampleID는 매니페스트의 원본 샘플 테이블 SampleID를 그대로 사용합니다.
+"""
+
+import sys
+import re
+import argparse
+import pandas as pd
+from pathlib import Path
+
+try:
+    from . import pipePrepro, elbowPrepro, reducerPrepro
+except ImportError:
+    import pipePrepro, elbowPrepro, reducerPrepro
+
+# 아이템 타입별 (블록 파서, 모델 블록 파서, 전체 컬럼, 모델 컬럼, CSV 인코딩) - 기존 *Prepro.run과 동일한 출력 형식
+ITEM_PARSERS = {
+    "pipe": (pipePrepro.parse_pipe_lines, pipePrepro.parse_pipe_block_data,
+             pipePrepro.ALL_COLUMNS_PIPE, pipePrepro.NEW_COLUMNS_PIPE, "utf-8-sig"),
+    "elbow": (elbowPrepro.parse_elbow_lines, elbowPrepro.parse_elbow_block_data,
+              elbowPrepro.ALL_COLUMNS_ELBOW, elbowPrepro.NEW_COLUMNS_ELBOW, "utf-8-sig"),
+    "reducer": (reducerPrepro.parse_reducer_lines, reducerPrepro.parse_cone_block_data,
+                reducerPrepro.ALL_COLUMNS, reducerPrepro.NEW_COLUMNS, "utf-8"),
+    "expander": (reducerPrepro.parse_reducer_lines, reducerPrepro.parse_cone_block_data,
+                 reducerPrepro.ALL_COLUMNS, reducerPrepro.NEW_COLUMNS, "utf-8"),
+}
+# _model.txt 블록 머리말의 단어 -> VTSER 컴포넌트
+MODEL_BLOCK_COMPONENTS = {"pipe": "PIPE", "elbow": "ELBOW", "cone": "CONE"}
+MODEL_BLOCK_PATTERN = re.compile(r"(\d+\s*(Pipe|ELBOW|Cone)\(s\).*?)(?=\n\s*\d+\s*(?:Pipe|ELBOW|Cone)\(s\)|\Z)", re.DOTALL | re.IGNORECASE)
+
+def split_conductance_blocks(lines):
+    """TXT 결과 줄 목록을 "Data for Conductance N" 머리말 단위 블록 리스트로 나눕니다 (첫 머리말 이전 줄은 무시)."""
+    blocks = []
+    for line in lines:
+        if re.match(r'Data for Conductance\s+\d+', line.strip()):
+            blocks.append([])
+        if blocks:
+            blocks[-1].append(line)
+    return blocks
+
+def split_model_blocks(model_text):
+    """_model.txt 내용을 (컴포넌트, 블록 텍스트) 리스트로 나눕니다."""
+    return [(MODEL_BLOCK_COMPONENTS[m.group(2).lower()], m.group(1)) for m in MODEL_BLOCK_PATTERN.finditer(model_text)]
+
+def route_series_file(txt_path: Path, slots: pd.DataFrame, routed_rows: dict):
+    """
+    혼합 시리즈 결과 파일 하나를 슬롯별로 파싱하여 routed_rows[item_type]에 행을 추가합니다.
+    :return: 결과를 얻지 못한 슬롯 수
+    """
+    with txt_path.open('r', encoding='utf-8') as f:
+        conductance_blocks = split_conductance_blocks(f.readlines())
+    model_path = txt_path.with_name(txt_path.stem + "_model.txt")
+    if model_path.exists():
+        with model_path.open('r', encoding='utf-8') as mf:
+            model_blocks = split_model_blocks(mf.read())
+    else:
+        print(f"Warning: Model file not found for {txt_path.name}: {model_path}")
+        model_blocks = []
+
+    if len(conductance_blocks) != len(slots):
+        print(f"Warning: {txt_path.name} has {len(conductance_blocks)} conductance blocks for {len(slots)} manifest slots.")
+
+    missing = 0
+    for slot in slots.itertuples(index=False):
+        parse_lines, parse_model_block, _, model_columns, _ = ITEM_PARSERS[slot.item_type]
+        model_data = []
+        if slot.slot < len(model_blocks):
+            block_component, block_text = model_blocks[slot.slot]
+            if block_component == slot.component:
+                model_data = [parse_model_block(block_text)]
+            else:
+                print(f"Warning: {model_path.name} block {slot.slot} is {block_component}, manifest expects {slot.component}.")
+        if not model_data:
+            model_data = [{col: None for col in model_columns}]
+
+        rows = []
+        if slot.slot < len(conductance_blocks):
+            rows, _ = parse_lines(conductance_blocks[slot.slot], int(slot.SampleID), model_data)
+        if not rows:
+            missing += 1
+            continue
+        routed_rows[slot.item_type].extend(rows)
+    return missing
+
+def route_rows(input_path_str, manifest_path, item_types):
+    """
+    슬롯 매니페스트에 따라 결과 TXT를 파싱하여 {item_type: 행 dict 리스트}를 반환합니다 (파일 저장 없음).
+    매니페스트에 있지만 item_types에 없는 타입은 건너뜁니다.
+    """
+    input_path = Path(input_path_str)
+    manifest = pd.read_csv(manifest_path)
+    routed_rows = {item_type: [] for item_type in item_types}
+    missing = 0
+    for file_name, slots in manifest[manifest["item_type"].isin(list(item_types))].groupby("file", sort=True):
+        txt_path = input_path / (Path(file_name).stem + ".txt")
+        if not txt_path.exists():
+            print(f"Warning: Result file not found for {file_name}: {txt_path}")
+            missing += len(slots)
+            continue
+        print(f"Parsing {txt_path.name} …")
+        missing += route_series_file(txt_path, slots.sort_values("slot"), routed_rows)
+    if missing:
+        print(f"Warning: {missing} manifest slots had no parsable result.")
+    return routed_rows
+
+def write_item_csv(rows, item_type, output_file):
+    """타입별 행 리스트를 기존 *Prepro.run과 같은 컬럼/인코딩의 CSV로 저장합니다."""
+    _, _, all_columns, _, encoding = ITEM_PARSERS[item_type]
+    df = pd.DataFrame(rows, columns=all_columns)
+    if not df.empty:
+        df = df.sort_values("SampleID", kind="stable")
+    df.to_csv(output_file, index=False, encoding=encoding)
+    print(f"Completed: {item_type} {len(df)} rows saved to {output_file}")
+    return df
+
+def run(input_path_str, manifest_path, output_files):
+    """
+    혼합 시리즈 VacTran TXT 결과를 아이템 타입별 CSV로 저장합니다.
+
+    :param input_path_str: MIXED_SERIES_*.txt / *_model.txt가 있는 디렉터리
+    :param manifest_path: genVtser/mixedGenerate.py가 만든 슬롯 매니페스트 CSV
+    :param output_files: {item_type: 출력 CSV 경로}. 매니페스트에 있지만 여기 없는 타입은 건너뜁니다.
+    """
+    if not Path(input_path_str).is_dir():
+        print(f"Error: Invalid input path. Must be a directory: {input_path_str}")
+        sys.exit(1)
+    routed_rows = route_rows(input_path_str, manifest_path, list(output_files))
+    for item_type, output_file in output_files.items():
+        write_item_csv(routed_rows[item_type], item_type, output_file)
+
+def main():
+    parser = argparse.ArgumentParser(description='Route mixed PIPE/ELBOW/CONE series results into one CSV per item type.')
+    parser.add_argument('input_path', help='Directory containing VACTRAN .txt / _model.txt outputs of MIXED_SERIES files.')
+    parser.add_argument('manifest', help='Slot manifest CSV written by genVtser/mixedGenerate.py (MIXED_SERIES_manifest.csv).')
+    parser.add_argument('-o', '--output_dir', default='.', help='Directory for the {item_type}_preprocessed_output.csv files.')
+    args = parser.parse_args()
+
+    item_types = [t for t in ITEM_PARSERS if t in set(pd.read_csv(args.manifest)["item_type"])]
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    run(args.input_path, args.manifest, {t: str(Path(args.output_dir) / f"{t}_preprocessed_output.csv") for t in item_types})
+
+if __name__ == '__main__':
+    main()
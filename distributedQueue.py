@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+3단계(VacTran 자동화)를 여러 Windows 워크스테이션에 나눠 실행하는 파일 기반 작업 큐.
+
+코디네이터는 VTSER 파일을 공유 디렉터리(예: 네트워크 드라이브)의 큐에 올리고, 각 기계의 worker는 파일을 임대(lease)해
+autoVacModule의 작업 슬롯/드라이버로 처리한 뒤 .txt/_model.txt를 올립니다. 코디네이터는 올라온 결과를 출력 디렉터리로 복사하고
+완료 기록(runManifest)에 worker 이름과 함께 남기므로, 재개(--resume)와 4단계는 단일 기계 실행과 똑같이 동작합니다.
+
+큐 디렉터리 구조 (실행마다 하위 디렉터리 하나):
+    <queue_dir>/current.json                          현재 실행 {"run", "lease_seconds", "closed"}
+    <queue_dir>/<run>/pending/<vtser>                 임대 대기
+    <queue_dir>/<run>/leased/<worker>/<vtser>         임대 중 (pending에서 이름 바꾸기 한 번으로 원자적으로 임대)
+    <queue_dir>/<run>/finished/<worker>/<vtser>(.json) 처리 끝 (.json은 worker의 완료 기록 한 줄)
+    <queue_dir>/<run>/results/<worker>/<stem>.txt, <stem>_model.txt
+    <queue_dir>/<run>/workers/<worker>.json           heartbeat {"worker", "host", "pid", "beat", "slots", "leased", "done", "failed"}
+worker는 lease_seconds/4마다 heartbeat의 beat를 올립니다. 코디네이터는 beat가 바뀐 시각을 자기 시계로 재므로 기계 간 시계 차이와
+관계없이, lease_seconds 동안 beat가 바뀌지 않은 worker가 임대한 파일을 다시 pending에 넣습니다 (worker 손실).
+실패한 파일도 코디네이터가 max_retries번까지 다시 pending에 넣으므로 다른 기계가 처리할 수 있습니다.
+worker 슬롯에서 파일 복사/처리/업로드 도중 오류가 나면 그 파일을 실패 기록과 함께 finished로 넘기고 슬롯은 계속 동작합니다.
+임대를 잃은 worker가 나중에 끝낸 결과는 (leased에서 finished로 이름을 바꾸지 못해) 버려집니다.
+
+    python distributedQueue.py coordinator <vtser_dir> <txt_dir> <queue_dir> [--lease_seconds 60] [--max_retries 2] [--resume]
+    python distributedQueue.py worker <queue_dir> [--work_dir DIR] [-n 4] [--driver fake] [--warm_pool] [--exit_when_done]
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import socket
+import argparse
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+import autoVacModule
+import runManifest
+import runTelemetry
+from chunkStore import copy_atomic, result_paths
+
+DEFAULT_LEASE_SECONDS = 60 # worker heartbeat가 이 시간 동안 없으면 임대한 파일을 다시 큐에 넣음
+HEARTBEAT_PER_LEASE = 4 # heartbeat 간격 = lease_seconds / 이 값
+POLL_INTERVAL = 0.5 # 코디네이터/worker가 큐 디렉터리를 확인하는 간격
+PROGRESS_INTERVAL = 30 # 코디네이터 진행 상황 출력 간격
+CURRENT_NAME = "current.json"
+
+def write_json_atomic(path: str, data: Dict[str, Any]):
+    """임시 파일에 쓴 뒤 이름을 바꿔, 다른 기계가 반쯤 쓰인 JSON을 읽지 않게 합니다."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def read_json(path: str) -> Optional[Dict[str, Any]]:
+    """JSON 파일 내용 (없거나 아직 쓰는 중이면 None)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def list_dir(path: str) -> List[str]:
+    return sorted(os.listdir(path)) if os.path.isdir(path) else []
+
+# === 코디네이터 ===
+
+def new_run(queue_dir: str, lease_seconds: float) -> str:
+    """큐 디렉터리에 새 실행 디렉터리를 만들고 current.json을 그 실행으로 바꿉니다. :return: 실행 디렉터리 경로"""
+    run = datetime.now().strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+    run_path = os.path.join(queue_dir, run)
+    for sub in ("staging", "pending", "leased", "finished", "results", "workers"):
+        os.makedirs(os.path.join(run_path, sub), exist_ok=True)
+    write_json_atomic(os.path.join(queue_dir, CURRENT_NAME), {"run": run, "lease_seconds": lease_seconds, "closed": False})
+    return run_path
+
+def close_run(queue_dir: str, run_path: str, lease_seconds: float):
+    write_json_atomic(os.path.join(queue_dir, CURRENT_NAME),
+                      {"run": os.path.basename(run_path), "lease_seconds": lease_seconds, "closed": True})
+
+def publish_files(input_dir_path: str, run_path: str, vtser_files: List[str]):
+    """VTSER 파일을 staging에 복사한 뒤 pending으로 옮깁니다 (worker가 반쯤 복사된 파일을 임대하지 않도록)."""
+    for fname in vtser_files:
+        staged = os.path.join(run_path, "staging", fname)
+        shutil.copyfile(os.path.join(input_dir_path, fname), staged)
+        os.replace(staged, os.path.join(run_path, "pending", fname))
+
+def requeue(state: Dict[str, Any], src: str, fname: str, reason: str, seconds: float = 0.0, **extra):
+    """실패하거나 임대가 만료된 파일을 max_retries번까지 pending으로 되돌리고, 재시도를 다 쓰면 실패로 기록합니다."""
+    attempt = state['attempts'].get(fname, 0)
+    if attempt < state['max_retries']:
+        state['attempts'][fname] = attempt + 1
+        os.replace(src, os.path.join(state['run_path'], "pending", fname))
+        print(f"  [coordinator] Requeued {fname} (retry {attempt + 1}/{state['max_retries']}): {reason}")
+        return
+    os.remove(src)
+    runManifest.record_file(state['output_dir'], fname, os.path.join(state['input_dir'], fname), "failed", seconds,
+                            reason, attempt=attempt, **extra)
+    state['remaining'].discard(fname)
+    print(f"  [coordinator] !!! {fname} failed after {attempt + 1} attempts: {reason}")
+
+def accept_finished(state: Dict[str, Any], worker: str, fname: str, record: Dict[str, Any]):
+    """worker가 끝낸 파일 하나의 결과를 출력 디렉터리로 복사하고 완료 기록에 추가합니다 (실패면 requeue)."""
+    run_path = state['run_path']
+    finished = os.path.join(run_path, "finished", worker, fname)
+    extra = {'worker': worker, 'pid': record.get('pid'), 'driver': record.get('driver'), 'popup': record.get('popup'),
+             'clipboard_rejects': record.get('clipboard_rejects', 0), 'waits': record.get('waits', {})}
+    status, error = record.get('status'), record.get('error')
+    if status == "done":
+        uploads = result_paths(os.path.join(run_path, "results", worker), fname)
+        for src, dst in zip(uploads, result_paths(state['output_dir'], fname)):
+            if os.path.exists(src):
+                copy_atomic(src, dst)
+                os.remove(src)
+        status = runManifest.record_file(state['output_dir'], fname, os.path.join(state['input_dir'], fname), "done",
+                                         record.get('seconds', 0.0), attempt=state['attempts'].get(fname, 0), **extra)
+        error = "올라온 결과 .txt/_model.txt가 없거나 비어 있습니다."
+    os.remove(finished + ".json")
+    if status == "done":
+        os.remove(finished)
+        state['remaining'].discard(fname)
+        return
+    requeue(state, finished, fname, f"{worker}: {error}", record.get('seconds', 0.0), **extra)
+
+def collect_finished(state: Dict[str, Any]):
+    """finished/<worker>/*.json (worker의 완료 기록)을 모두 처리합니다."""
+    finished_dir = os.path.join(state['run_path'], "finished")
+    for worker in list_dir(finished_dir):
+        for name in list_dir(os.path.join(finished_dir, worker)):
+            if not name.endswith(".json"):
+                continue
+            record = read_json(os.path.join(finished_dir, worker, name))
+            if record is not None:
+                state['workers'].add(worker)
+                accept_finished(state, worker, name[:-len(".json")], record)
+
+def expire_lost_workers(state: Dict[str, Any]):
+    """heartbeat가 lease_seconds 동안 바뀌지 않은 worker가 임대한 (또는 결과 기록 없이 끝낸) 파일을 다시 큐에 넣습니다."""
+    run_path, now = state['run_path'], time.perf_counter()
+    workers = set(list_dir(os.path.join(run_path, "leased"))) | set(list_dir(os.path.join(run_path, "finished")))
+    for worker in sorted(workers):
+        heartbeat = read_json(os.path.join(run_path, "workers", worker + ".json"))
+        beat = heartbeat['beat'] if heartbeat else None
+        seen = state['heartbeats'].get(worker)
+        if seen is None or seen[0] != beat:
+            state['heartbeats'][worker] = (beat, now)
+            continue
+        if now - seen[1] < state['lease_seconds']:
+            continue
+        leased_dir = os.path.join(run_path, "leased", worker)
+        finished_dir = os.path.join(run_path, "finished", worker)
+        held = [os.path.join(leased_dir, f) for f in list_dir(leased_dir)]
+        held += [os.path.join(finished_dir, f) for f in list_dir(finished_dir)
+                 if not f.endswith(".json") and not os.path.exists(os.path.join(finished_dir, f + ".json"))]
+        if not held:
+            continue
+        print(f"  [coordinator] Worker {worker}: no heartbeat for {now - seen[1]:.0f}s, requeueing {len(held)} leased file(s)")
+        for path in held:
+            state['lease_expiries'] += 1
+            requeue(state, path, os.path.basename(path), f"{worker} lease expired (no heartbeat for {state['lease_seconds']:g}s)",
+                    worker=worker)
+
+def run_coordinator(input_dir_path: str, output_dir_path: str, queue_dir: str, files: Optional[List[str]] = None,
+                    resume: bool = False, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                    max_retries: int = autoVacModule.DEFAULT_MAX_RETRIES) -> Optional[Dict[str, Any]]:
+    """
+    VTSER 파일을 큐에 올리고 모든 파일의 결과가 나올 때까지 (worker 결과 수집, 실패/임대 만료 파일 재시도) 기다립니다.
+    :return: run_vactran_automation과 같은 처리량 요약 (+ 'workers', 'lease_expiries'). 처리할 파일이 없으면 None.
+    """
+    print(f"VacTran 분산 실행(코디네이터) 시작: 입력 폴더 '{input_dir_path}', 출력 폴더 '{output_dir_path}', 큐 '{queue_dir}'")
+    print(f"임대 만료: heartbeat 없이 {lease_seconds:g}초, 최대 재시도: {max_retries}회")
+    os.makedirs(output_dir_path, exist_ok=True)
+    vtser_files = autoVacModule.select_vtser_files(input_dir_path, output_dir_path, files, resume)
+    if vtser_files is None:
+        return None
+
+    os.makedirs(queue_dir, exist_ok=True)
+    run_path = new_run(queue_dir, lease_seconds)
+    publish_files(input_dir_path, run_path, vtser_files)
+    print(f"총 {len(vtser_files)}개의 VTSER 파일을 큐에 올렸습니다 ({run_path}). worker를 기다립니다.")
+
+    state = {
+        'run_path': run_path, 'input_dir': input_dir_path, 'output_dir': output_dir_path,
+        'lease_seconds': lease_seconds, 'max_retries': max_retries,
+        'remaining': set(vtser_files), 'attempts': {}, 'heartbeats': {}, 'workers': set(),
+        'lease_expiries': 0,
+    }
+    start = last_progress = time.perf_counter()
+    try:
+        while state['remaining']:
+            collect_finished(state)
+            expire_lost_workers(state)
+            if time.perf_counter() - last_progress >= PROGRESS_INTERVAL:
+                last_progress = time.perf_counter()
+                leased = sum(len(list_dir(os.path.join(run_path, "leased", w))) for w in list_dir(os.path.join(run_path, "leased")))
+                print(f"  [coordinator] {len(vtser_files) - len(state['remaining'])}/{len(vtser_files)} files finished, "
+                      f"{leased} leased, workers: {', '.join(sorted(state['heartbeats'])) or '-'}")
+            if state['remaining']:
+                time.sleep(POLL_INTERVAL)
+    finally:
+        close_run(queue_dir, run_path, lease_seconds)
+    elapsed = time.perf_counter() - start
+
+    completed = autoVacModule.count_completed(vtser_files, output_dir_path)
+    summary = {
+        'mode': "distributed",
+        'files': len(vtser_files),
+        'completed': completed,
+        'seconds': elapsed,
+        'files_per_min': completed / elapsed * 60 if elapsed > 0 else 0.0,
+        'instances': None,
+        'retries': sum(state['attempts'].values()),
+        'watchdog_kills': 0, # worker 쪽 watchdog 종료는 각 worker가 출력합니다.
+        'concurrency_changes': None,
+        'final_concurrency': None,
+        'workers': sorted(state['workers']),
+        'lease_expiries': state['lease_expiries'],
+    }
+    print(f"\nVacTran 분산 실행 완료. 모든 결과는 '{output_dir_path}'에 저장됨.")
+    print(f"처리량 (distributed): {completed}/{len(vtser_files)} 파일 완료, {elapsed:.1f}초, {summary['files_per_min']:.2f} files/min")
+    print(f"worker {len(state['workers'])}대 ({', '.join(summary['workers'])}), 재시도 {summary['retries']}회, "
+          f"임대 만료 {state['lease_expiries']}회")
+    return summary
+
+# === worker ===
+
+def lease_file(run_path: str, worker: str) -> Optional[str]:
+    """pending의 파일 하나를 leased/<worker>로 옮겨 임대합니다 (다른 worker가 먼저 옮긴 파일은 건너뜀). 없으면 None."""
+    leased_dir = os.path.join(run_path, "leased", worker)
+    os.makedirs(leased_dir, exist_ok=True)
+    for fname in list_dir(os.path.join(run_path, "pending")):
+        try:
+            os.rename(os.path.join(run_path, "pending", fname), os.path.join(leased_dir, fname))
+        except OSError:
+            continue
+        return fname
+    return None
+
+def upload_result(run_path: str, worker: str, fname: str, local_output_dir: str) -> bool:
+    """
+    결과를 results/<worker>에 올리고 임대한 파일을 finished/<worker>로 옮긴 뒤 완료 기록(.json)을 씁니다.
+    :return: False면 임대가 이미 만료되어 (다른 worker에게 넘어가) 결과를 버림
+    """
+    record = runManifest.load_records(runManifest.manifest_path(local_output_dir)).get(fname, {"status": "failed"})
+    if record['status'] == "done":
+        upload_dir = os.path.join(run_path, "results", worker)
+        os.makedirs(upload_dir, exist_ok=True)
+        for src, dst in zip(result_paths(local_output_dir, fname), result_paths(upload_dir, fname)):
+            copy_atomic(src, dst)
+    finished_dir = os.path.join(run_path, "finished", worker)
+    os.makedirs(finished_dir, exist_ok=True)
+    try:
+        os.rename(os.path.join(run_path, "leased", worker, fname), os.path.join(finished_dir, fname))
+    except OSError:
+        return False
+    write_json_atomic(os.path.join(finished_dir, fname + ".json"), record)
+    return True
+
+def return_failed(run_path: str, worker: str, fname: str, error: str, seconds: float = 0.0):
+    """
+    처리나 업로드 도중 오류가 난 파일을 실패 기록과 함께 finished/<worker>로 넘겨, 코디네이터가 max_retries에 따라 다시 큐에 넣게 합니다.
+    upload_result가 이름 바꾸기 후 기록 쓰기 전에 실패한 경우(finished에 파일만 있음)도 기록을 씁니다. 임대가 이미 만료되었으면 아무것도 하지 않습니다.
+    """
+    finished_dir = os.path.join(run_path, "finished", worker)
+    finished = os.path.join(finished_dir, fname)
+    os.makedirs(finished_dir, exist_ok=True)
+    try:
+        os.rename(os.path.join(run_path, "leased", worker, fname), finished)
+    except FileNotFoundError:
+        pass
+    if os.path.exists(finished) and not os.path.exists(finished + ".json"):
+        write_json_atomic(finished + ".json", {"file": fname, "status": "failed", "seconds": round(seconds, 3), "error": error})
+
+def run_worker(queue_dir: str, work_dir: str, concurrency: int = autoVacModule.DEFAULT_CONCURRENCY,
+               driver: str = autoVacModule.DEFAULT_DRIVER, driver_options: Optional[Dict[str, Any]] = None,
+               warm_pool: bool = False, recycle_after: int = autoVacModule.DEFAULT_RECYCLE_AFTER,
+               file_deadline: Optional[float] = autoVacModule.DEFAULT_FILE_DEADLINE,
+               worker: Optional[str] = None, exit_when_done: bool = False) -> Dict[str, Any]:
+    """
+    큐에서 파일을 임대해 concurrency개의 작업 슬롯으로 처리하고 결과를 올립니다.
+    파일은 work_dir/<run>/in으로 복사해 처리하며, 기계별 완료 기록/단계별 시간 기록은 work_dir/<run>/out에 남습니다.
+    재시도는 코디네이터가 정하므로 worker는 실패한 파일도 바로 올립니다. exit_when_done이면 현재 실행이 닫힐 때 끝납니다.
+    :return: {'worker', 'leased', 'done', 'failed', 'lost'}
+    """
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    vac_driver = autoVacModule.load_driver(driver, driver_options)
+    print(f"VacTran worker '{worker}' 시작: 큐 '{queue_dir}', 작업 폴더 '{work_dir}', 동시 실행 수: {concurrency}, 드라이버: {driver}"
+          + (f" (웜 풀, 인스턴스당 최대 {recycle_after}개 파일)" if warm_pool else ""))
+    counts = {'worker': worker, 'leased': 0, 'done': 0, 'failed': 0, 'lost': 0}
+    counts_lock = threading.Lock()
+    stop = threading.Event()
+    pool = {'recycle_after': recycle_after, 'metrics': []}
+    runs_started = set()
+
+    def current_run():
+        current = read_json(os.path.join(queue_dir, CURRENT_NAME))
+        if current is None or not os.path.isdir(os.path.join(queue_dir, current['run'])):
+            return None
+        return current
+
+    def heartbeat():
+        beat = 0
+        while not stop.is_set():
+            current = current_run()
+            if current is not None and not current['closed']:
+                beat += 1
+                with counts_lock:
+                    data = {**counts, 'host': socket.gethostname(), 'pid': os.getpid(), 'beat': beat, 'slots': concurrency}
+                try:
+                    write_json_atomic(os.path.join(queue_dir, current['run'], "workers", worker + ".json"), data)
+                except OSError as e:
+                    # 공유 디렉터리의 일시적인 오류: 다음 beat에서 다시 씀 (lease_seconds 안에 회복되면 임대는 유지됨)
+                    print(f"  [heartbeat] beat {beat} 쓰기 실패, 다음 beat에서 다시 시도: {e}")
+            stop.wait(current['lease_seconds'] / HEARTBEAT_PER_LEASE if current else POLL_INTERVAL)
+
+    def hand_back(slot: int, run_path: str, fname: str, error: str, seconds: float, unreturned: List):
+        """return_failed가 공유 디렉터리 오류로 실패하면 unreturned에 남겨 다음 반복에서 다시 시도합니다."""
+        try:
+            return_failed(run_path, worker, fname, error, seconds)
+        except OSError as e:
+            print(f"  [slot {slot}] {fname} 반환 실패, 다시 시도합니다: {e}")
+            unreturned.append((run_path, fname, error, seconds))
+
+    def slot_loop(slot: int):
+        vac_driver.init_thread()
+        holder: Dict[str, Any] = {'instance': None}
+        unreturned = []
+        while not stop.is_set():
+            for item in unreturned[:]:
+                unreturned.remove(item)
+                hand_back(slot, *item, unreturned)
+            current = current_run()
+            if current is None or current['closed']:
+                if exit_when_done and current is not None:
+                    break
+                stop.wait(POLL_INTERVAL)
+                continue
+            run_path = os.path.join(queue_dir, current['run'])
+            try:
+                fname = lease_file(run_path, worker)
+            except OSError as e:
+                print(f"  [slot {slot}] 큐 확인 실패, 다시 시도합니다: {e}")
+                stop.wait(POLL_INTERVAL)
+                continue
+            if fname is None:
+                stop.wait(POLL_INTERVAL)
+                continue
+            with counts_lock:
+                counts['leased'] += 1
+            started = time.perf_counter()
+            try:
+                input_dir = os.path.join(work_dir, current['run'], "in")
+                output_dir = os.path.join(work_dir, current['run'], "out")
+                os.makedirs(input_dir, exist_ok=True)
+                os.makedirs(output_dir, exist_ok=True)
+                with counts_lock:
+                    if current['run'] not in runs_started:
+                        runs_started.add(current['run'])
+                        runTelemetry.start_run(output_dir)
+                shutil.copyfile(os.path.join(run_path, "leased", worker, fname), os.path.join(input_dir, fname))
+                if warm_pool:
+                    status = autoVacModule.process_file_warm(vac_driver, slot, holder, fname, input_dir, output_dir, pool, watchdog)
+                else:
+                    status = autoVacModule.process_file(vac_driver, slot, fname, input_dir, output_dir, watchdog)
+                uploaded = upload_result(run_path, worker, fname, output_dir)
+            except Exception as e:
+                # 슬롯 스레드가 죽으면 임대한 파일이 heartbeat가 살아 있는 동안 영영 돌아오지 않으므로, 실패로 반환하고 슬롯은 계속
+                print(f"  [slot {slot}] !!! {fname} 처리/업로드 중 오류, 실패로 반환합니다: {e}")
+                with counts_lock:
+                    counts['failed'] += 1
+                hand_back(slot, run_path, fname, f"worker 오류: {e}", time.perf_counter() - started, unreturned)
+                continue
+            with counts_lock:
+                counts[status if uploaded else 'lost'] += 1
+            if not uploaded:
+                print(f"  [slot {slot}] Lease for {fname} expired before upload, result discarded")
+        if holder['instance'] is not None:
+            autoVacModule.recycle_instance(vac_driver, pool, holder['instance'], "queue_empty")
+
+    watchdog = autoVacModule.start_watchdog(vac_driver, file_deadline)
+    beat_thread = threading.Thread(target=heartbeat, name="vactran-heartbeat", daemon=True)
+    beat_thread.start()
+    threads = [threading.Thread(target=slot_loop, args=(slot,), name=f"vactran-slot-{slot}", daemon=True)
+               for slot in range(1, concurrency + 1)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(POLL_INTERVAL)
+    except KeyboardInterrupt:
+        print("worker 중단 요청: 처리 중인 파일이 끝나면 종료합니다.")
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        stop.set()
+        beat_thread.join()
+        autoVacModule.stop_watchdog(watchdog)
+    if warm_pool:
+        autoVacModule.print_pool_metrics(pool['metrics'])
+    print(f"\nVacTran worker '{worker}' 종료: 임대 {counts['leased']}개, 완료 {counts['done']}개, 실패 {counts['failed']}개, "
+          f"임대 만료로 버림 {counts['lost']}개")
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="3단계 VacTran 자동화를 공유 디렉터리 큐로 여러 기계에 나눠 실행합니다.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    coordinator = sub.add_parser("coordinator", help="VTSER 파일을 큐에 올리고 worker 결과를 모아 출력 디렉터리에 저장")
+    coordinator.add_argument("input_dir", help="VTSER 파일들이 있는 입력 디렉터리")
+    coordinator.add_argument("output_dir", help="결과 TXT 파일을 저장할 출력 디렉터리")
+    coordinator.add_argument("queue_dir", help="모든 worker가 접근할 수 있는 공유 큐 디렉터리")
+    coordinator.add_argument("--lease_seconds", type=float, default=DEFAULT_LEASE_SECONDS,
+                             help=f"worker heartbeat가 이 시간 동안 없으면 임대한 파일을 다시 큐에 넣음 (기본값: {DEFAULT_LEASE_SECONDS})")
+    coordinator.add_argument("--max_retries", type=int, default=autoVacModule.DEFAULT_MAX_RETRIES,
+                             help=f"실패하거나 임대가 만료된 파일을 다시 큐에 넣는 최대 횟수 (기본값: {autoVacModule.DEFAULT_MAX_RETRIES})")
+    coordinator.add_argument("--resume", action="store_true",
+                             help="output_dir의 완료 기록(vactran_manifest.jsonl)으로 완료된 파일을 건너뜀")
+
+    worker = sub.add_parser("worker", help="큐에서 파일을 임대해 이 기계의 VacTran으로 처리하고 결과를 올림")
+    worker.add_argument("queue_dir", help="코디네이터와 공유하는 큐 디렉터리")
+    worker.add_argument("--work_dir", default=None, help="이 기계의 작업 폴더 (기본값: ./vactran_worker_<worker 이름>)")
+    worker.add_argument("-n", "--concurrency", type=int, default=autoVacModule.DEFAULT_CONCURRENCY,
+                        help=f"이 기계에서 동시에 실행할 프로세스 수 (기본값: {autoVacModule.DEFAULT_CONCURRENCY})")
+    worker.add_argument("--driver", choices=list(autoVacModule.DRIVERS), default=autoVacModule.DEFAULT_DRIVER,
+                        help=f"VacTran 조작 드라이버 (기본값: {autoVacModule.DEFAULT_DRIVER})")
+    worker.add_argument("--driver_config", default=None, help="드라이버 설정 JSON 파일")
+    worker.add_argument("--warm_pool", action="store_true", help="슬롯마다 VacTran 인스턴스를 유지하고 파일 열기로 다음 파일을 불러옴")
+    worker.add_argument("--recycle_after", type=int, default=autoVacModule.DEFAULT_RECYCLE_AFTER,
+                        help=f"웜 인스턴스 하나로 처리할 최대 파일 수 (기본값: {autoVacModule.DEFAULT_RECYCLE_AFTER})")
+    worker.add_argument("--file_deadline", type=float, default=autoVacModule.DEFAULT_FILE_DEADLINE,
+                        help=f"파일 하나의 최대 처리 시간(초), 넘으면 인스턴스를 강제 종료 (0이면 끔, 기본값: {autoVacModule.DEFAULT_FILE_DEADLINE})")
+    worker.add_argument("--worker", default=None, help="worker 이름 (기본값: <호스트 이름>-<프로세스 ID>)")
+    worker.add_argument("--exit_when_done", action="store_true", help="현재 실행이 끝나면(코디네이터가 닫으면) 종료 (기본값: 다음 실행을 계속 기다림)")
+    args = parser.parse_args()
+
+    if args.command == "coordinator":
+        if args.lease_seconds <= 0 or args.max_retries < 0:
+            parser.error("--lease_seconds는 0보다 커야 하고 --max_retries는 0 이상이어야 합니다.")
+        run_coordinator(args.input_dir, args.output_dir, args.queue_dir, resume=args.resume,
+                        lease_seconds=args.lease_seconds, max_retries=args.max_retries)
+        return
+    if args.concurrency < 1 or args.recycle_after < 1:
+        parser.error("--concurrency/--recycle_after는 1 이상이어야 합니다.")
+    driver_options = None
+    if args.driver_config:
+        with open(args.driver_config, 'r', encoding='utf-8') as f:
+            driver_options = json.load(f)
+    name = args.worker or f"{socket.gethostname()}-{os.getpid()}"
+    run_worker(args.queue_dir, args.work_dir or os.path.abspath(f"vactran_worker_{name}"), args.concurrency, args.driver,
+               driver_options, args.warm_pool, args.recycle_after, args.file_deadline, name, args.exit_when_done)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Byte-equality check and benchmark of genVtser/vtserWriter.py against the previous
+per-row DataFrame.iterrows() writers.
+
+The old pipe/elbow/reducer formatters are embedded below unchanged (apart from the
+"Saved:" print). Both writers are run on the same synthetic sample tables (pipe, elbow
+with float and with int angle columns, reducer), every generated file is compared
+byte for byte, and the old/new timings are printed. Exits with an error on the first
+difference.
+
+    python genVtser/benchVtserWriter.py [--rows 20000] [--seed 0]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+try:
+    from .vtserWriter import VTSER_CHUNK_SIZE, write_vtser_series
+except ImportError:
+    from vtserWriter import VTSER_CHUNK_SIZE, write_vtser_series
+
+# === Previous writers (iterrows, 50 samples per file) ===
+
+def old_pipe_chunk(chunk_df, file_index, save_dir):
+    lines = ["[General]", f"Total={len(chunk_df)}", "ModelMultiplier=1"]
+    for idx, row in chunk_df.iterrows():
+        diameter_cm = float(row['Diameter_cm'])
+        length_cm = float(row['Length_cm'])
+        lines.extend([
+            f"[{idx % 50}]", "Description=PIPE", "Quantity=1",
+            f"Diameter={diameter_cm:.6f}", f"ModelLength={length_cm:.6f}",
+            "Volume=0", "EntranceLoss=0", "ExitLoss=0", "EdgeRadius=0", "Projecting=0"
+        ])
+    output_filename = f"PIPE_SERIES_{file_index+1:03d}.VTSER"
+    with open(os.path.join(save_dir, output_filename), "w") as f:
+        f.write("\n".join(lines))
+
+def old_elbow_chunk(chunk_df, file_index, save_dir):
+    lines = ["[General]", f"Total={len(chunk_df)}", "ModelMultiplier=1"]
+    for idx, row in chunk_df.iterrows():
+        diameter_cm = float(row['Diameter_cm'])
+        bend_angle = float(row['BendAngle_deg'])
+        quantity = int(row['Quantity'])
+        lines.extend([
+            f"[{idx % 50}]", "Description=ELBOW", f"Quantity={quantity}",
+            f"Diameter={diameter_cm:.6f}", "ModelLength=1", "Volume=0",
+            "EntranceLoss=0", "ExitLoss=0", f"BendAngle={bend_angle}"
+        ])
+    output_filename = f"ELBOW_SERIES_{file_index+1:03d}.VTSER"
+    with open(os.path.join(save_dir, output_filename), "w") as f:
+        f.write("\n".join(lines))
+
+def old_reducer_chunk(chunk_df, file_index, save_dir):
+    lines = ["[General]", f"Total={len(chunk_df)}", "ModelMultiplier=1"]
+    for idx, row in chunk_df.iterrows():
+        entrance_d = float(row['D1_cm'])
+        exit_d = float(row['D2_cm'])
+        length_cm = float(row['Length_cm'])
+        lines.extend([
+            f"[{idx % 50}]", "Description=CONE", "Quantity=1",
+            f"Diameter={entrance_d:.6f}", f"ModelLength={length_cm:.6f}",
+            "Volume=0", "EntranceLoss=0", "ExitLoss=1",
+            f"EntranceDiameter={entrance_d:.6f}", f"ExitDiameter={exit_d:.6f}"
+        ])
+    output_filename = f"REDUCER_SERIES_{file_index+1:03d}.VTSER"
+    with open(os.path.join(save_dir, output_filename), "w") as f:
+        f.write("\n".join(lines))
+
+def old_write(df, save_dir, write_chunk):
+    os.makedirs(save_dir, exist_ok=True)
+    chunk_size = 50
+    chunks = [df[i:i+chunk_size] for i in range(0, len(df), chunk_size)]
+    for idx, chunk in enumerate(chunks):
+        write_chunk(chunk.reset_index(drop=True), idx, save_dir)
+
+# === Sample tables ===
+
+def make_tables(rows, seed):
+    """Synthetic tables with the sampleDataGen columns, plus edge values for the float formats."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, rows + 1)
+    diameter = np.round(rng.uniform(2.54, 25.4, rows), 4)
+    diameter[:3] = [1e-7, 123456789.125, 0.0000005]
+    length = np.round(rng.uniform(10.0, 2000.0, rows), 4)
+    float_angles = rng.choice([15.0, 30.0, 45.0, 60.0, 90.0, 22.5, 1e-7, 123456789.125], rows)
+    quantity = rng.integers(1, 5, rows)
+    d1 = np.round(rng.uniform(5.0, 25.4, rows), 4)
+    d2 = np.round(d1 * rng.uniform(0.2, 0.95, rows), 4)
+    return {
+        "pipe": pd.DataFrame({"SampleID": ids, "Diameter_cm": diameter, "Length_cm": length}),
+        "elbow_float": pd.DataFrame({"SampleID": ids, "Diameter_cm": diameter, "BendAngle_deg": float_angles,
+                                     "Quantity": quantity}),
+        "elbow_int": pd.DataFrame({"SampleID": ids, "Diameter_cm": diameter,
+                                   "BendAngle_deg": rng.choice([15, 30, 45, 60, 90], rows), "Quantity": quantity}),
+        "reducer": pd.DataFrame({"SampleID": ids, "D1_cm": d1, "D2_cm": d2, "Length_cm": length}),
+    }
+
+CASES = [
+    # (table, old chunk writer, component, file prefix)
+    ("pipe", old_pipe_chunk, "PIPE", "PIPE"),
+    ("elbow_float", old_elbow_chunk, "ELBOW", "ELBOW"),
+    ("elbow_int", old_elbow_chunk, "ELBOW", "ELBOW"),
+    ("reducer", old_reducer_chunk, "CONE", "REDUCER"),
+]
+
+def compare_dirs(old_dir, new_dir):
+    """Returns the names of files that are missing or differ between the two directories."""
+    old_files, new_files = sorted(os.listdir(old_dir)), sorted(os.listdir(new_dir))
+    if old_files != new_files:
+        return sorted(set(old_files) ^ set(new_files))
+    different = []
+    for fname in old_files:
+        with open(os.path.join(old_dir, fname), "rb") as f_old, open(os.path.join(new_dir, fname), "rb") as f_new:
+            if f_old.read() != f_new.read():
+                different.append(fname)
+    return different
+
+def main():
+    parser = argparse.ArgumentParser(description="Check byte equality of vtserWriter against the old iterrows writers and time both.")
+    parser.add_argument("--rows", type=int, default=20000, help="Samples per table (default: 20000).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic tables (default: 0).")
+    args = parser.parse_args()
+
+    tables = make_tables(args.rows, args.seed)
+    print(f"{'table':<12}{'files':>7}{'old (s)':>10}{'new (s)':>10}{'speedup':>9}")
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, old_chunk, component, prefix in CASES:
+            df = tables[name]
+            old_dir, new_dir = os.path.join(tmp, name, "old"), os.path.join(tmp, name, "new")
+            start = time.perf_counter()
+            old_write(df, old_dir, old_chunk)
+            old_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            write_vtser_series(df, new_dir, component, file_prefix=prefix, chunk_size=VTSER_CHUNK_SIZE)
+            new_seconds = time.perf_counter() - start
+            different = compare_dirs(old_dir, new_dir)
+            print(f"{name:<12}{len(os.listdir(new_dir)):>7}{old_seconds:>10.2f}{new_seconds:>10.2f}{old_seconds / new_seconds:>8.1f}x"
+                  + (f"  DIFFERENT: {', '.join(different[:5])}" if different else "  identical"))
+            failed = failed or bool(different)
+    if failed:
+        sys.exit("vtserWriter output differs from the old writers.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import os
+import argparse
+
+from sampleTable import read_sample_table
+
+try:
+    from .vtserWriter import ITEM_COMPONENTS, VTSER_CHUNK_SIZE, write_mixed_series, print_series_summary
+except ImportError:
+    from vtserWriter import ITEM_COMPONENTS, VTSER_CHUNK_SIZE, write_mixed_series, print_series_summary
+
+def run(sample_paths, output_dir, verbose=False, chunk_size=VTSER_CHUNK_SIZE):
+    """
+    Reads one sample table per item type ({item_type: path}) and packs all of them into shared
+    MIXED_SERIES files, so a single VacTran pass covers every component type.
+    Returns (series file paths, manifest path).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tables = {}
+    for item_type, sample_path in sample_paths.items():
+        try:
+            tables[item_type] = read_sample_table(sample_path)
+        except FileNotFoundError:
+            print(f"Error: Input sample file not found at {sample_path}")
+            return
+
+    saved_paths, manifest_path = write_mixed_series(tables, output_dir, chunk_size=chunk_size, verbose=verbose)
+    counts = ", ".join(f"{item_type}={len(df)}" for item_type, df in tables.items())
+    print_series_summary(saved_paths, sum(len(df) for df in tables.values()), output_dir)
+    print(f"Slot manifest ({counts}): {manifest_path}")
+    return saved_paths, manifest_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate mixed PIPE/ELBOW/CONE VTSER files from several sample tables.")
+    for item_type in ITEM_COMPONENTS:
+        parser.add_argument(f"--{item_type}", help=f"Path to the {item_type} sample file (.npz/.parquet/.feather/.csv/.xlsx).")
+    parser.add_argument("--output_dir", required=True, help="Directory to save VTSER files and the slot manifest.")
+    parser.add_argument("--chunk_size", type=int, default=VTSER_CHUNK_SIZE, help=f"Samples per VTSER file (default: {VTSER_CHUNK_SIZE}).")
+    parser.add_argument("--verbose", action="store_true", help="Print every saved file instead of a summary line.")
+    args = parser.parse_args()
+
+    sample_paths = {item_type: getattr(args, item_type) for item_type in ITEM_COMPONENTS if getattr(args, item_type)}
+    if not sample_paths:
+        parser.error("at least one of --pipe/--elbow/--reducer/--expander is required")
+    run(sample_paths, args.output_dir, verbose=args.verbose, chunk_size=args.chunk_size)
+
+if __name__ == '__main__':
+    main()
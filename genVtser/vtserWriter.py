@@ -0,0 +1,152 @@
+"""
+Shared VTSER series writer for the genVtser modules.
+
+Every VacTran component type (PIPE, ELBOW, CONE) is described in COMPONENT_SCHEMAS by a
+list of (key, value) fields. A string value is written as-is ("Volume=0"); a
+(column, format) value is filled from the sample table column. The fields are compiled
+once into a '%' template for one section, the columns are converted to Python lists once
+for the whole table, and every file is formatted in one pass and written with a single
+buffered write. The output is byte-identical to the previous per-row
+DataFrame.iterrows() writers.
+
+write_mixed_series packs samples of several item types into the same series files and
+writes a slot manifest (file, slot, item_type, component, SampleID) so that
+dataPreprosessor/seriesRouter.py can route the VacTran results back to each item type.
+"""
+
+import os
+import pandas as pd
+
+FIXED6 = "%.6f" # same as f"{float(v):.6f}"
+REPR = "%r" # same as f"{float(v)}", e.g. 15.0
+INT = "%d" # same as int(v), truncates
+
+VTSER_CHUNK_SIZE = 50 # default samples per VTSER file (section numbers [i] run 0..chunk_size-1)
+WRITE_BUFFER_SIZE = 1 << 20
+
+COMPONENT_SCHEMAS = {
+    "PIPE": [
+        ("Description", "PIPE"), ("Quantity", "1"),
+        ("Diameter", ("Diameter_cm", FIXED6)), ("ModelLength", ("Length_cm", FIXED6)),
+        ("Volume", "0"), ("EntranceLoss", "0"), ("ExitLoss", "0"), ("EdgeRadius", "0"), ("Projecting", "0"),
+    ],
+    "ELBOW": [
+        ("Description", "ELBOW"), ("Quantity", ("Quantity", INT)),
+        ("Diameter", ("Diameter_cm", FIXED6)), ("ModelLength", "1"), ("Volume", "0"),
+        ("EntranceLoss", "0"), ("ExitLoss", "0"), ("BendAngle", ("BendAngle_deg", REPR)),
+    ],
+    "CONE": [
+        ("Description", "CONE"), ("Quantity", "1"),
+        ("Diameter", ("D1_cm", FIXED6)), ("ModelLength", ("Length_cm", FIXED6)),
+        ("Volume", "0"), ("EntranceLoss", "0"), ("ExitLoss", "1"),
+        ("EntranceDiameter", ("D1_cm", FIXED6)), ("ExitDiameter", ("D2_cm", FIXED6)),
+    ],
+}
+# Item type -> VacTran component written for it (reducers and expanders are both CONE)
+ITEM_COMPONENTS = {"pipe": "PIPE", "elbow": "ELBOW", "reducer": "CONE", "expander": "CONE"}
+
+MIXED_FILE_PREFIX = "MIXED"
+MIXED_MANIFEST_NAME = f"{MIXED_FILE_PREFIX}_SERIES_manifest.csv"
+MANIFEST_COLUMNS = ["file", "slot", "item_type", "component", "SampleID"]
+
+def section_template(fields):
+    """Compiles fields into a '%' template for one section ([index] first) and the list of (column, format) it needs."""
+    lines = ["[%d]"]
+    columns = []
+    for key, value in fields:
+        if isinstance(value, str):
+            lines.append(f"{key}={value.replace('%', '%%')}")
+        else:
+            column, fmt = value
+            lines.append(f"{key}={fmt}")
+            columns.append((column, fmt))
+    return "\n".join(lines), columns
+
+def column_values(df, column):
+    """
+    Converts a column to a list of Python floats in one call.
+    iterrows() upcast every numeric row to float64, so INT ('%d') truncates exactly like the old int(v).
+    """
+    return df[column].to_numpy(dtype=float).tolist()
+
+def format_vtser_text(sections):
+    """Joins the header and section strings into a VTSER file body (no trailing newline, as before)."""
+    header = f"[General]\nTotal={len(sections)}\nModelMultiplier=1"
+    if not sections:
+        return header
+    return header + "\n" + "\n".join(sections)
+
+def format_sections(df, component, slots):
+    """Formats one section string per row of df; slots gives each row's position inside its series file."""
+    template, columns = section_template(COMPONENT_SCHEMAS[component])
+    values = [column_values(df, column) for column, _ in columns]
+    return [template % ((slot,) + tuple(rest)) for slot, *rest in zip(slots, *values)]
+
+def series_file_name(file_prefix, file_index):
+    return f"{file_prefix}_SERIES_{file_index+1:03d}.VTSER"
+
+def require_chunk_size(chunk_size):
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+
+def write_series_files(sections, save_dir, file_prefix, chunk_size=VTSER_CHUNK_SIZE, verbose=False):
+    """Writes formatted sections as consecutive series files of chunk_size sections; returns the written paths."""
+    require_chunk_size(chunk_size)
+    os.makedirs(save_dir, exist_ok=True)
+    saved_paths = []
+    for file_index, start in enumerate(range(0, len(sections), chunk_size)):
+        output_path = os.path.join(save_dir, series_file_name(file_prefix, file_index))
+        with open(output_path, "w", buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(format_vtser_text(sections[start:start + chunk_size]))
+        saved_paths.append(output_path)
+        if verbose:
+            print(f"Saved: {output_path}")
+    return saved_paths
+
+def write_vtser_series(df, save_dir, component, file_prefix=None, chunk_size=VTSER_CHUNK_SIZE, verbose=False):
+    """
+    Writes the whole sample table as {file_prefix}_SERIES_{n:03d}.VTSER files of one component type.
+    file_prefix defaults to the component name. Prints "Saved: <path>" per file only when verbose.
+    """
+    require_chunk_size(chunk_size)
+    slots = [row % chunk_size for row in range(len(df))]
+    sections = format_sections(df, component, slots)
+    return write_series_files(sections, save_dir, file_prefix or component, chunk_size, verbose)
+
+def series_manifest_name(file_prefix):
+    return f"{file_prefix}_SERIES_manifest.csv"
+
+def write_mixed_series(tables, save_dir, chunk_size=VTSER_CHUNK_SIZE, verbose=False, file_prefix=MIXED_FILE_PREFIX):
+    """
+    Packs the sample tables of several item types ({item_type: DataFrame}) into shared
+    {file_prefix}_SERIES_{n:03d}.VTSER files, in the given item order, and writes the slot manifest
+    {file_prefix}_SERIES_manifest.csv.
+
+    :return: (list of series file paths, manifest path)
+    """
+    require_chunk_size(chunk_size)
+    sections = []
+    manifest = []
+    for item_type, df in tables.items():
+        component = ITEM_COMPONENTS[item_type]
+        first = len(sections)
+        positions = range(first, first + len(df))
+        sections.extend(format_sections(df, component, [pos % chunk_size for pos in positions]))
+        sample_ids = df["SampleID"].tolist() if "SampleID" in df.columns else list(range(1, len(df) + 1))
+        manifest.append(pd.DataFrame({
+            "file": [series_file_name(file_prefix, pos // chunk_size) for pos in positions],
+            "slot": [pos % chunk_size for pos in positions],
+            "item_type": item_type,
+            "component": component,
+            "SampleID": sample_ids,
+        }, columns=MANIFEST_COLUMNS))
+
+    saved_paths = write_series_files(sections, save_dir, file_prefix, chunk_size, verbose)
+    manifest_path = os.path.join(save_dir, series_manifest_name(file_prefix))
+    manifest_df = pd.concat(manifest, ignore_index=True) if manifest else pd.DataFrame(columns=MANIFEST_COLUMNS)
+    manifest_df.to_csv(manifest_path, index=False)
+    return saved_paths, manifest_path
+
+def print_series_summary(saved_paths, n_samples, save_dir):
+    """Prints a one-line summary of a series write."""
+    print(f"Saved {len(saved_paths)} VTSER files ({n_samples} samples) to {save_dir}")
@@ -1,47 +1,33 @@
 import argparse
+import functools
+import json
 import os
 import sys
 import time
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
 # --- 프로젝트 모듈 임포트 ---
 # 각 단계별 스크립트에서 로직을 수행하는 함수를 직접 임포트합니다.
 from sampleDataGen import pipeDataGen, elbowDataGen, reducerDataGen, expanderDataGen
-from genVtser import pipeGenerate, elbowGenerate, reducerGenerate
-from dataPreprosessor import pipePrepro, elbowPrepro, reducerPrepro
-# from autoVacModule import run_vactran_automation # 기존 임포트 라인 주석 처리 또는 삭제
-
-# autoVacModule 임포트 시도 및 clipboard 관련 오류 처리
-AUTO_VAC_MODULE_AVAILABLE = False
-try:
-    from autoVacModule import run_vactran_automation
-    AUTO_VAC_MODULE_AVAILABLE = True
-except ImportError as e:
-    # 에러 메시지에 'clipboard'가 포함되어 있는지 확인 (대소문자 구분 없이)
-    if 'clipboard' in str(e).lower():
-        print(f"WARNING (mainPipeline.py): Failed to import 'autoVacModule', likely due to missing 'clipboard' module: {e}")
-        print("                         VacTran automation (pipeline step 3) will be unavailable if mainPipeline.py is run directly.")
-        print("                         To enable it, please install the 'clipboard' module (e.g., 'pip install clipboard') and ensure its dependencies are met in your Python environment.")
-        
-        # run_vactran_automation을 호출 시 오류를 발생시키는 플레이스홀더 함수로 정의
-        def run_vactran_automation(*args, **kwargs):
-            error_message = (
-                "run_vactran_automation cannot be executed because 'autoVacModule' failed to load "
-                "due to a missing 'clipboard' dependency. Please check startup warnings."
-            )
-            raise ImportError(error_message)
-    else:
-        # 'clipboard'와 관련 없는 다른 ImportError의 경우, 에러를 다시 발생시켜 파악하도록 함
-        print(f"ERROR (mainPipeline.py): Failed to import 'autoVacModule' for a reason other than 'clipboard': {e}")
-        raise
-except Exception as e_other: # 다른 예외 처리 (예: autoVacModule.py 내부의 구문 오류 등)
-    print(f"ERROR (mainPipeline.py): An unexpected error occurred while trying to import 'autoVacModule': {e_other}")
-    raise
+from genVtser import pipeGenerate, elbowGenerate, reducerGenerate, mixedGenerate
+from genVtser.vtserWriter import MIXED_MANIFEST_NAME, VTSER_CHUNK_SIZE
+from dataPreprosessor import pipePrepro, elbowPrepro, reducerPrepro, seriesRouter
+from sampleTable import SAMPLE_FORMATS, save_samples
+import activeLearning
+import chunkCalibration
+import chunkStore
+import resultCache
+import shardPlan
+from sampleTable import read_sample_table
+from sampleDataGen.samplingCore import SAMPLERS
+from autoVacModule import run_vactran_automation
 
 
 # 프로젝트 루트 디렉터리 설정
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+ITEM_TYPES = ["pipe", "elbow", "reducer", "expander"]
 
 def get_generation_parameters(item_type):
     """각 아이템 타입별 데이터 생성 파라미터 기본값을 반환합니다."""
@@ -139,13 +125,14 @@ def generate_csv_header_specs(item_type, num_samples, seed, params):
     """CSV 파일 상단에 추가할 주석 형태의 스펙 문자열을 생성합니다."""
     header_lines = [
         f"# Item Type: {item_type}",
-        f"# Number of Samples Requested (for initial Excel generation): {num_samples}",
-        f"# Seed Used (for initial Excel generation): {seed}",
+        f"# Number of Samples Requested (for initial sample generation): {num_samples}",
+        f"# Seed Used (for initial sample generation): {seed}",
         f"# Generation Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
         "# --- Data Generation Parameters (inch/mm inputs are converted to cm internally for VACTRAN) ---"
     ]
     if not isinstance(params, dict):
         params = {"description": "Parameters not available."}
+    header_lines.append(f"# In-bin Sampler: {params.get('sampler', 'uniform')}")
 
     param_details = []
     if item_type == "pipe":
@@ -180,101 +167,114 @@ def generate_csv_header_specs(item_type, num_samples, seed, params):
     return "\n".join(header_lines) + "\n"
 
 
-def main():
-    parser = argparse.ArgumentParser(description="데이터 생성 및 처리 파이프라인")
-    parser.add_argument("item_type", choices=["pipe", "elbow", "reducer", "expander"], help="처리할 항목 타입")
-    parser.add_argument("num_samples", type=int, help="생성할 샘플 데이터 수량")
-    parser.add_argument("--seed", "-s",type=int, default=42, help="데이터 생성 시 사용할 난수 시드 (기본값: 42)")
-    parser.add_argument("--base_output_dir", default=os.path.join(PROJECT_ROOT, "pipeline_output_data"), help="최상위 출력 디렉터리")
-    # 아래 라인 추가: 동시 실행 개수(n)를 지정하는 옵션
-    parser.add_argument("--concurrency","-c" ,type=int, default=4, help="VacTran 동시 실행 프로세스 수 (기본값: 4)")
-    args = parser.parse_args()
-
-    item_type = args.item_type
-    num_samples = args.num_samples
-    seed = args.seed
-    
-    generation_params = get_generation_parameters(item_type)
-    pipeline_start_time = time.time()
-    total_steps = 4
-
-    # --- 고유한 작업 디렉터리 생성 ---
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    specs_tag_for_filename = format_specs_for_filename(item_type, generation_params)
-    run_dir_name = f"{item_type}_{specs_tag_for_filename}_n{num_samples}_s{seed}_{timestamp}"
-    current_run_output_dir = os.path.join(args.base_output_dir, run_dir_name)
-
-    # --- 단계별 하위 디렉터리 경로 설정 ---
-    excel_output_dir = os.path.join(current_run_output_dir, "01_excel_data")
-    vtser_output_dir = os.path.join(current_run_output_dir, "02_vtser_files")
-    txt_output_dir = os.path.join(current_run_output_dir, "03_vactran_txt_output")
-    csv_output_dir = os.path.join(current_run_output_dir, "04_preprocessed_csv_data")
-
-    for d in [excel_output_dir, vtser_output_dir, txt_output_dir, csv_output_dir]:
+def create_stage_dirs(run_output_dir):
+    """실행(또는 능동 학습 라운드) 디렉터리 아래 단계별 하위 디렉터리를 만들고 경로 dict를 반환합니다."""
+    dirs = {
+        "sample": os.path.join(run_output_dir, "01_sample_data"),
+        "vtser": os.path.join(run_output_dir, "02_vtser_files"),
+        "txt": os.path.join(run_output_dir, "03_vactran_txt_output"),
+        "csv": os.path.join(run_output_dir, "04_preprocessed_csv_data"),
+    }
+    for d in dirs.values():
         os.makedirs(d, exist_ok=True)
+    return dirs
 
-    print(f"--- 파이프라인 시작: {item_type}, 샘플 수: {num_samples}, 시드: {seed} ---")
-    print(f"모든 산출물은 다음 디렉터리에 저장됩니다: {current_run_output_dir}")
+def generate_samples(item_type, params, total_samples, seed, workers=1, sampler="uniform"):
+    """아이템 타입별 층화 샘플을 DataFrame으로 생성합니다 (파일 저장 없음, 능동 학습 후보 풀 생성용)."""
+    if item_type == 'pipe':
+        return pipeDataGen.generate_binned_samples(total_samples, params["diameter_inch_spec"], params["length_mm_spec"],
+                                                   seed=seed, workers=workers, sampler=sampler)
+    if item_type == 'elbow':
+        return elbowDataGen.generate_elbow_samples(total_samples, params["diameter_inch_spec"], params["angles_deg"],
+                                                   seed=seed, workers=workers, sampler=sampler)
+    if item_type == 'reducer':
+        return reducerDataGen.generate_reducer_samples(total_samples, params["d1_inch_spec"], params["d2_inch_spec"],
+                                                       params["length_mm_spec"], seed=seed, workers=workers, sampler=sampler)
+    return expanderDataGen.generate_expander_samples(total_samples, params["d1_inch_spec"], params["d2_inch_spec"],
+                                                     params["length_mm_spec"], seed=seed, workers=workers, sampler=sampler)
 
-    # --- 1. sampleDataGen 실행 ---
+def stage_generate_samples(item_type, generation_params, num_samples, seed, sample_data_path, args, total_steps):
+    """1단계: sampleDataGen 실행"""
     print(f"\n[단계 1/{total_steps}] {item_type} 샘플 데이터 생성 중...")
-    sample_data_excel_filename = f"{item_type}_samples_n{num_samples}_s{seed}.xlsx"
-    sample_data_excel_path = os.path.join(excel_output_dir, sample_data_excel_filename)
-
     try:
         if item_type == 'pipe':
             params = generation_params
             pipeDataGen.run(
-                output_file=sample_data_excel_path,
+                output_file=sample_data_path,
                 total_samples=num_samples,
                 diameter_inch_spec=params["diameter_inch_spec"],
                 length_mm_spec=params["length_mm_spec"],
-                seed=seed
+                seed=seed,
+                excel_copy=args.excel_copy,
+                workers=args.workers,
+                sampler=args.sampler
             )
         elif item_type == 'elbow':
             params = generation_params
             elbowDataGen.run(
-                output_file=sample_data_excel_path,
+                output_file=sample_data_path,
                 total_samples=num_samples,
                 diameter_inch_spec=params["diameter_inch_spec"],
                 angles_deg_list=params["angles_deg"],
-                seed=seed
+                seed=seed,
+                excel_copy=args.excel_copy,
+                workers=args.workers,
+                sampler=args.sampler
             )
         elif item_type == 'reducer':
             params = generation_params
             reducerDataGen.run(
-                 output_file=sample_data_excel_path,
-                 total_samples=num_samples,
-                 d1_inch_spec=params["d1_inch_spec"],
-                 d2_inch_spec=params["d2_inch_spec"],
-                 length_mm_spec=params["length_mm_spec"],
-                 seed=seed
+                output_file=sample_data_path,
+                total_samples=num_samples,
+                d1_inch_spec=params["d1_inch_spec"],
+                d2_inch_spec=params["d2_inch_spec"],
+                length_mm_spec=params["length_mm_spec"],
+                seed=seed,
+                excel_copy=args.excel_copy,
+                workers=args.workers,
+                sampler=args.sampler
             )
         elif item_type == 'expander':
             params = generation_params
             expanderDataGen.run(
-                output_file=sample_data_excel_path,
+                output_file=sample_data_path,
                 total_samples=num_samples,
                 d1_inch_spec=params["d1_inch_spec"],
                 d2_inch_spec=params["d2_inch_spec"],
                 length_mm_spec=params["length_mm_spec"],
-                seed=seed
+                seed=seed,
+                excel_copy=args.excel_copy,
+                workers=args.workers,
+                sampler=args.sampler
             )
-        print(f"샘플 데이터 생성 완료: {sample_data_excel_path}")
+        print(f"샘플 데이터 생성 완료: {sample_data_path}")
         print(f"--- 단계 1/{total_steps} 완료 ({(1/total_steps)*100:.0f}%) ---")
     except Exception as e:
         print(f"!!! 샘플 데이터 생성 실패. 파이프라인 중단: {e} !!!")
         sys.exit(1)
 
-    # --- 2. Gen_vster 실행 ---
-    print(f"\n[단계 2/{total_steps}] {item_type} VTSER 파일 생성 중...")
+def stage_generate_vtser(item_type, sample_data_path, vtser_output_dir, total_steps, chunk_size=VTSER_CHUNK_SIZE,
+                         result_cache=None):
+    """
+    2단계: genVtser 실행. item_type이 'mixed'이면 sample_data_path는 {아이템 타입: 샘플 테이블 경로} dict입니다.
+    result_cache(결과 캐시 연결)가 주어지면 캐시에 없는 형상만 VTSER 파일로 기록합니다 (모두 캐시에 있으면 파일 없음).
+    """
+    print(f"\n[단계 2/{total_steps}] {item_type} VTSER 파일 생성 중 (파일당 샘플 {chunk_size}개)...")
     try:
+        if result_cache is not None:
+            sample_paths = sample_data_path if item_type == 'mixed' else {item_type: sample_data_path}
+            resultCache.write_uncached_series(result_cache, sample_paths, vtser_output_dir, chunk_size)
+            print(f"VTSER 파일 생성 완료. 저장 위치: {vtser_output_dir}")
+            print(f"--- 단계 2/{total_steps} 완료 ({(2/total_steps)*100:.0f}%) ---")
+            return
         if item_type == 'pipe':
-            pipeGenerate.run(sample_data_excel_path, vtser_output_dir)
+            pipeGenerate.run(sample_data_path, vtser_output_dir, chunk_size=chunk_size)
         elif item_type == 'elbow':
-            elbowGenerate.run(sample_data_excel_path, vtser_output_dir)
+            elbowGenerate.run(sample_data_path, vtser_output_dir, chunk_size=chunk_size)
         elif item_type in ['reducer', 'expander']:
-            reducerGenerate.run(sample_data_excel_path, vtser_output_dir)
+            reducerGenerate.run(sample_data_path, vtser_output_dir, chunk_size=chunk_size)
+        elif item_type == 'mixed':
+            mixedGenerate.run(sample_data_path, vtser_output_dir, chunk_size=chunk_size)
         
         if not os.path.isdir(vtser_output_dir) or not os.listdir(vtser_output_dir):
              raise FileNotFoundError(f"VTSER 파일이 생성되지 않았습니다: {vtser_output_dir}")
@@ -284,15 +284,51 @@ def main():
         print(f"!!! VTSER 파일 생성 실패. 파이프라인 중단: {e} !!!")
         sys.exit(1)
 
-    # --- 3. auto_vac_module 실행 ---
-    # 출력 메시지와 함수 호출 부분 수정
-    print(f"\n[단계 3/{total_steps}] VacTran 자동화 실행 중 (동시 실행: {args.concurrency})...")
+def stage_calibrate_chunk_size(sample_data_paths, run_output_dir, args):
+    """
+    (선택) 2단계 전에 후보 chunk_size별 VacTran 처리량을 실측하여 args.chunk_size를 가장 빠른 크기로 바꿉니다.
+    sample_data_paths: {아이템 타입: 1단계 샘플 테이블 경로}
+    """
+    print(f"\n[chunk_size 보정] 후보 {args.calibration_sizes} (동시 실행: {args.concurrency})")
     try:
-        if not AUTO_VAC_MODULE_AVAILABLE:
-            raise ImportError("VacTran automation (step 3) skipped: 'autoVacModule' could not be loaded, likely due to a missing 'clipboard' dependency. Check startup warnings.")
-        
-        # concurrency 인자를 전달하도록 함수 호출 수정
-        run_vactran_automation(vtser_output_dir, txt_output_dir, concurrency=args.concurrency)
+        tables = {item_type: read_sample_table(path) for item_type, path in sample_data_paths.items()}
+        args.chunk_size, _ = chunkCalibration.calibrate_chunk_size(
+            tables, os.path.join(run_output_dir, "00_chunk_calibration"),
+            functools.partial(run_vactran_automation, **vactran_options(args)),
+            chunkCalibration.parse_sizes(args.calibration_sizes), args.concurrency)
+    except Exception as e:
+        print(f"!!! chunk_size 보정 실패. 파이프라인 중단: {e} !!!")
+        sys.exit(1)
+
+def stage_run_vactran(vtser_output_dir, txt_output_dir, concurrency, total_steps, chunk_store_dir=None, vactran_options=None):
+    """
+    3단계: autoVacModule 실행.
+    chunk_store_dir가 주어지면 청크 내용 해시로 저장소를 조회하여 이미 시뮬레이션한 청크는 결과를 복사해 오고,
+    나머지 청크만 실행한 뒤 그 결과를 저장소에 추가합니다.
+    vactran_options: run_vactran_automation에 넘길 스케줄러/드라이버 옵션 (mode, warm_pool, recycle_after, driver, driver_options,
+                     resume, file_deadline, max_retries, adaptive, min_concurrency, max_failure_rate, queue_dir, lease_seconds)
+    """
+    vactran_options = vactran_options or {}
+    print(f"\n[단계 3/{total_steps}] VacTran 자동화 실행 중 (동시 실행: {concurrency}, 스케줄러: {vactran_options.get('mode', 'queue')})...")
+    if not any(f.lower().endswith('.vtser') for f in os.listdir(vtser_output_dir)):
+        print("실행할 VTSER 파일이 없습니다 (모든 형상이 결과 캐시에 있거나 이 샤드에 배정된 파일이 없음).")
+        print(f"--- 단계 3/{total_steps} 완료 ({(3/total_steps)*100:.0f}%) ---")
+        return
+    try:
+        pending_files = None
+        if chunk_store_dir:
+            cached, pending = chunkStore.partition_chunks(vtser_output_dir, chunk_store_dir)
+            chunkStore.restore_cached(cached, vtser_output_dir, txt_output_dir, chunk_store_dir)
+            pending_files = [fname for fname, _ in pending]
+            print(f"청크 저장소 '{chunk_store_dir}': {len(cached)}개 청크 결과 재사용, {len(pending)}개 청크 새로 실행")
+
+        if pending_files != []:
+            run_vactran_automation(vtser_output_dir, txt_output_dir, concurrency=concurrency, files=pending_files,
+                                   **vactran_options)
+
+        if chunk_store_dir and pending:
+            stored = chunkStore.store_results(pending, vtser_output_dir, txt_output_dir, chunk_store_dir)
+            print(f"청크 저장소에 {stored}개 청크 결과 추가")
         
         print(f"VacTran 자동화 완료. TXT 파일 저장 위치: {txt_output_dir}")
         print(f"--- 단계 3/{total_steps} 완료 ({(3/total_steps)*100:.0f}%) ---")
@@ -305,27 +341,84 @@ def main():
         print("파이프라인 중단.")
         sys.exit(1)
 
-    # --- 4. dataPreprosessor 실행 ---
-    print(f"\n[단계 4/{total_steps}] {item_type} 데이터 전처리 중...")
-    final_csv_filename = f"{item_type}_preprocessed_n{num_samples}_s{seed}.csv"
-    final_csv_path = os.path.join(csv_output_dir, final_csv_filename)
+def chunk_store_dir(args):
+    """청크 저장소 경로 (--no_chunk_store이면 None, fake 드라이버는 경로를 직접 지정했을 때만 사용)"""
+    if args.no_chunk_store or (args.vactran_driver == "fake" and not args.chunk_store):
+        return None
+    return args.chunk_store or os.path.join(args.base_output_dir, "chunk_store")
+
+def vactran_options(args):
+    """3단계 스케줄러/드라이버 옵션 (run_vactran_automation 키워드 인자)"""
+    driver_options = None
+    if args.vactran_driver_config:
+        with open(args.vactran_driver_config, 'r', encoding='utf-8') as f:
+            driver_options = json.load(f)
+    return {"mode": args.vactran_mode, "warm_pool": args.warm_pool, "recycle_after": args.recycle_after,
+            "driver": args.vactran_driver, "driver_options": driver_options, "resume": args.resume is not None,
+            "file_deadline": args.vactran_file_deadline, "max_retries": args.vactran_max_retries,
+            "adaptive": args.adaptive_concurrency, "min_concurrency": args.min_concurrency, "max_failure_rate": args.max_failure_rate,
+            "queue_dir": args.vactran_queue_dir, "lease_seconds": args.vactran_lease_seconds}
+
+def run_output_dir(args, run_dir_name):
+    """실행 디렉터리: --resume이면 그 디렉터리, 아니면 <base_output_dir>/<run_dir_name>"""
+    if args.resume:
+        print(f"재개: 기존 실행 디렉터리 '{args.resume}'를 사용합니다 (1~2단계는 같은 입력으로 다시 생성, 3단계는 완료 기록이 있는 파일을 건너뜀).")
+        return args.resume
+    return os.path.join(args.base_output_dir, run_dir_name)
+
+def open_result_cache(args):
+    """형상 단위 결과 캐시 연결 (--no_result_cache이면 None, fake 드라이버는 경로를 직접 지정했을 때만 사용)"""
+    if args.no_result_cache or (args.vactran_driver == "fake" and not args.result_cache):
+        return None
+    if args.shard is not None:
+        print("결과 캐시: --shard 실행에서는 사용하지 않음 (기계마다 캐시가 다르면 샤드별 VTSER 파일 구성이 달라짐)")
+        return None
+    path = args.result_cache or os.path.join(args.base_output_dir, "result_cache.sqlite")
+    print(f"결과 캐시: {path}")
+    return resultCache.open_cache(path)
 
+def shard_arg(text):
+    """--shard argparse type ('i/N' -> (i, N))"""
     try:
-        if item_type == 'pipe':
+        return shardPlan.parse_shard(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def shard_tag(args):
+    """실행 디렉터리 이름에 붙일 샤드 표시 (샤드 실행이 아니면 빈 문자열)"""
+    return f"_shard{args.shard[0]}of{args.shard[1]}" if args.shard else ""
+
+def stage_select_shard(args, run_output_dir, vtser_output_dir):
+    """2단계 후 (--shard i/N): 이 샤드에 속하지 않는 VTSER 파일을 지우고 병합에 필요한 shard.json을 남깁니다."""
+    all_files, mine = shardPlan.select_shard(vtser_output_dir, args.shard)
+    run_args = {"item_type": args.item_type, "num_samples": args.num_samples, "seed": args.seed,
+                "sampler": args.sampler, "chunk_size": args.chunk_size}
+    shardPlan.write_shard_info(run_output_dir, run_args, args.shard, all_files, mine)
+    print(f"샤드 {args.shard[0]}/{args.shard[1]}: VTSER 파일 {len(all_files)}개 중 {len(mine)}개를 이 기계에서 실행합니다.")
+
+def print_shard_merge_hint(run_output_dir, total_steps):
+    print(f"\n[단계 4/{total_steps}] 샤드 실행이므로 전처리를 건너뜁니다. 모든 샤드가 끝나면 한 기계에서 병합하세요:")
+    print(f"  python mainPipeline.py merge <샤드 1 실행 디렉터리> ... <샤드 N 실행 디렉터리>  (이 샤드: {run_output_dir})")
+
+def stage_preprocess(item_type, txt_output_dir, final_csv_path, total_steps, specs_header_content=None,
+                     result_cache=None, vtser_output_dir=None):
+    """
+    4단계: dataPreprosessor 실행. specs_header_content가 주어지면 CSV 상단에 스펙 주석을 추가합니다.
+    result_cache가 주어지면 새 결과를 캐시에 추가하고 캐시 결과와 합쳐 최종 CSV를 만듭니다 (2단계 계획 파일은 vtser_output_dir).
+    """
+    print(f"\n[단계 4/{total_steps}] {item_type} 데이터 전처리 중...")
+    try:
+        if result_cache is not None:
+            resultCache.assemble_results(result_cache, txt_output_dir, vtser_output_dir, {item_type: final_csv_path})
+        elif item_type == 'pipe':
             pipePrepro.run(txt_output_dir, final_csv_path)
         elif item_type == 'elbow':
             elbowPrepro.run(txt_output_dir, final_csv_path)
         elif item_type in ['reducer', 'expander']:
             reducerPrepro.run(txt_output_dir, final_csv_path)
 
-        # CSV 파일에 스펙 주석 추가
-        if os.path.exists(final_csv_path) and os.path.getsize(final_csv_path) > 0:
-            df_temp = pd.read_csv(final_csv_path)
-            specs_header_content = generate_csv_header_specs(item_type, num_samples, seed, generation_params)
-            with open(final_csv_path, 'w', encoding='utf-8', newline='') as f:
-                f.write(specs_header_content)
-                df_temp.to_csv(f, index=False, lineterminator='\n')
-            print(f"CSV 파일에 스펙 주석 추가 완료: {final_csv_path}")
+        if specs_header_content is not None:
+            add_csv_header_specs(final_csv_path, specs_header_content)
         
         print(f"데이터 전처리 완료: {final_csv_path}")
         print(f"--- 단계 4/{total_steps} 완료 ({(4/total_steps)*100:.0f}%) ---")
@@ -333,6 +426,384 @@ def main():
         print(f"!!! 데이터 전처리 실패. 파이프라인 중단: {e} !!!")
         sys.exit(1)
 
+def stage_preprocess_mixed(txt_output_dir, vtser_output_dir, final_csv_paths, total_steps, specs_headers, result_cache=None):
+    """4단계 (혼합 시리즈): 슬롯 매니페스트에 따라 결과를 아이템 타입별 CSV로 나누고 타입별 스펙 주석을 추가합니다."""
+    print(f"\n[단계 4/{total_steps}] 혼합 시리즈 결과 전처리 중 ({', '.join(final_csv_paths)})...")
+    try:
+        if result_cache is not None:
+            resultCache.assemble_results(result_cache, txt_output_dir, vtser_output_dir, final_csv_paths)
+        else:
+            seriesRouter.run(txt_output_dir, os.path.join(vtser_output_dir, MIXED_MANIFEST_NAME), final_csv_paths)
+        for item_type, final_csv_path in final_csv_paths.items():
+            add_csv_header_specs(final_csv_path, specs_headers[item_type])
+        print(f"데이터 전처리 완료: {', '.join(final_csv_paths.values())}")
+        print(f"--- 단계 4/{total_steps} 완료 ({(4/total_steps)*100:.0f}%) ---")
+    except Exception as e:
+        print(f"!!! 데이터 전처리 실패. 파이프라인 중단: {e} !!!")
+        sys.exit(1)
+
+def add_csv_header_specs(final_csv_path, specs_header_content):
+    """CSV 파일에 스펙 주석 추가"""
+    if os.path.exists(final_csv_path) and os.path.getsize(final_csv_path) > 0:
+        df_temp = pd.read_csv(final_csv_path)
+        with open(final_csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(specs_header_content)
+            df_temp.to_csv(f, index=False, lineterminator='\n')
+        print(f"CSV 파일에 스펙 주석 추가 완료: {final_csv_path}")
+
+def merge_round_csvs(round_csv_paths, output_csv_path):
+    """라운드별 4단계 CSV를 합치고 SampleID를 라운드 순서대로 이어지게 다시 부여합니다."""
+    frames = []
+    id_offset = 0
+    for path in round_csv_paths:
+        df = pd.read_csv(path, comment="#")
+        if df.empty:
+            continue
+        df["SampleID"] = df["SampleID"] + id_offset
+        id_offset = int(df["SampleID"].max())
+        frames.append(df)
+    merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    merged.to_csv(output_csv_path, index=False, encoding='utf-8-sig')
+    return merged
+
+def run_active_learning(item_type, generation_params, args, current_run_output_dir, seed_csv_path, total_steps,
+                        result_cache=None):
+    """
+    능동 학습 루프: 초기(seed) 배치의 4단계 CSV로 대리 모델을 학습하고, 후보 풀에서 앙상블 불일치도가 가장 큰
+    형상을 다음 배치로 골라 2~4단계를 반복합니다. 목표 상대 오차(--al_target_error)에 도달하거나,
+    시뮬레이션 예산(--al_budget) 또는 최대 라운드 수(--al_max_rounds)를 모두 사용하면 종료합니다.
+
+    :return: 라운드별 4단계 CSV 경로 리스트 (초기 배치 포함)
+    """
+    round_csv_paths = [seed_csv_path]
+    simulated = args.num_samples
+    log_rows = []
+    log_path = os.path.join(current_run_output_dir, "active_learning_log.csv")
+
+    for round_idx in range(1, args.al_max_rounds + 1):
+        rows = activeLearning.load_training_rows(round_csv_paths, item_type)
+        if rows.empty:
+            print("!!! 능동 학습 중단: 학습 가능한 전처리 결과가 없습니다. !!!")
+            break
+        surrogate = activeLearning.fit_surrogate(rows, item_type, seed=args.seed + round_idx)
+        print(f"\n=== 능동 학습 라운드 {round_idx}: 학습 샘플 {surrogate['n_samples']}개, "
+              f"OOB 상대 오차 {surrogate['oob_rel_error']:.4%} (목표 {args.al_target_error:.4%}) ===")
+        log_rows.append({"round": round_idx - 1, "simulated_samples": simulated,
+                         "trained_samples": surrogate["n_samples"], "oob_rel_error": surrogate["oob_rel_error"]})
+
+        if surrogate["oob_rel_error"] <= args.al_target_error:
+            print("목표 정확도에 도달하여 능동 학습을 종료합니다.")
+            break
+        batch_size = min(args.al_batch_size, args.al_budget - simulated)
+        if batch_size <= 0:
+            print(f"시뮬레이션 예산({args.al_budget}개)을 모두 사용하여 능동 학습을 종료합니다.")
+            break
+
+        candidates = generate_samples(item_type, generation_params, args.al_candidates, seed=args.seed + round_idx,
+                                      workers=args.workers, sampler=args.sampler)
+        selected, scores = activeLearning.select_next_batch(surrogate, candidates, batch_size)
+        print(f"후보 {len(candidates)}개 중 {len(selected)}개 선택 (불일치도 {selected['disagreement'].min():.4g}~"
+              f"{selected['disagreement'].max():.4g}, 후보 평균 {scores.mean():.4g})")
+        log_rows[-1]["next_batch"] = len(selected)
+        log_rows[-1]["mean_selected_disagreement"] = float(selected["disagreement"].mean())
+        log_rows[-1]["mean_candidate_disagreement"] = float(scores.mean())
+
+        round_dirs = create_stage_dirs(os.path.join(current_run_output_dir, f"al_round_{round_idx:02d}"))
+        selected = selected.drop(columns=["disagreement"])
+        selected["SampleID"] = np.arange(1, len(selected) + 1)
+        sample_data_path = os.path.join(round_dirs["sample"], f"{item_type}_al_round{round_idx:02d}_n{len(selected)}{SAMPLE_FORMATS[args.sample_format]}")
+        save_samples(selected, sample_data_path, excel_copy=args.excel_copy)
+        print(f"선택된 샘플 저장: {sample_data_path}")
+
+        round_csv_path = os.path.join(round_dirs["csv"], f"{item_type}_al_round{round_idx:02d}_preprocessed.csv")
+        stage_generate_vtser(item_type, sample_data_path, round_dirs["vtser"], total_steps, args.chunk_size, result_cache)
+        stage_run_vactran(round_dirs["vtser"], round_dirs["txt"], args.concurrency, total_steps, chunk_store_dir(args),
+                          vactran_options(args))
+        stage_preprocess(item_type, round_dirs["txt"], round_csv_path, total_steps,
+                         result_cache=result_cache, vtser_output_dir=round_dirs["vtser"])
+        round_csv_paths.append(round_csv_path)
+        simulated += len(selected)
+    else:
+        rows = activeLearning.load_training_rows(round_csv_paths, item_type)
+        if not rows.empty:
+            surrogate = activeLearning.fit_surrogate(rows, item_type, seed=args.seed)
+            print(f"\n최대 라운드({args.al_max_rounds}) 종료: 최종 OOB 상대 오차 {surrogate['oob_rel_error']:.4%}")
+            log_rows.append({"round": args.al_max_rounds, "simulated_samples": simulated,
+                             "trained_samples": surrogate["n_samples"], "oob_rel_error": surrogate["oob_rel_error"]})
+
+    pd.DataFrame(log_rows).to_csv(log_path, index=False)
+    print(f"능동 학습 로그 저장: {log_path}")
+    return round_csv_paths
+
+def run_mixed_campaign(args, total_steps, result_cache=None):
+    """
+    네 가지 아이템 타입의 샘플을 각각 num_samples개 생성한 뒤 혼합 시리즈 파일(PIPE/ELBOW/CONE)로 묶어
+    VacTran을 한 번의 실행 과정으로 돌리고, 결과를 슬롯 매니페스트에 따라 타입별 CSV로 나눕니다.
+
+    :return: (실행 디렉터리, {아이템 타입: 최종 CSV 경로})
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    current_run_output_dir = run_output_dir(args, f"mixed_n{args.num_samples}_s{args.seed}{shard_tag(args)}_{timestamp}")
+    dirs = create_stage_dirs(current_run_output_dir)
+    print(f"--- 파이프라인 시작: mixed ({', '.join(ITEM_TYPES)}), 타입별 샘플 수: {args.num_samples}, 시드: {args.seed} ---")
+    print(f"모든 산출물은 다음 디렉터리에 저장됩니다: {current_run_output_dir}")
+
+    sample_data_paths, final_csv_paths, specs_headers = {}, {}, {}
+    for item_type in ITEM_TYPES:
+        generation_params = get_generation_parameters(item_type)
+        generation_params["sampler"] = args.sampler
+        sample_data_paths[item_type] = os.path.join(
+            dirs["sample"], f"{item_type}_samples_n{args.num_samples}_s{args.seed}{SAMPLE_FORMATS[args.sample_format]}")
+        final_csv_paths[item_type] = os.path.join(dirs["csv"], f"{item_type}_preprocessed_n{args.num_samples}_s{args.seed}.csv")
+        specs_headers[item_type] = generate_csv_header_specs(item_type, args.num_samples, args.seed, generation_params)
+        stage_generate_samples(item_type, generation_params, args.num_samples, args.seed,
+                               sample_data_paths[item_type], args, total_steps)
+
+    if args.calibrate_chunk_size:
+        stage_calibrate_chunk_size(sample_data_paths, current_run_output_dir, args)
+    stage_generate_vtser("mixed", sample_data_paths, dirs["vtser"], total_steps, args.chunk_size, result_cache)
+    if args.shard:
+        stage_select_shard(args, current_run_output_dir, dirs["vtser"])
+    stage_run_vactran(dirs["vtser"], dirs["txt"], args.concurrency, total_steps, chunk_store_dir(args),
+                      vactran_options(args))
+    if args.shard:
+        print_shard_merge_hint(current_run_output_dir, total_steps)
+        return current_run_output_dir, {}
+    stage_preprocess_mixed(dirs["txt"], dirs["vtser"], final_csv_paths, total_steps, specs_headers, result_cache)
+    return current_run_output_dir, final_csv_paths
+
+def run_merge(argv):
+    """
+    python mainPipeline.py merge <샤드 실행 디렉터리>... : --shard 실행 N개의 3단계 결과를 모아 4단계를 실행합니다.
+    결과 파일 이름과 내용이 샤드와 무관하므로 최종 CSV는 샤드 없이 한 기계에서 실행한 것과 같은 SampleID 순서를 갖습니다.
+    완료되지 않은 파일이 있으면 (--allow_missing이 아니면) 그 샤드의 --resume 명령을 출력하고 병합하지 않습니다.
+    """
+    parser = argparse.ArgumentParser(prog="mainPipeline.py merge", description="--shard i/N 실행 결과 병합 후 4단계 전처리")
+    parser.add_argument("shard_dirs", nargs="+", help="샤드 1..N의 실행 디렉터리 (순서 무관)")
+    parser.add_argument("--output_dir", default=None,
+                        help="병합 실행 디렉터리 (기본값: 샤드 1 디렉터리 옆 <item_type>_n<N>_s<seed>_merged<샤드 수>_<timestamp>)")
+    parser.add_argument("--allow_missing", action="store_true",
+                        help="완료되지 않은 VTSER 파일이 있어도 빼고 병합 (단일 타입은 빠진 파일 뒤의 SampleID가 당겨져 "
+                             "샤드 없는 실행/01_sample_data와 달라짐)")
+    args = parser.parse_args(argv)
+    try:
+        infos = shardPlan.load_shards(args.shard_dirs)
+    except ValueError as e:
+        parser.error(str(e))
+
+    pipeline_start_time = time.time()
+    total_steps = 4
+    first = infos[0]
+    item_type, num_samples, seed = first["item_type"], first["num_samples"], first["seed"]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    merged_run_dir = args.output_dir or os.path.join(
+        os.path.dirname(os.path.abspath(first["run_dir"])), f"{item_type}_n{num_samples}_s{seed}_merged{first['shards']}_{timestamp}")
+    # 단일 타입 4단계는 결과 파일 순서로 SampleID를 매기므로 빠진 파일이 있으면 이후 SampleID가 모두 달라짐
+    missing = shardPlan.missing_results(infos)
+    n_missing = sum(len(fnames) for fnames in missing.values())
+    if missing:
+        print(f"{'경고' if args.allow_missing else '!!! 병합 중단'}: 완료되지 않은 VTSER 파일 {n_missing}개")
+        for info in infos:
+            if info["shard"] in missing:
+                print(f"  샤드 {info['shard']}/{info['shards']}: {', '.join(missing[info['shard']])}")
+                print(f"    다시 실행 (3단계 드라이버/동시 실행 옵션은 처음과 같게): {shardPlan.resume_command(info)}")
+        if not args.allow_missing:
+            print("모든 샤드를 완료한 뒤 다시 병합하세요 (빼고 병합하려면 --allow_missing, 단일 타입은 이후 SampleID가 달라짐).")
+            sys.exit(1)
+
+    dirs = create_stage_dirs(merged_run_dir)
+    print(f"--- 샤드 병합: {item_type}, 샘플 수: {num_samples}, 시드: {seed}, 샤드 {first['shards']}개 ---")
+    print(f"병합 산출물은 다음 디렉터리에 저장됩니다: {merged_run_dir}")
+
+    # 1단계 샘플 테이블과 혼합 시리즈 슬롯 매니페스트는 모든 샤드가 같으므로 샤드 1에서 복사
+    shard_sample_dir = os.path.join(first["run_dir"], "01_sample_data")
+    for fname in sorted(os.listdir(shard_sample_dir)):
+        if os.path.isfile(os.path.join(shard_sample_dir, fname)):
+            chunkStore.copy_atomic(os.path.join(shard_sample_dir, fname), os.path.join(dirs["sample"], fname))
+    if item_type == "mixed":
+        chunkStore.copy_atomic(os.path.join(first["run_dir"], "02_vtser_files", MIXED_MANIFEST_NAME),
+                               os.path.join(dirs["vtser"], MIXED_MANIFEST_NAME))
+
+    shardPlan.collect_results(infos, dirs["txt"], missing)
+    print(f"샤드 결과 병합: VTSER 파일 {len(first['files'])}개 중 {len(first['files']) - n_missing}개 결과 수집")
+
+    final_csv_paths, specs_headers = {}, {}
+    for csv_item_type in (ITEM_TYPES if item_type == "mixed" else [item_type]):
+        generation_params = get_generation_parameters(csv_item_type)
+        generation_params["sampler"] = first["sampler"]
+        final_csv_paths[csv_item_type] = os.path.join(dirs["csv"], f"{csv_item_type}_preprocessed_n{num_samples}_s{seed}.csv")
+        specs_headers[csv_item_type] = generate_csv_header_specs(csv_item_type, num_samples, seed, generation_params)
+    if item_type == "mixed":
+        stage_preprocess_mixed(dirs["txt"], dirs["vtser"], final_csv_paths, total_steps, specs_headers)
+    else:
+        stage_preprocess(item_type, dirs["txt"], final_csv_paths[item_type], total_steps, specs_headers[item_type])
+
+    print(f"\n--- 샤드 병합 완료 ---")
+    for csv_item_type, final_csv_path in final_csv_paths.items():
+        print(f"최종 결과물 ({csv_item_type}): {final_csv_path}")
+    print(f"총 소요 시간: {time.time() - pipeline_start_time:.2f}초")
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "merge":
+        return run_merge(sys.argv[2:])
+    parser = argparse.ArgumentParser(description="데이터 생성 및 처리 파이프라인 (샤드 병합: python mainPipeline.py merge <샤드 실행 디렉터리>...)")
+    parser.add_argument("item_type", choices=ITEM_TYPES + ["mixed"],
+                        help="처리할 항목 타입 (mixed: 네 타입을 혼합 시리즈 파일로 묶어 VacTran을 한 번에 실행)")
+    parser.add_argument("num_samples", type=int, help="생성할 샘플 데이터 수량 (능동 학습 모드에서는 초기 배치 크기)")
+    parser.add_argument("--seed", "-s",type=int, default=42, help="데이터 생성 시 사용할 난수 시드 (기본값: 42)")
+    parser.add_argument("--base_output_dir", default=os.path.join(PROJECT_ROOT, "pipeline_output_data"), help="최상위 출력 디렉터리")
+    # 아래 라인 추가: 동시 실행 개수(n)를 지정하는 옵션
+    parser.add_argument("--concurrency","-c" ,type=int, default=4, help="VacTran 동시 실행 프로세스 수 (기본값: 4)")
+    parser.add_argument("--vactran_mode", choices=["queue", "batch"], default="queue",
+                        help="3단계 스케줄러: queue(슬롯이 비는 즉시 다음 파일 시작, 기본값) 또는 batch(concurrency개씩 묶어 실행하는 기존 방식)")
+    parser.add_argument("--warm_pool", action="store_true",
+                        help="3단계 queue 모드에서 슬롯마다 VacTran 인스턴스를 유지하고 파일 열기로 다음 VTSER 파일을 불러옴 (프로세스 재시작 비용 절감)")
+    parser.add_argument("--recycle_after", type=int, default=20,
+                        help="웜 인스턴스 하나로 처리할 최대 VTSER 파일 수. 넘거나 오류가 나면 새로 시작 (기본값: 20)")
+    parser.add_argument("--vactran_driver", choices=["pywinauto", "fake"], default="pywinauto",
+                        help="3단계 VacTran 조작 드라이버: pywinauto(실제 VacTran, 기본값) 또는 fake(VacTran 없이 가짜 결과, Linux 테스트/처리량 측정용)")
+    parser.add_argument("--vactran_driver_config", default=None,
+                        help="드라이버 설정 JSON 파일 (fake: 지연/실패 확률 PROFILE 키, pywinauto: vactran_path)")
+    parser.add_argument("--adaptive_concurrency", action="store_true",
+                        help="3단계 queue 모드에서 --min_concurrency개 슬롯으로 시작해 구간별 files/min과 실패율로 동시 실행 수를 "
+                             "--concurrency(상한) 안에서 자동 조절 (AIMD)")
+    parser.add_argument("--min_concurrency", type=int, default=1, help="--adaptive_concurrency의 시작/최소 동시 실행 수 (기본값: 1)")
+    parser.add_argument("--max_failure_rate", type=float, default=0.1,
+                        help="--adaptive_concurrency에서 동시 실행 수를 절반으로 줄이는 구간 실패율 (기본값: 0.1)")
+    parser.add_argument("--vactran_file_deadline", type=float, default=120,
+                        help="VTSER 파일 하나의 최대 처리 시간(초, 포커스 대기 제외). 넘으면 watchdog이 VacTran 인스턴스를 강제 종료하고 재시도 (0이면 끔, 기본값: 120)")
+    parser.add_argument("--vactran_max_retries", type=int, default=2,
+                        help="실패한 VTSER 파일(watchdog 종료 포함)을 다시 처리하는 최대 횟수 (기본값: 2)")
+    parser.add_argument("--vactran_queue_dir", default=None,
+                        help="3단계를 이 기계에서 실행하지 않고 공유 큐 디렉터리에 VTSER 파일을 올려 다른 기계의 worker "
+                             "(python distributedQueue.py worker <queue_dir>)가 처리하게 함 (코디네이터 모드)")
+    parser.add_argument("--vactran_lease_seconds", type=float, default=60,
+                        help="--vactran_queue_dir에서 worker heartbeat가 이 시간 동안 없으면 임대한 파일을 다시 큐에 넣음 (기본값: 60)")
+    parser.add_argument("--sample_format", choices=[fmt for fmt in SAMPLE_FORMATS if fmt != "csv"], default="npz",
+                        help="1단계->2단계 샘플 테이블 형식 (기본값: npz, parquet/feather는 pyarrow 필요)")
+    parser.add_argument("--excel_copy", action="store_true", help="샘플 테이블과 별도로 사람이 읽을 수 있는 .xlsx 사본도 저장")
+    parser.add_argument("--workers", type=int, default=1, help="1단계 샘플 생성 병렬 프로세스 수 (결과는 워커 수와 무관하게 동일, 기본값: 1)")
+    parser.add_argument("--sampler", choices=SAMPLERS, default="uniform", help="1단계 구간 내 추출 방식: uniform, sobol, lhs (sobol/lhs는 scipy 필요, 기본값: uniform)")
+    parser.add_argument("--chunk_size", type=int, default=VTSER_CHUNK_SIZE,
+                        help=f"VTSER 파일 하나(VacTran 실행 1회)에 담을 샘플 수 (기본값: {VTSER_CHUNK_SIZE})")
+    parser.add_argument("--calibrate_chunk_size", action="store_true",
+                        help="2단계 전에 --calibration_sizes 후보별 VacTran 처리량(컴포넌트/시간)을 실측하여 가장 빠른 chunk_size 사용")
+    parser.add_argument("--calibration_sizes", default=",".join(map(str, chunkCalibration.DEFAULT_CALIBRATION_SIZES)),
+                        help="chunk_size 보정 후보 목록 (기본값: 25,50,100,200)")
+    parser.add_argument("--chunk_store", default=None,
+                        help="VTSER 청크 내용 해시 -> VacTran 결과 저장소 경로 (기본값: <base_output_dir>/chunk_store). 이미 시뮬레이션한 청크는 다시 실행하지 않음")
+    parser.add_argument("--no_chunk_store", action="store_true", help="청크 저장소를 사용하지 않고 모든 청크를 실행")
+    parser.add_argument("--result_cache", default=None,
+                        help="(컴포넌트, 형상) -> 전처리 결과 SQLite 캐시 경로 (기본값: <base_output_dir>/result_cache.sqlite). 캐시에 있는 형상은 VTSER에 기록하지 않음")
+    parser.add_argument("--no_result_cache", action="store_true", help="결과 캐시를 사용하지 않고 모든 샘플을 시뮬레이션")
+    parser.add_argument("--resume", default=None, metavar="RUN_DIR",
+                        help="중단된 실행 디렉터리를 이어서 실행. 같은 item_type/num_samples/seed/chunk_size로 1~2단계를 다시 만들고, "
+                             "3단계는 03_vactran_txt_output의 완료 기록(vactran_manifest.jsonl)에서 입력/출력 체크섬이 일치하는 파일을 건너뜀")
+    parser.add_argument("--shard", type=shard_arg, default=None, metavar="i/N",
+                        help="여러 기계에 실행 하나를 정적으로 나눔: 1~2단계는 전체를 만들고 정렬된 VTSER 파일 중 k %% N == i-1번째만 "
+                             "3단계 실행, 4단계는 건너뜀 (모든 샤드가 끝나면 python mainPipeline.py merge <샤드 디렉터리>...)")
+    # 능동 학습(active learning) 옵션
+    parser.add_argument("--active_learning", action="store_true", help="초기 배치 후 대리 모델 불일치도가 큰 형상을 반복 선택하는 능동 학습 모드")
+    parser.add_argument("--al_batch_size", type=int, default=50, help="능동 학습 라운드당 시뮬레이션할 샘플 수 (기본값: 50)")
+    parser.add_argument("--al_max_rounds", type=int, default=10, help="능동 학습 최대 라운드 수 (기본값: 10)")
+    parser.add_argument("--al_budget", type=int, default=1000, help="초기 배치를 포함한 최대 시뮬레이션 샘플 수 (기본값: 1000)")
+    parser.add_argument("--al_target_error", type=float, default=0.02, help="목표 OOB 상대 오차 (기본값: 0.02 = 2%%)")
+    parser.add_argument("--al_candidates", type=int, default=5000, help="라운드마다 평가할 후보 형상 수 (기본값: 5000)")
+    args = parser.parse_args()
+    if args.chunk_size < 1:
+        parser.error("--chunk_size는 1 이상이어야 합니다.")
+    if args.warm_pool and args.vactran_mode != "queue":
+        parser.error("--warm_pool은 --vactran_mode queue에서만 사용할 수 있습니다.")
+    if args.recycle_after < 1:
+        parser.error("--recycle_after는 1 이상이어야 합니다.")
+    if args.adaptive_concurrency and args.vactran_mode != "queue":
+        parser.error("--adaptive_concurrency는 --vactran_mode queue에서만 사용할 수 있습니다.")
+    if args.min_concurrency < 1:
+        parser.error("--min_concurrency는 1 이상이어야 합니다.")
+    if args.vactran_file_deadline < 0 or args.vactran_max_retries < 0:
+        parser.error("--vactran_file_deadline/--vactran_max_retries는 0 이상이어야 합니다.")
+    if args.vactran_lease_seconds <= 0:
+        parser.error("--vactran_lease_seconds는 0보다 커야 합니다.")
+    if args.calibrate_chunk_size:
+        try:
+            chunkCalibration.parse_sizes(args.calibration_sizes)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.item_type == "mixed" and args.active_learning:
+        parser.error("--active_learning은 단일 아이템 타입에서만 사용할 수 있습니다.")
+    if args.shard and (args.active_learning or args.calibrate_chunk_size):
+        parser.error("--shard는 --active_learning/--calibrate_chunk_size와 함께 사용할 수 없습니다 (모든 샤드가 같은 --chunk_size를 지정).")
+    if args.resume:
+        if not os.path.isdir(args.resume):
+            parser.error(f"--resume 디렉터리가 없습니다: {args.resume}")
+        if args.active_learning or args.calibrate_chunk_size:
+            parser.error("--resume은 --active_learning/--calibrate_chunk_size와 함께 사용할 수 없습니다 (보정된 값은 --chunk_size로 지정).")
+
+    item_type = args.item_type
+    num_samples = args.num_samples
+    seed = args.seed
+    
+    pipeline_start_time = time.time()
+    total_steps = 4
+    result_cache = open_result_cache(args)
+
+    if item_type == "mixed":
+        current_run_output_dir, final_csv_paths = run_mixed_campaign(args, total_steps, result_cache)
+        print(f"\n--- 샤드 {args.shard[0]}/{args.shard[1]} 완료 ---" if args.shard else f"\n--- 모든 프로세스 성공적으로 완료 ---")
+        for csv_item_type, final_csv_path in final_csv_paths.items():
+            print(f"최종 결과물 ({csv_item_type}): {final_csv_path}")
+        print(f"모든 산출물 및 최종 결과는 다음 디렉터리에 있습니다: {current_run_output_dir}")
+        print(f"총 소요 시간: {time.time() - pipeline_start_time:.2f}초")
+        return
+
+    generation_params = get_generation_parameters(item_type)
+    generation_params["sampler"] = args.sampler
+
+    # --- 고유한 작업 디렉터리 생성 ---
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    specs_tag_for_filename = format_specs_for_filename(item_type, generation_params)
+    mode_tag = "_al" if args.active_learning else ""
+    run_dir_name = f"{item_type}_{specs_tag_for_filename}_n{num_samples}_s{seed}{mode_tag}{shard_tag(args)}_{timestamp}"
+    current_run_output_dir = run_output_dir(args, run_dir_name)
+    dirs = create_stage_dirs(current_run_output_dir)
+
+    print(f"--- 파이프라인 시작: {item_type}, 샘플 수: {num_samples}, 시드: {seed} ---")
+    print(f"모든 산출물은 다음 디렉터리에 저장됩니다: {current_run_output_dir}")
+
+    sample_data_filename = f"{item_type}_samples_n{num_samples}_s{seed}{SAMPLE_FORMATS[args.sample_format]}"
+    sample_data_path = os.path.join(dirs["sample"], sample_data_filename)
+    final_csv_filename = f"{item_type}_preprocessed_n{num_samples}_s{seed}.csv"
+    final_csv_path = os.path.join(dirs["csv"], final_csv_filename)
+    specs_header_content = generate_csv_header_specs(item_type, num_samples, seed, generation_params)
+
+    stage_generate_samples(item_type, generation_params, num_samples, seed, sample_data_path, args, total_steps)
+    if args.calibrate_chunk_size:
+        stage_calibrate_chunk_size({item_type: sample_data_path}, current_run_output_dir, args)
+    stage_generate_vtser(item_type, sample_data_path, dirs["vtser"], total_steps, args.chunk_size, result_cache)
+    if args.shard:
+        stage_select_shard(args, current_run_output_dir, dirs["vtser"])
+    stage_run_vactran(dirs["vtser"], dirs["txt"], args.concurrency, total_steps, chunk_store_dir(args),
+                      vactran_options(args))
+
+    if args.shard:
+        print_shard_merge_hint(current_run_output_dir, total_steps)
+        print(f"\n--- 샤드 {args.shard[0]}/{args.shard[1]} 완료 ---")
+        print(f"총 소요 시간: {time.time() - pipeline_start_time:.2f}초")
+        return
+    if not args.active_learning:
+        stage_preprocess(item_type, dirs["txt"], final_csv_path, total_steps, specs_header_content,
+                         result_cache=result_cache, vtser_output_dir=dirs["vtser"])
+    else:
+        seed_csv_path = os.path.join(dirs["csv"], f"{item_type}_seed_batch_preprocessed_n{num_samples}_s{seed}.csv")
+        stage_preprocess(item_type, dirs["txt"], seed_csv_path, total_steps,
+                         result_cache=result_cache, vtser_output_dir=dirs["vtser"])
+        round_csv_paths = run_active_learning(item_type, generation_params, args, current_run_output_dir,
+                                              seed_csv_path, total_steps, result_cache)
+        final_csv_path = os.path.join(dirs["csv"], f"{item_type}_preprocessed_al_s{seed}.csv")
+        merged = merge_round_csvs(round_csv_paths, final_csv_path)
+        add_csv_header_specs(final_csv_path, specs_header_content)
+        print(f"능동 학습 결과 병합 완료: {len(round_csv_paths)}개 배치, {merged['SampleID'].nunique() if not merged.empty else 0}개 샘플")
+
     pipeline_end_time = time.time()
     total_elapsed_time = pipeline_end_time - pipeline_start_time
     print(f"\n--- 모든 프로세스 성공적으로 완료 ---")
@@ -342,4 +813,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+(컴포넌트, 정규화된 형상) -> 전처리된 VacTran 결과 행을 저장하는 SQLite 결과 캐시.
+
+정규화된 형상 키는 VTSER 파일에 실제로 기록되는 컬럼 필드 값(genVtser/vtserWriter.py의 COMPONENT_SCHEMAS 형식,
+예: "Diameter=2.540000;ModelLength=10.000000")이므로, VacTran이 같은 입력을 받는 샘플은 같은 키를 갖습니다.
+Reducer와 Expander는 같은 CONE 컴포넌트이므로 캐시를 공유합니다.
+
+    2단계: 샘플마다 키를 계산해 캐시에 없는 형상만, 실행 내 중복을 제거하여 VTSER 파일로 기록합니다.
+           샘플별 키와 시뮬레이션 번호(SimID)는 result_cache_plan.csv에 저장합니다.
+    4단계: 새로 시뮬레이션한 결과를 슬롯 매니페스트(seriesRouter)로 파싱해 캐시에 추가하고,
+           모든 샘플의 결과를 캐시에서 꺼내 원래 SampleID로 최종 CSV를 만듭니다.
+           캐시에는 3단계 완료 기록(runManifest)의 마지막 상태가 done인 파일에서 모델 블록까지 파싱된 형상만 추가합니다
+           (실패한 파일의 결과가 캐시에 남으면 다시 시뮬레이션되지 않으므로).
+"""
+
+import os
+import json
+import sqlite3
+import argparse
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+import runManifest
+from sampleTable import read_sample_table
+from genVtser.vtserWriter import (COMPONENT_SCHEMAS, ITEM_COMPONENTS, MIXED_FILE_PREFIX, VTSER_CHUNK_SIZE,
+                                  column_values, series_manifest_name, write_mixed_series)
+from dataPreprosessor.seriesRouter import ITEM_PARSERS, route_rows, write_item_csv
+
+CACHE_PLAN_NAME = "result_cache_plan.csv"
+SQL_BATCH_SIZE = 500 # IN (...) 조회 한 번에 넣는 키 수
+
+def open_cache(path):
+    """캐시 DB를 열고 (없으면 만들고) 연결을 반환합니다. WAL 모드로 여러 실행이 동시에 읽을 수 있습니다."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS results ("
+        " component TEXT NOT NULL, geometry TEXT NOT NULL, columns TEXT NOT NULL, rows TEXT NOT NULL,"
+        " created_at TEXT NOT NULL, PRIMARY KEY (component, geometry))"
+    )
+    conn.commit()
+    return conn
+
+def geometry_keys(df, component):
+    """샘플 테이블 각 행의 정규화된 형상 키 (VTSER에 기록되는 컬럼 필드 값만, 필드 순서대로)"""
+    fields = [(key, value) for key, value in COMPONENT_SCHEMAS[component] if not isinstance(value, str)]
+    template = ";".join(f"{key}={fmt}" for key, (_, fmt) in fields)
+    values = [column_values(df, column) for _, (column, _) in fields]
+    return [template % row for row in zip(*values)]
+
+def batched(items, size=SQL_BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def cached_geometries(conn, component, keys):
+    """keys 중 캐시에 결과가 있는 키 집합"""
+    found = set()
+    for batch in batched(set(keys)):
+        placeholders = ",".join("?" * len(batch))
+        cur = conn.execute(f"SELECT geometry FROM results WHERE component=? AND geometry IN ({placeholders})",
+                           [component] + batch)
+        found.update(row[0] for row in cur)
+    return found
+
+def fetch_geometry_rows(conn, component, keys):
+    """{키: 결과 행 dict 리스트 (SampleID 제외)}"""
+    result = {}
+    for batch in batched(set(keys)):
+        placeholders = ",".join("?" * len(batch))
+        cur = conn.execute(f"SELECT geometry, columns, rows FROM results WHERE component=? AND geometry IN ({placeholders})",
+                           [component] + batch)
+        for geometry, columns, rows in cur:
+            columns = json.loads(columns)
+            result[geometry] = [dict(zip(columns, values)) for values in json.loads(rows)]
+    return result
+
+def store_geometry_rows(conn, component, rows_by_key):
+    """{키: 결과 행 dict 리스트}를 캐시에 저장합니다 (같은 키가 있으면 덮어씀). 저장한 키 수를 반환합니다."""
+    created_at = datetime.now().isoformat(timespec="seconds")
+    records = []
+    for key, rows in rows_by_key.items():
+        if not rows:
+            continue
+        columns = [col for col in rows[0] if col != "SampleID"]
+        records.append((component, key, json.dumps(columns), json.dumps([[row.get(col) for col in columns] for row in rows]), created_at))
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO results (component, geometry, columns, rows, created_at) VALUES (?, ?, ?, ?, ?)", records)
+    return len(records)
+
+def model_parsed(rows, item_type):
+    """결과 행에 모델 블록 값이 하나라도 있는지 (_model.txt 블록이 없으면 seriesRouter가 모델 컬럼을 모두 None으로 채움)"""
+    model_columns = ITEM_PARSERS[item_type][3]
+    return all(any(not pd.isna(row.get(col)) for col in model_columns) for row in rows)
+
+def cache_series_prefix(item_types):
+    """캐시 모드 시리즈 파일 접두어 (한 타입이면 그 컴포넌트 이름, 여러 타입이면 MIXED)"""
+    item_types = list(item_types)
+    return ITEM_COMPONENTS[item_types[0]] if len(item_types) == 1 else MIXED_FILE_PREFIX
+
+def write_uncached_series(conn, sample_paths, vtser_dir, chunk_size=VTSER_CHUNK_SIZE):
+    """
+    2단계 (캐시 사용): 캐시에 없는 형상만 실행 내 중복을 제거하여 VTSER 파일로 기록하고 계획 파일을 저장합니다.
+
+    :param sample_paths: {아이템 타입: 샘플 테이블 경로}
+    :return: 시뮬레이션할 형상 수
+    """
+    os.makedirs(vtser_dir, exist_ok=True)
+    plans, sim_tables = [], {}
+    for item_type, sample_path in sample_paths.items():
+        df = read_sample_table(sample_path)
+        component = ITEM_COMPONENTS[item_type]
+        keys = geometry_keys(df, component)
+        cached = cached_geometries(conn, component, keys)
+
+        sim_ids, sim_rows = {}, []
+        for row_idx, key in enumerate(keys):
+            if key not in cached and key not in sim_ids:
+                sim_ids[key] = len(sim_ids) + 1
+                sim_rows.append(row_idx)
+        if sim_rows:
+            sim_df = df.iloc[sim_rows].reset_index(drop=True)
+            sim_df["SampleID"] = np.arange(1, len(sim_df) + 1)
+            sim_tables[item_type] = sim_df
+
+        sample_ids = df["SampleID"].to_numpy() if "SampleID" in df.columns else np.arange(1, len(df) + 1)
+        plans.append(pd.DataFrame({
+            "item_type": item_type,
+            "SampleID": sample_ids,
+            "component": component,
+            "geometry": keys,
+            "SimID": pd.array([sim_ids.get(key) for key in keys], dtype="Int64"),
+        }))
+        n_hit = sum(key in cached for key in keys)
+        print(f"결과 캐시 [{item_type}]: 샘플 {len(keys)}개 중 캐시 적중 {n_hit}개, "
+              f"실행 내 중복 {len(keys) - n_hit - len(sim_ids)}개, 시뮬레이션 {len(sim_ids)}개")
+
+    pd.concat(plans, ignore_index=True).to_csv(os.path.join(vtser_dir, CACHE_PLAN_NAME), index=False)
+    n_sim = sum(len(df) for df in sim_tables.values())
+    if n_sim:
+        write_mixed_series(sim_tables, vtser_dir, chunk_size=chunk_size, file_prefix=cache_series_prefix(sample_paths))
+    return n_sim
+
+def assemble_results(conn, txt_dir, vtser_dir, output_files):
+    """
+    4단계 (캐시 사용): 새 시뮬레이션 결과를 캐시에 추가한 뒤, 계획 파일의 모든 샘플 결과를 캐시에서 꺼내
+    타입별 최종 CSV(기존 *Prepro와 같은 컬럼)를 저장합니다.
+
+    :param output_files: {아이템 타입: 출력 CSV 경로}
+    """
+    plan = pd.read_csv(os.path.join(vtser_dir, CACHE_PLAN_NAME), dtype={"SimID": "Int64"})
+    manifest_path = os.path.join(vtser_dir, series_manifest_name(cache_series_prefix(plan["item_type"].unique())))
+    fresh, series_manifest, done = {}, pd.DataFrame(columns=["file", "item_type", "SampleID"]), set()
+    if os.path.exists(manifest_path):
+        fresh = route_rows(txt_dir, manifest_path, list(output_files))
+        series_manifest = pd.read_csv(manifest_path)
+        done = runManifest.completed_files(vtser_dir, txt_dir, series_manifest["file"].unique())
+
+    for item_type, output_file in output_files.items():
+        item_plan = plan[plan["item_type"] == item_type]
+        component = ITEM_COMPONENTS[item_type]
+        sim_keys = dict(item_plan.dropna(subset=["SimID"]).drop_duplicates("SimID")[["SimID", "geometry"]].itertuples(index=False))
+        item_slots = series_manifest[series_manifest["item_type"] == item_type]
+        sim_files = dict(zip(item_slots["SampleID"].astype(int), item_slots["file"]))
+        rows_by_sim = {}
+        for row in fresh.get(item_type, []):
+            rows_by_sim.setdefault(int(row["SampleID"]), []).append(row)
+        rows_by_key, rejected = {}, 0
+        for sim_id, rows in rows_by_sim.items():
+            if sim_files.get(sim_id) in done and model_parsed(rows, item_type):
+                rows_by_key[sim_keys[sim_id]] = rows
+            else:
+                rejected += 1
+        stored = store_geometry_rows(conn, component, rows_by_key)
+
+        cached = fetch_geometry_rows(conn, component, item_plan["geometry"])
+        rows, missing = [], 0
+        for sample_id, key in zip(item_plan["SampleID"], item_plan["geometry"]):
+            if key not in cached:
+                missing += 1
+                continue
+            rows.extend({**row, "SampleID": int(sample_id)} for row in cached[key])
+        print(f"결과 캐시 [{item_type}]: 새 형상 {stored}개 저장, 저장하지 않은 형상 {rejected}개 (완료 기록이 done이 아니거나 모델 값 없음), "
+              f"결과 없는 샘플 {missing}개")
+        write_item_csv(rows, item_type, output_file)
+
+def main():
+    parser = argparse.ArgumentParser(description="형상 단위 VacTran 결과 캐시(SQLite) 통계를 출력합니다.")
+    parser.add_argument("cache_path", help="결과 캐시 파일 경로 (예: pipeline_output_data/result_cache.sqlite)")
+    args = parser.parse_args()
+    conn = open_cache(args.cache_path)
+    for component, count in conn.execute("SELECT component, COUNT(*) FROM results GROUP BY component ORDER BY component"):
+        print(f"{component}: {count}개 형상")
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+3단계(VacTran 자동화) 파일별 완료 기록 (append-only JSONL).
+
+출력 디렉터리의 vactran_manifest.jsonl에 VTSER 파일 하나를 처리할 때마다 한 줄을 추가합니다.
+    {"file", "status": "done"|"failed", "finished_at", "seconds", "pid", "driver", "attempt", "popup",
+     "clipboard_rejects", "input_sha256", "txt_sha256", "model_sha256", "txt_bytes", "model_bytes", "waits", "error"}
+같은 파일의 기록이 여러 줄이면 마지막 줄이 현재 상태입니다. 실행이 도중에 끊겨 마지막 줄이 잘려도 그 줄만 무시됩니다.
+
+재개(resume) 시에는 마지막 기록이 done이고, 입력 VTSER 내용과 .txt/_model.txt 출력이 기록된 체크섬과 같은 파일만
+완료로 보고 건너뜁니다 (VTSER가 다시 생성되어 내용이 바뀌었거나 출력이 지워지거나 바뀐 파일은 다시 실행).
+"""
+
+import os
+import json
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+
+from chunkStore import result_paths
+
+MANIFEST_NAME = "vactran_manifest.jsonl"
+HASH_BLOCK_SIZE = 1 << 20
+
+MANIFEST_LOCK = threading.Lock() # 같은 프로세스의 작업 슬롯(스레드)들이 한 줄씩 온전히 추가하도록 직렬화
+
+def manifest_path(output_dir):
+    return os.path.join(output_dir, MANIFEST_NAME)
+
+def file_sha256(path):
+    """파일 내용의 SHA-256 (없으면 None)"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def append_record(path, record):
+    """기록 한 줄을 추가하고 디스크에 flush합니다 (기계가 재시작되어도 완료된 파일 기록이 남도록)."""
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with MANIFEST_LOCK:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+def record_file(output_dir, fname, input_path, status, seconds, error=None, **extra):
+    """
+    VTSER 파일 하나의 처리 결과를 기록합니다. status가 "done"이면 .txt와 _model.txt가 모두 비어 있지 않아야 하며,
+    아니면 "failed"로 기록합니다.
+    :return: 실제로 기록한 status
+    """
+    txt_path, model_path = result_paths(output_dir, fname)
+    sizes = [os.path.getsize(p) if os.path.exists(p) else 0 for p in (txt_path, model_path)]
+    if status == "done" and not all(sizes):
+        status, error = "failed", error or "결과 .txt/_model.txt가 없거나 비어 있습니다."
+    record = {
+        "file": fname,
+        "status": status,
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "seconds": round(seconds, 3),
+        **extra,
+        "input_sha256": file_sha256(input_path),
+        "txt_sha256": file_sha256(txt_path) if status == "done" else None,
+        "model_sha256": file_sha256(model_path) if status == "done" else None,
+        "txt_bytes": sizes[0],
+        "model_bytes": sizes[1],
+        "error": None if error is None else str(error),
+    }
+    append_record(manifest_path(output_dir), record)
+    return status
+
+def load_records(path):
+    """{파일 이름: 마지막 기록} (기록 파일이 없으면 빈 dict, 잘린 줄은 무시)"""
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record["file"]] = record
+    return records
+
+def completed_files(input_dir, output_dir, fnames):
+    """fnames 중 마지막 기록이 done이고 입력/출력 체크섬이 기록과 같은 (다시 실행할 필요가 없는) 파일 집합"""
+    records = load_records(manifest_path(output_dir))
+    done = set()
+    for fname in fnames:
+        record = records.get(fname)
+        if record is None or record["status"] != "done":
+            continue
+        txt_path, model_path = result_paths(output_dir, fname)
+        if (record["input_sha256"] == file_sha256(os.path.join(input_dir, fname))
+                and record["txt_sha256"] == file_sha256(txt_path)
+                and record["model_sha256"] == file_sha256(model_path)):
+            done.add(fname)
+    return done
+
+def main():
+    parser = argparse.ArgumentParser(description="3단계 완료 기록(vactran_manifest.jsonl)의 파일별 현재 상태를 요약합니다.")
+    parser.add_argument("output_dir", help="VacTran 결과(.txt) 출력 디렉터리")
+    args = parser.parse_args()
+    records = load_records(manifest_path(args.output_dir))
+    failed = sorted(fname for fname, record in records.items() if record["status"] != "done")
+    print(f"{manifest_path(args.output_dir)}: 파일 {len(records)}개, 완료 {len(records) - len(failed)}개, 실패 {len(failed)}개")
+    for fname in failed:
+        print(f"  실패: {fname}: {records[fname]['error']}")
+
+if __name__ == "__main__":
+    main()
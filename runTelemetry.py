@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+3단계(VacTran 자동화) 파일별/단계별 소요 시간 기록 (JSONL)과 요약.
+
+출력 디렉터리의 vactran_phases.jsonl에 VTSER 파일 하나(시도 하나)를 처리할 때마다 아래 이벤트를 추가합니다.
+    {"event": "phase", "run", "file", "attempt", "pid", "slot", "phase", "t", "seconds", "ok"}   단계마다 (같은 단계가 여러 번이면 여러 줄)
+    {"event": "file", "run", "file", "attempt", "pid", "slot", "status", "t", "seconds", "waits"} 파일마다 한 줄
+t는 시작 시각(epoch 초), waits는 드라이버 대기 기록 {label: [합계 초, 횟수, timeout 횟수]} (vacDriver/waitLog.py)입니다.
+단계(phase)는 autoVacModule이 드라이버 호출 단위로 재는 시간입니다.
+    focus_wait      UI_LOCK(포커스)을 기다린 시간 (queue 모드)
+    launch          프로세스 시작 ~ 첫 창, 시작 직후 오류 팝업 처리 (드라이버 대기 popup_check)
+    attach          메인 창 탐색 (find_main_window)
+    open_file       웜 인스턴스 파일 열기
+    generate_graph  그래프 생성 키 입력
+    wait_graph      그래프 계산/렌더링 대기
+    extract_conductance, extract_model  텍스트 창 두 개의 클립보드 복사
+    close           프로세스 종료
+
+    python runTelemetry.py <txt_dir> [--run last|<run id>]   # 단계별 p50/p95/max, 실행별 files/hour
+"""
+
+import os
+import json
+import time
+import argparse
+import threading
+from datetime import datetime
+
+import numpy as np
+
+TELEMETRY_NAME = "vactran_phases.jsonl"
+PHASE_ORDER = ("focus_wait", "launch", "attach", "open_file", "generate_graph", "wait_graph",
+               "extract_conductance", "extract_model", "close")
+
+TELEMETRY_LOCK = threading.Lock()
+RUNS = {} # 출력 디렉터리 -> 현재 실행 ID (start_run)
+
+def telemetry_path(output_dir):
+    return os.path.join(output_dir, TELEMETRY_NAME)
+
+def start_run(output_dir):
+    """output_dir에 기록할 새 실행 ID(시작 시각)를 정합니다. 같은 디렉터리의 재개(resume) 실행은 실행 ID로 구분됩니다."""
+    run_id = datetime.now().isoformat(timespec="seconds")
+    RUNS[os.path.abspath(output_dir)] = run_id
+    return run_id
+
+def write_file_events(proc_info, status):
+    """proc_info의 단계 기록(proc_info['phases'])과 파일 결과를 한 번에 추가합니다."""
+    output_dir = proc_info['output_dir']
+    base = {
+        "run": RUNS.get(os.path.abspath(output_dir)),
+        "file": proc_info['fname'],
+        "attempt": proc_info.get('attempt', 0),
+        "pid": proc_info.get('pid'),
+        "slot": proc_info.get('slot'),
+    }
+    events = [{"event": "phase", **base, "phase": p['phase'], "t": round(proc_info['wall_started'] + p['offset'], 3),
+               "seconds": round(p['seconds'], 4), "ok": p['ok']} for p in proc_info.get('phases', [])]
+    events.append({"event": "file", **base, "status": status, "t": round(proc_info['wall_started'], 3),
+                   "seconds": round(time.perf_counter() - proc_info['file_started'], 4),
+                   "waits": {label: [round(total, 4), count, timeouts]
+                             for label, (total, count, timeouts) in proc_info.get('waits', {}).items()}})
+    text = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+    with TELEMETRY_LOCK:
+        with open(telemetry_path(output_dir), "a", encoding="utf-8") as f:
+            f.write(text)
+
+def load_events(path):
+    """기록된 이벤트 리스트 (잘린 줄은 무시)"""
+    events = []
+    if not os.path.exists(path):
+        return events
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return events
+
+def stats_row(name, values, grand_total):
+    values = np.asarray(values, dtype=float)
+    return {
+        "name": name,
+        "n": len(values),
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "max": float(values.max()),
+        "total": float(values.sum()),
+        "share": float(values.sum()) / grand_total if grand_total > 0 else 0.0,
+    }
+
+def summarize(events):
+    """
+    이벤트 -> {'runs': 실행별 [{'run', 'files', 'done', 'failed', 'wall_seconds', 'files_per_hour'}],
+               'phases': 단계별 [{'name', 'n', 'p50', 'p95', 'max', 'total', 'share'}] (파일 시도 하나의 단계 합계 기준),
+               'waits': 드라이버 대기 label별 같은 형식}
+    """
+    files = [e for e in events if e["event"] == "file"]
+    runs = []
+    for run_id in dict.fromkeys(e["run"] for e in files):
+        run_files = [e for e in files if e["run"] == run_id]
+        run_phases = [e for e in events if e["event"] == "phase" and e["run"] == run_id]
+        start = min(e["t"] for e in run_files)
+        end = max(e["t"] + e["seconds"] for e in run_files + run_phases)
+        done = sum(1 for e in run_files if e["status"] == "done")
+        wall = end - start
+        runs.append({"run": run_id, "files": len(run_files), "done": done, "failed": len(run_files) - done,
+                     "wall_seconds": wall, "files_per_hour": done / wall * 3600 if wall > 0 else 0.0})
+
+    per_attempt = {}
+    for e in events:
+        if e["event"] == "phase":
+            key = (e["run"], e["file"], e["attempt"])
+            per_attempt.setdefault(e["phase"], {}).setdefault(key, 0.0)
+            per_attempt[e["phase"]][key] += e["seconds"]
+    phase_total = sum(sum(v.values()) for v in per_attempt.values())
+    names = [p for p in PHASE_ORDER if p in per_attempt] + sorted(set(per_attempt) - set(PHASE_ORDER))
+    phases = [stats_row(name, list(per_attempt[name].values()), phase_total) for name in names]
+
+    per_label = {}
+    for e in files:
+        for label, (total, _, _) in e.get("waits", {}).items():
+            per_label.setdefault(label, []).append(total)
+    wait_total = sum(sum(v) for v in per_label.values())
+    waits = [stats_row(label, values, wait_total) for label, values in per_label.items()]
+    return {"runs": runs, "phases": phases, "waits": waits}
+
+def print_stats(title, rows):
+    print(f"\n{title}")
+    print(f"  {'':<22}{'n':>6}{'p50(s)':>10}{'p95(s)':>10}{'max(s)':>10}{'total(s)':>11}{'share':>8}")
+    for r in rows:
+        print(f"  {r['name']:<22}{r['n']:>6}{r['p50']:>10.3f}{r['p95']:>10.3f}{r['max']:>10.3f}{r['total']:>11.1f}{r['share']:>8.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="3단계 단계별 소요 시간 기록(vactran_phases.jsonl)의 p50/p95/max와 실행별 files/hour를 출력합니다.")
+    parser.add_argument("output_dir", help="VacTran 결과(.txt) 출력 디렉터리")
+    parser.add_argument("--run", default=None, help="요약할 실행 ID ('last'면 마지막 실행, 기본값: 모든 실행)")
+    args = parser.parse_args()
+    path = telemetry_path(args.output_dir)
+    events = load_events(path)
+    if args.run is not None:
+        run_id = events[-1]["run"] if args.run == "last" and events else args.run
+        events = [e for e in events if e["run"] == run_id]
+    if not events:
+        print(f"{path}: 기록이 없습니다.")
+        return
+    summary = summarize(events)
+    print(f"{path}")
+    for r in summary["runs"]:
+        print(f"  실행 {r['run']}: 파일 {r['files']}개 (완료 {r['done']}, 실패 {r['failed']}), "
+              f"{r['wall_seconds']:.1f}초, {r['files_per_hour']:.1f} files/hour")
+    print_stats("단계별 소요 시간 (파일 시도당 합계)", summary["phases"])
+    print_stats("드라이버 대기 label별 시간 (파일 시도당 합계)", summary["waits"])
+
+if __name__ == "__main__":
+    main()
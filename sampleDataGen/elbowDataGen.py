@@ -1,67 +1,42 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import numpy as np
-import pandas as pd
 import argparse
-import itertools # itertools 추가
+try:
+    from .samplingCore import generate_stratified_samples, describe_sampling, SAMPLERS, binned_axis, choice_axis, INCH_TO_CM, save_samples
+except ImportError:
+    from samplingCore import generate_stratified_samples, describe_sampling, SAMPLERS, binned_axis, choice_axis, INCH_TO_CM, save_samples
 
 def generate_elbow_samples(total_samples,
                            diameter_inch_spec, # (min, max, num_intervals)
                            angles_deg_list,
-                           seed=None):
-    if seed is not None:
-        np.random.seed(seed)
+                           seed=None,
+                           workers=1,
+                           sampler="uniform"):
+    """직경(inch) 구간 x 각도 목록 조합별로 균등 샘플링하여 cm 단위 엘보 샘플을 생성합니다."""
+    axes = [
+        binned_axis("Diameter_cm", diameter_inch_spec, scale=INCH_TO_CM),
+        choice_axis("BendAngle_deg", angles_deg_list, dtype=int),
+    ]
+    df = generate_stratified_samples(total_samples, axes, seed=seed, component="elbow", workers=workers, sampler=sampler)
+    df["Quantity"] = 1
+    return df
 
-    # 직경 구간 생성
-    dia_min_in, dia_max_in, dia_intervals = diameter_inch_spec
-    dia_edges_in = np.linspace(dia_min_in, dia_max_in, int(dia_intervals) + 1)
-    dia_bins_in = [(dia_edges_in[i], dia_edges_in[i+1]) for i in range(int(dia_intervals))]
-
-    # 각도는 주어진 리스트 그대로 사용
-    # 모든 파라미터 조합 생성 (직경 구간 * 각도)
-    param_combinations = list(itertools.product(dia_bins_in, angles_deg_list))
-
-    if not param_combinations:
-        return pd.DataFrame(columns=["SampleID", "Diameter_cm", "BendAngle_deg", "Quantity"])
-
-    n_combinations = len(param_combinations)
-    
-    base_samples_per_combo = total_samples // n_combinations
-    remainder_samples = total_samples % n_combinations
-    counts_per_combo = [base_samples_per_combo + (1 if i < remainder_samples else 0) for i in range(n_combinations)]
-
-    records = []
-    sid = 1
-    for combo_idx, ((low_in, high_in), angle_deg) in enumerate(param_combinations):
-        cnt = counts_per_combo[combo_idx]
-        if cnt == 0:
-            continue
-            
-        diam_in_samples = np.random.uniform(low_in, high_in, size=cnt)
-        diam_cm_samples = diam_in_samples * 2.54
-
-        for d_cm in diam_cm_samples:
-            records.append({
-                "SampleID":       sid,
-                "Diameter_cm":    round(d_cm, 4),
-                "BendAngle_deg":  int(angle_deg),
-                "Quantity":       1
-            })
-            sid += 1
-
-    return pd.DataFrame(records)
-
-def run(output_file, total_samples, diameter_inch_spec, angles_deg_list, seed):
-    """Generates elbow sample data and saves it to an Excel file."""
+def run(output_file, total_samples, diameter_inch_spec, angles_deg_list, seed, excel_copy=False, workers=1, sampler="uniform"):
+    """Generates elbow sample data and saves it to the sample table file (format by extension)."""
     df = generate_elbow_samples(
         total_samples=total_samples,
         diameter_inch_spec=diameter_inch_spec,
         angles_deg_list=angles_deg_list,
-        seed=seed
+        seed=seed,
+        workers=workers,
+        sampler=sampler
     )
-    df.to_excel(output_file, index=False)
+    saved_paths = save_samples(df, output_file, excel_copy=excel_copy)
     print(f"완료: '{output_file}'에 {len(df)}개의 Elbow 샘플을 저장했습니다.")
+    print(f"  {describe_sampling(df)}")
+    for extra_path in saved_paths[1:]:
+        print(f"  Excel 사본 저장: '{extra_path}'")
 
 def parse_spec(s):
     parts = s.split(',')
@@ -72,7 +47,10 @@ def parse_spec(s):
 def main():
     parser = argparse.ArgumentParser(description="Elbow 샘플 데이터를 inch 단위 스펙으로 받아 cm로 변환하여 생성. 직경은 (min,max,num_intervals) 형식.")
     parser.add_argument("n", type=int, help="생성할 전체 샘플 수")
-    parser.add_argument("-o","--output", default="elbow_samples.xlsx", help="출력 엑셀 파일명")
+    parser.add_argument("-o","--output", default="elbow_samples.xlsx", help="출력 파일명 (.npz/.parquet/.feather/.csv/.xlsx, 확장자로 형식 결정)")
+    parser.add_argument("--excel_copy", action="store_true", help="출력 형식과 별도로 사람이 읽을 수 있는 .xlsx 사본도 저장")
+    parser.add_argument("--workers", type=int, default=1, help="구간 조합을 병렬 생성할 프로세스 수 (결과는 워커 수와 무관하게 동일)")
+    parser.add_argument("--sampler", choices=SAMPLERS, default="uniform", help="구간 내 추출 방식: uniform(균등 난수), sobol(스크램블 Sobol), lhs(Latin hypercube). sobol/lhs는 scipy 필요")
     parser.add_argument("--seed", type=int, default=42, help="난수 시드")
     parser.add_argument("--diameter_inch_spec", type=parse_spec, required=True, help="직경 스펙 (inch): min,max,intervals (예: '1.0,5.0,2')")
     parser.add_argument("--angles_deg", type=lambda s: [int(item) for item in s.split(',')], required=True, help="각도 리스트 (쉼표로 구분, 예: '15,30,45')")
@@ -83,7 +61,10 @@ def main():
         total_samples=args.n,
         diameter_inch_spec=args.diameter_inch_spec,
         angles_deg_list=args.angles_deg,
-        seed=args.seed
+        seed=args.seed,
+        excel_copy=args.excel_copy,
+        workers=args.workers,
+        sampler=args.sampler
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import argparse
+try:
+    from .samplingCore import exhaustive_axis, count_exhaustive_grid, iter_exhaustive_chunks, write_sample_chunks, INCH_TO_CM
+except ImportError:
+    from samplingCore import exhaustive_axis, count_exhaustive_grid, iter_exhaustive_chunks, write_sample_chunks, INCH_TO_CM
+
+ELBOW_COLUMNS = ["SampleID", "Diameter_cm", "BendAngle_deg", "Quantity"]
+
+def build_exhaustive_elbow_axes(diameter_inch_spec, angles_deg_list):
+    """
+    지정된 시작, 끝, 증가량으로 Diameter 값 목록을 만들고 각도 목록과 함께 전수조사 격자 축으로 반환합니다.
+
+    :param diameter_inch_spec: (start, end, increment) for Diameter in inches.
+    :param angles_deg_list: 엘보 각도 목록 (deg).
+    """
+    d_start_in, d_end_in, d_step_in = diameter_inch_spec
+    d_values_in = np.arange(d_start_in, d_end_in + d_step_in / 2, d_step_in)
+
+    print(f"--- 생성 범위 ---")
+    print(f"Diameter (inch): {d_values_in}")
+    print(f"BendAngle (deg): {list(angles_deg_list)}")
+    print("-----------------")
+
+    return [
+        exhaustive_axis("Diameter_cm", d_values_in, scale=INCH_TO_CM),
+        exhaustive_axis("BendAngle_deg", angles_deg_list, decimals=None, dtype=int),
+    ]
+
+def iter_exhaustive_elbow_chunks(diameter_inch_spec, angles_deg_list, chunk_size=1_000_000):
+    """가능한 모든 Elbow 형상 조합(Quantity=1)을 chunk_size개 격자 단위로 나누어 DataFrame 청크로 생성합니다."""
+    axes = build_exhaustive_elbow_axes(diameter_inch_spec, angles_deg_list)
+    print(f"전체 격자 조합 수: {count_exhaustive_grid(axes):,}")
+    for chunk in iter_exhaustive_chunks(axes, chunk_size=chunk_size):
+        chunk["Quantity"] = 1
+        yield chunk
+
+def generate_exhaustive_elbow_samples(diameter_inch_spec, angles_deg_list):
+    """
+    지정된 직경 시작, 끝, 증가량과 각도 목록에 따라 가능한 모든 Elbow 형상 조합을 생성합니다.
+
+    :return: pandas DataFrame containing all combinations.
+    """
+    chunks = list(iter_exhaustive_elbow_chunks(diameter_inch_spec, angles_deg_list))
+    if not chunks:
+        print("경고: 생성된 데이터가 없습니다. 입력 범위를 확인하세요.")
+        return pd.DataFrame(columns=ELBOW_COLUMNS)
+
+    return pd.concat(chunks, ignore_index=True)
+
+def parse_spec(s):
+    """'start,end,increment' 형식의 문자열을 파싱하는 함수"""
+    parts = s.split(',')
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError("Specification must be in 'start,end,increment' format.")
+    try:
+        return float(parts[0]), float(parts[1]), float(parts[2])
+    except ValueError:
+        raise argparse.ArgumentTypeError("Start, end, and increment must be numbers.")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""
+        Elbow 샘플 데이터를 Exhaustive (전수조사) 방식으로 생성합니다.
+        직경은 '시작값,종료값,증가량' 형식, 각도는 쉼표로 구분된 목록으로 지정합니다.
+        """
+    )
+    parser.add_argument("-o", "--output", default="elbow_exhaustive_samples.xlsx", help="출력 파일명 (.npz/.parquet/.feather/.csv/.xlsx, 대용량 격자는 .parquet 또는 .csv 권장)")
+    parser.add_argument("--d_spec", type=parse_spec, required=True, help="직경 스펙 (inch): start,end,increment")
+    parser.add_argument("--angles_deg", type=lambda s: [int(item) for item in s.split(',')], required=True, help="각도 리스트 (쉼표로 구분, 예: '15,30,45')")
+    parser.add_argument("--chunk_size", type=int, default=1_000_000, help="한 번에 생성/기록할 격자 조합 수 (기본값: 1,000,000)")
+    args = parser.parse_args()
+
+    chunks = iter_exhaustive_elbow_chunks(
+        diameter_inch_spec=args.d_spec,
+        angles_deg_list=args.angles_deg,
+        chunk_size=args.chunk_size
+    )
+    n_rows = write_sample_chunks(chunks, args.output, columns=ELBOW_COLUMNS)
+
+    if n_rows:
+        print(f"\n완료: '{args.output}'에 {n_rows}개의 Elbow 샘플을 저장했습니다.")
+    else:
+        print("경고: 생성된 데이터가 없습니다. 입력 범위를 확인하세요.")
+
+if __name__ == "__main__":
+    main()
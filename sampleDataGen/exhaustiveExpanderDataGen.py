@@ -4,16 +4,21 @@
 import numpy as np
 import pandas as pd
 import argparse
+try:
+    from .samplingCore import exhaustive_axis, count_exhaustive_grid, iter_exhaustive_chunks, write_sample_chunks, INCH_TO_CM, MM_TO_CM, d2_greater_than_d1
+except ImportError:
+    from samplingCore import exhaustive_axis, count_exhaustive_grid, iter_exhaustive_chunks, write_sample_chunks, INCH_TO_CM, MM_TO_CM, d2_greater_than_d1
 
-def generate_exhaustive_expander_samples(d1_inch_spec, d2_inch_spec, length_mm_spec):
+EXPANDER_COLUMNS = ["SampleID", "D1_cm", "D2_cm", "Length_cm"]
+
+def build_exhaustive_expander_axes(d1_inch_spec, d2_inch_spec, length_mm_spec):
     """
-    지정된 시작, 끝, 증가량에 따라 가능한 모든 Expander 형상 조합을 생성합니다.
-    (D2 > D1 조건 만족)
+    지정된 시작, 끝, 증가량으로 D1, D2, Length 축의 값 목록을 만들어 전수조사 격자 축으로 반환합니다.
+    Length 스펙이 정수로 변환되지 않으면 None을 반환합니다.
     
     :param d1_inch_spec: (start, end, increment) for D1 in inches.
     :param d2_inch_spec: (start, end, increment) for D2 in inches.
     :param length_mm_spec: (start, end, increment) for Length in mm.
-    :return: pandas DataFrame containing all valid combinations.
     """
     d1_start_in, d1_end_in, d1_step_in = d1_inch_spec
     d2_start_in, d2_end_in, d2_step_in = d2_inch_spec
@@ -38,7 +43,7 @@ def generate_exhaustive_expander_samples(d1_inch_spec, d2_inch_spec, length_mm_s
 
     except ValueError:
         print("오류: Length 스펙은 정수로 변환 가능한 숫자여야 합니다.")
-        return pd.DataFrame()
+        return None
 
     print(f"--- 생성 범위 ---")
     print(f"D1 (inch): {d1_values_in}")
@@ -46,31 +51,37 @@ def generate_exhaustive_expander_samples(d1_inch_spec, d2_inch_spec, length_mm_s
     print(f"Length (mm): {length_values_mm}")
     print("-----------------")
 
-    records = []
-    sample_id = 1
-    for d1_in in d1_values_in:
-        for d2_in in d2_values_in:
-            # Expander 조건: D2 > D1
-            if d2_in > d1_in:
-                for length_mm in length_values_mm:
-                    # 단위 변환: inch -> cm, mm -> cm
-                    d1_cm = d1_in * 2.54
-                    d2_cm = d2_in * 2.54
-                    length_cm = length_mm / 10.0
-                    
-                    records.append({
-                        "SampleID": sample_id,
-                        "D1_cm":    round(d1_cm, 4),
-                        "D2_cm":    round(d2_cm, 4),
-                        "Length_cm":round(length_cm, 4)
-                    })
-                    sample_id += 1
+    return [
+        exhaustive_axis("D1_cm", d1_values_in, scale=INCH_TO_CM),
+        exhaustive_axis("D2_cm", d2_values_in, scale=INCH_TO_CM),
+        exhaustive_axis("Length_cm", length_values_mm, scale=MM_TO_CM),
+    ]
 
-    if not records:
+def iter_exhaustive_expander_chunks(d1_inch_spec, d2_inch_spec, length_mm_spec, chunk_size=1_000_000):
+    """
+    가능한 모든 Expander 형상 조합(D2 > D1 조건 만족)을 chunk_size개 격자 단위로 나누어 DataFrame 청크로 생성합니다.
+    전체 조합을 메모리에 올리지 않으므로 출력 writer로 바로 흘려보낼 수 있습니다.
+    """
+    axes = build_exhaustive_expander_axes(d1_inch_spec, d2_inch_spec, length_mm_spec)
+    if axes is None:
+        return
+    print(f"전체 격자 조합 수 (D2 > D1 조건 적용 전): {count_exhaustive_grid(axes):,}")
+    # Expander 조건: D2 > D1
+    yield from iter_exhaustive_chunks(axes, accept=d2_greater_than_d1, chunk_size=chunk_size)
+
+def generate_exhaustive_expander_samples(d1_inch_spec, d2_inch_spec, length_mm_spec):
+    """
+    지정된 시작, 끝, 증가량에 따라 가능한 모든 Expander 형상 조합을 생성합니다.
+    (D2 > D1 조건 만족)
+    
+    :return: pandas DataFrame containing all valid combinations.
+    """
+    chunks = list(iter_exhaustive_expander_chunks(d1_inch_spec, d2_inch_spec, length_mm_spec))
+    if not chunks:
         print("경고: 생성된 데이터가 없습니다. 입력 범위를 확인하세요 (D2 > D1 조건을 만족해야 합니다).")
-        return pd.DataFrame(columns=["SampleID", "D1_cm", "D2_cm", "Length_cm"])
+        return pd.DataFrame(columns=EXPANDER_COLUMNS)
 
-    return pd.DataFrame(records)
+    return pd.concat(chunks, ignore_index=True)
 
 def parse_spec(s):
     """'start,end,increment' 형식의 문자열을 파싱하는 함수"""
@@ -91,21 +102,26 @@ def main():
         (예: D1을 1, 2, 3인치로 지정하려면 --d1_spec "1,3,1")
         """
     )
-    parser.add_argument("-o", "--output", default="expander_exhaustive_samples.xlsx", help="출력 엑셀 파일명")
+    parser.add_argument("-o", "--output", default="expander_exhaustive_samples.xlsx", help="출력 파일명 (.npz/.parquet/.feather/.csv/.xlsx, 대용량 격자는 .parquet 또는 .csv 권장)")
     parser.add_argument("--d1_spec", type=parse_spec, required=True, help="D1 직경 스펙 (inch): start,end,increment")
     parser.add_argument("--d2_spec", type=parse_spec, required=True, help="D2 직경 스펙 (inch): start,end,increment")
     parser.add_argument("--length_spec", type=parse_spec, required=True, help="길이 스펙 (mm): start,end,increment")
+    parser.add_argument("--chunk_size", type=int, default=1_000_000, help="한 번에 생성/기록할 격자 조합 수 (기본값: 1,000,000)")
     args = parser.parse_args()
 
-    df = generate_exhaustive_expander_samples(
+    # 전체 격자를 메모리에 만들지 않고 청크 단위로 바로 출력 파일에 기록합니다.
+    chunks = iter_exhaustive_expander_chunks(
         d1_inch_spec=args.d1_spec,
         d2_inch_spec=args.d2_spec,
-        length_mm_spec=args.length_spec
+        length_mm_spec=args.length_spec,
+        chunk_size=args.chunk_size
     )
-    
-    if not df.empty:
-        df.to_excel(args.output, index=False)
-        print(f"\n완료: '{args.output}'에 {len(df)}개의 Expander 샘플을 저장했습니다.")
+    n_rows = write_sample_chunks(chunks, args.output, columns=EXPANDER_COLUMNS)
+
+    if n_rows:
+        print(f"\n완료: '{args.output}'에 {n_rows}개의 Expander 샘플을 저장했습니다.")
+    else:
+        print("경고: 생성된 데이터가 없습니다. 입력 범위를 확인하세요 (D2 > D1 조건을 만족해야 합니다).")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
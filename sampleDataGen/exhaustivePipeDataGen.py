@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import argparse
+try:
+    from .samplingCore import exhaustive_axis, count_exhaustive_grid, iter_exhaustive_chunks, write_sample_chunks, INCH_TO_CM, MM_TO_CM
+except ImportError:
+    from samplingCore import exhaustive_axis, count_exhaustive_grid, iter_exhaustive_chunks, write_sample_chunks, INCH_TO_CM, MM_TO_CM
+
+PIPE_COLUMNS = ["SampleID", "Diameter_cm", "Length_cm"]
+
+def build_exhaustive_pipe_axes(diameter_inch_spec, length_mm_spec):
+    """
+    지정된 시작, 끝, 증가량으로 Diameter, Length 축의 값 목록을 만들어 전수조사 격자 축으로 반환합니다.
+    Length 스펙이 정수로 변환되지 않으면 None을 반환합니다.
+
+    :param diameter_inch_spec: (start, end, increment) for Diameter in inches.
+    :param length_mm_spec: (start, end, increment) for Length in mm.
+    """
+    d_start_in, d_end_in, d_step_in = diameter_inch_spec
+    len_start_mm, len_end_mm, len_step_mm = length_mm_spec
+
+    # 직경은 부동소수점일 수 있으므로 np.arange 사용
+    d_values_in = np.arange(d_start_in, d_end_in + d_step_in / 2, d_step_in)
+
+    # Length는 정수 연산으로 부동소수점 오류를 방지합니다 (exhaustiveReducerDataGen과 동일).
+    try:
+        start = int(len_start_mm)
+        end = int(len_end_mm)
+        step = int(len_step_mm)
+        if len_start_mm != start or len_end_mm != end or len_step_mm != step:
+            print("경고: length 스펙에 소수점이 포함되어 있어 정수로 변환됩니다.")
+        length_values_mm = list(range(start, end + 1, step))
+    except ValueError:
+        print("오류: Length 스펙은 정수로 변환 가능한 숫자여야 합니다.")
+        return None
+
+    print(f"--- 생성 범위 ---")
+    print(f"Diameter (inch): {d_values_in}")
+    print(f"Length (mm): {length_values_mm}")
+    print("-----------------")
+
+    return [
+        exhaustive_axis("Diameter_cm", d_values_in, scale=INCH_TO_CM),
+        exhaustive_axis("Length_cm", length_values_mm, scale=MM_TO_CM),
+    ]
+
+def iter_exhaustive_pipe_chunks(diameter_inch_spec, length_mm_spec, chunk_size=1_000_000):
+    """가능한 모든 Pipe 형상 조합을 chunk_size개 격자 단위로 나누어 DataFrame 청크로 생성합니다."""
+    axes = build_exhaustive_pipe_axes(diameter_inch_spec, length_mm_spec)
+    if axes is None:
+        return
+    print(f"전체 격자 조합 수: {count_exhaustive_grid(axes):,}")
+    yield from iter_exhaustive_chunks(axes, chunk_size=chunk_size)
+
+def generate_exhaustive_pipe_samples(diameter_inch_spec, length_mm_spec):
+    """
+    지정된 시작, 끝, 증가량에 따라 가능한 모든 Pipe 형상 조합을 생성합니다.
+
+    :return: pandas DataFrame containing all combinations.
+    """
+    chunks = list(iter_exhaustive_pipe_chunks(diameter_inch_spec, length_mm_spec))
+    if not chunks:
+        print("경고: 생성된 데이터가 없습니다. 입력 범위를 확인하세요.")
+        return pd.DataFrame(columns=PIPE_COLUMNS)
+
+    return pd.concat(chunks, ignore_index=True)
+
+def parse_spec(s):
+    """'start,end,increment' 형식의 문자열을 파싱하는 함수"""
+    parts = s.split(',')
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError("Specification must be in 'start,end,increment' format.")
+    try:
+        return float(parts[0]), float(parts[1]), float(parts[2])
+    except ValueError:
+        raise argparse.ArgumentTypeError("Start, end, and increment must be numbers.")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""
+        Pipe 샘플 데이터를 Exhaustive (전수조사) 방식으로 생성합니다.
+        각 파라미터는 '시작값,종료값,증가량' 형식으로 지정합니다.
+        (예: 직경을 1, 2, 3인치로 지정하려면 --d_spec "1,3,1")
+        """
+    )
+    parser.add_argument("-o", "--output", default="pipe_exhaustive_samples.xlsx", help="출력 파일명 (.npz/.parquet/.feather/.csv/.xlsx, 대용량 격자는 .parquet 또는 .csv 권장)")
+    parser.add_argument("--d_spec", type=parse_spec, required=True, help="직경 스펙 (inch): start,end,increment")
+    parser.add_argument("--length_spec", type=parse_spec, required=True, help="길이 스펙 (mm): start,end,increment")
+    parser.add_argument("--chunk_size", type=int, default=1_000_000, help="한 번에 생성/기록할 격자 조합 수 (기본값: 1,000,000)")
+    args = parser.parse_args()
+
+    chunks = iter_exhaustive_pipe_chunks(
+        diameter_inch_spec=args.d_spec,
+        length_mm_spec=args.length_spec,
+        chunk_size=args.chunk_size
+    )
+    n_rows = write_sample_chunks(chunks, args.output, columns=PIPE_COLUMNS)
+
+    if n_rows:
+        print(f"\n완료: '{args.output}'에 {n_rows}개의 Pipe 샘플을 저장했습니다.")
+    else:
+        print("경고: 생성된 데이터가 없습니다. 입력 범위를 확인하세요.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+sampleDataGen 모듈들이 공유하는 층화(stratified) 샘플링 코어.
+
+각 파라미터 축을 (min, max, num_intervals) 스펙으로 구간화하고, 모든 구간 조합(bin grid)을 펼친 뒤
+구간 조합별 샘플을 NumPy 배열 연산으로 생성합니다. 단위 변환(inch/mm -> cm)과 반올림도 배열 단위로 처리하므로
+샘플별 dict를 만들지 않고 배열 크기에 비례하는 메모리만 사용합니다.
+각 구간 조합은 SeedSequence에서 파생한 독립 난수열을 사용하므로 구간들을 여러 프로세스에서 나누어
+생성해도 같은 seed에 대해 결과가 동일합니다. 구간 내 추출은 균등 난수(uniform) 외에
+스크램블 Sobol / Latin hypercube 저불일치(low-discrepancy) 설계를 선택할 수 있습니다 (scipy 필요).
+전수조사(exhaustive) 격자는 고정 크기 청크 단위로 생성하여 출력 파일에 바로 기록합니다.
+파일 입출력은 프로젝트 루트의 sampleTable 모듈을 사용합니다 (write_sample_table, write_sample_chunks, save_samples 재노출).
+"""
+
+import zlib
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from sampleTable import write_sample_table, write_sample_chunks, save_samples
+
+INCH_TO_CM = 2.54
+MM_TO_CM = 0.1
+
+def linspace_bins(spec):
+    """(min, max, num_intervals) 스펙을 np.linspace로 나눈 구간의 (lows, highs) 배열을 반환합니다."""
+    v_min, v_max, n_intervals = spec
+    edges = np.linspace(v_min, v_max, int(n_intervals) + 1)
+    return edges[:-1], edges[1:]
+
+def binned_axis(name, spec, scale=1.0, decimals=4):
+    """
+    연속 파라미터 축을 정의합니다. 구간 내에서 균등 추출한 값에 scale을 곱해 단위를 변환하고 decimals 자리로 반올림합니다.
+
+    :param name: 출력 컬럼명 (예: "Diameter_cm")
+    :param spec: 입력 단위 기준 (min, max, num_intervals)
+    :param scale: 입력 단위 -> 출력 단위 변환 계수 (예: INCH_TO_CM)
+    """
+    lows, highs = linspace_bins(spec)
+    return {"name": name, "lows": lows, "highs": highs, "scale": scale, "decimals": decimals, "dtype": float}
+
+def choice_axis(name, values, dtype=int):
+    """이산 파라미터 축을 정의합니다. 각 값이 하나의 구간이 되며 값 그대로 출력됩니다 (예: 엘보 각도)."""
+    values = np.asarray(values, dtype=float)
+    return {"name": name, "lows": values, "highs": values, "scale": 1.0, "decimals": None, "dtype": dtype}
+
+def split_counts(total_samples, n_combinations):
+    """전체 샘플 수를 구간 조합 수로 균등 분배합니다. 나머지는 앞쪽 조합부터 1개씩 더 배정합니다."""
+    counts = np.full(n_combinations, total_samples // n_combinations, dtype=np.int64)
+    counts[:total_samples % n_combinations] += 1
+    return counts
+
+def build_bin_grid(axes):
+    """
+    모든 축의 구간 조합을 itertools.product와 같은 순서(마지막 축이 가장 빠르게 변함)로 펼칩니다.
+
+    :return: 축별 (lows, highs) 배열 리스트. 각 배열의 길이는 전체 구간 조합 수입니다.
+    """
+    index_grids = np.meshgrid(*[np.arange(len(axis["lows"])) for axis in axes], indexing="ij")
+    grid = []
+    for axis, idx in zip(axes, index_grids):
+        flat_idx = idx.ravel()
+        grid.append((axis["lows"][flat_idx], axis["highs"][flat_idx]))
+    return grid
+
+def empty_frame(axes):
+    """축 정의에 맞는 컬럼과 dtype(SampleID는 정수)만 있는 빈 DataFrame."""
+    columns = {"SampleID": np.arange(0)}
+    for axis in axes:
+        columns[axis["name"]] = np.empty(0, dtype=axis["dtype"])
+    return pd.DataFrame(columns)
+
+# === 구간별 독립 난수 스트림 ===
+
+def resolve_seed(seed):
+    """seed가 None이면 OS 엔트로피로 루트 시드를 한 번 정해, 모든 구간/워커가 같은 루트를 공유하도록 합니다."""
+    return np.random.SeedSequence().entropy if seed is None else seed
+
+def bin_generator(seed, component, bin_idx):
+    """
+    (component, bin_idx) 쌍마다 독립된 np.random.Generator를 만듭니다.
+    SeedSequence(seed, spawn_key=(crc32(component), bin_idx))로 파생하므로 구간을 어떤 순서로,
+    몇 개의 프로세스에서 생성하더라도 같은 seed에 대해 각 구간의 난수열은 항상 동일합니다.
+    """
+    spawn_key = (zlib.crc32(component.encode("utf-8")), int(bin_idx))
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed, spawn_key=spawn_key)))
+
+def map_bin_blocks(func, tasks, workers=1):
+    """
+    tasks를 순서대로 func에 적용한 결과를 yield 합니다.
+    workers > 1 이면 ProcessPoolExecutor로 병렬 처리하며, 결과 순서는 tasks 순서와 같습니다.
+    (func, tasks는 pickle 가능해야 하므로 accept 조건에 lambda 대신 모듈 수준 함수를 사용합니다.)
+    """
+    if workers is None or workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield func(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(func, tasks)
+
+def split_bin_blocks(n_bins, workers):
+    """구간 인덱스를 워커 수에 맞춰 연속 블록으로 나눕니다 (워커당 4블록, 단일 워커는 1블록)."""
+    n_blocks = 1 if workers is None or workers <= 1 else min(n_bins, workers * 4)
+    return [block for block in np.array_split(np.arange(n_bins), n_blocks) if len(block)]
+
+def d1_greater_than_d2(values):
+    """Reducer 조건: D1_cm > D2_cm"""
+    return values["D1_cm"] > values["D2_cm"]
+
+def d2_greater_than_d1(values):
+    """Expander 조건: D2_cm > D1_cm"""
+    return values["D2_cm"] > values["D1_cm"]
+
+# === 구간 내 추출 방식 (uniform / sobol / lhs) ===
+
+SAMPLERS = ("uniform", "sobol", "lhs")
+DISCREPANCY_MAX_POINTS = 4096 # 구간별 불일치도 계산에 사용할 최대 점 수 (O(n^2) 계산량 제한)
+
+def require_sampler(sampler):
+    """sampler 이름을 검증하고, sobol/lhs는 scipy.stats.qmc 사용 가능 여부를 확인합니다."""
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Unknown sampler '{sampler}'. Choose from {SAMPLERS}.")
+    if sampler != "uniform":
+        try:
+            from scipy.stats import qmc # noqa: F401
+        except ImportError:
+            raise ImportError(f"'{sampler}' sampler requires scipy (pip install scipy). Use --sampler uniform instead.")
+
+def unit_sampler(sampler, dim, rng):
+    """
+    구간 하나에서 [0,1)^dim 단위 점을 n개씩 반환하는 함수를 만듭니다.
+    uniform : rng에서 축별로 순서대로 균등 추출 (rng.uniform과 동일한 난수열)
+    sobol   : rng로 스크램블한 Sobol 수열. 기각 후 재추출도 같은 수열을 이어서 사용합니다.
+    lhs     : rng로 생성한 Latin hypercube. 재추출할 때마다 새 설계를 만듭니다.
+    """
+    if sampler == "uniform":
+        return lambda n: rng.random((dim, n)).T
+
+    from scipy.stats import qmc
+    if sampler == "sobol":
+        engine = qmc.Sobol(d=dim, scramble=True, seed=rng)
+        def draw(n):
+            with warnings.catch_warnings():
+                # n이 2의 거듭제곱이 아닐 때의 균형성 경고는 무시 (구간별 샘플 수는 임의의 정수)
+                warnings.simplefilter("ignore", UserWarning)
+                return engine.random(n)
+        return draw
+    return lambda n: qmc.LatinHypercube(d=dim, seed=rng).random(n)
+
+def centered_discrepancy(points):
+    """
+    [0,1]^d 점 집합의 centered L2 discrepancy (scipy.stats.qmc.discrepancy(method='CD')와 같은 값).
+    작을수록 점들이 공간을 고르게 채웁니다. 메모리 사용을 제한하기 위해 행 블록 단위로 계산합니다.
+    """
+    n, d = points.shape
+    if n == 0 or d == 0:
+        return 0.0
+    z = np.abs(points - 0.5)
+    term1 = (13.0 / 12.0) ** d
+    term2 = 2.0 / n * np.prod(1 + 0.5 * z - 0.5 * z ** 2, axis=1).sum()
+    term3 = 0.0
+    for start in range(0, n, 256):
+        zi = z[start:start + 256, None, :]
+        xi = points[start:start + 256, None, :]
+        term3 += np.prod(1 + 0.5 * zi + 0.5 * z[None, :, :] - 0.5 * np.abs(xi - points[None, :, :]), axis=2).sum()
+    return float(term1 - term2 + term3 / n ** 2)
+
+def sample_bin_block(task):
+    """
+    연속된 구간 블록의 샘플을 생성합니다 (map_bin_blocks 작업 단위).
+    각 구간은 bin_generator로 얻은 자신만의 난수열만 사용하므로 블록 분할 방식과 무관하게 결과가 같습니다.
+    구간 내 점은 unit_sampler로 만든 [0,1) 단위 점을 구간 [low, high)로 변환해 얻습니다.
+
+    :return: (축 이름 -> 채택된 (반올림 전) 값 배열 dict, 구간별 불일치도 리스트).
+             값 배열은 구간 순서대로 이어 붙여져 있고, 불일치도는 폭이 있는 축만으로 계산합니다 (점 2개 이상인 구간).
+    """
+    component, seed, bin_indices, counts, bounds, scales, accept, max_attempts_per_sample, sampler = task
+    names = list(scales)
+    parts = {name: [] for name in names}
+    discrepancies = []
+
+    for pos, bin_idx in enumerate(bin_indices):
+        n = int(counts[pos])
+        if n == 0:
+            continue
+        rng = bin_generator(seed, component, bin_idx)
+        draw_units = unit_sampler(sampler, len(names), rng)
+        lows = np.array([bounds[name][0][pos] for name in names])
+        highs = np.array([bounds[name][1][pos] for name in names])
+
+        values = {name: np.empty(n) for name in names}
+        units = np.empty((n, len(names)))
+        pending = np.arange(n)
+        for _ in range(max_attempts_per_sample if accept is not None else 1):
+            u = draw_units(len(pending))
+            drawn = {
+                name: (lows[k] + u[:, k] * (highs[k] - lows[k])) * scales[name]
+                for k, name in enumerate(names)
+            }
+            ok = accept(drawn) if accept is not None else np.ones(len(pending), dtype=bool)
+            for name, arr in drawn.items():
+                values[name][pending[ok]] = arr[ok]
+            units[pending[ok]] = u[ok]
+            pending = pending[~ok]
+            if len(pending) == 0:
+                break
+
+        keep = np.ones(n, dtype=bool)
+        keep[pending] = False
+        for name in names:
+            parts[name].append(values[name][keep])
+
+        kept_units = units[keep][:DISCREPANCY_MAX_POINTS][:, highs > lows]
+        if len(kept_units) >= 2:
+            discrepancies.append(centered_discrepancy(kept_units))
+
+    values = {name: np.concatenate(arrs) if arrs else np.empty(0) for name, arrs in parts.items()}
+    return values, discrepancies
+
+def generate_stratified_samples(total_samples, axes, accept=None, seed=None, max_attempts_per_sample=100,
+                                component="sample", workers=1, sampler="uniform"):
+    """
+    축 정의(axes)의 모든 구간 조합에 total_samples를 균등 분배하고, 각 조합의 구간 안에서 sampler 방식으로 추출합니다.
+    결과는 조합 순서대로 정렬되며 SampleID는 1부터 연속으로 부여됩니다.
+    각 구간 조합은 bin_generator(seed, component, 조합 인덱스)의 독립 난수열을 사용하므로
+    workers 수와 관계없이 같은 seed에 대해 비트 단위로 동일한 결과를 만듭니다.
+
+    :param accept: 단위 변환된(반올림 전) 컬럼 배열 dict를 받아 채택 여부 boolean 배열을 반환하는 함수.
+                   기각된 샘플은 자신의 구간 안에서 다시 추출하며, 샘플당 max_attempts_per_sample회까지 시도합니다.
+                   끝내 조건을 만족하지 못한 샘플은 결과에서 제외됩니다.
+                   workers > 1 일 때는 pickle 가능한 모듈 수준 함수여야 합니다 (예: d1_greater_than_d2).
+    :param component: 난수열 파생에 쓰는 컴포넌트 이름 (예: "pipe"). 컴포넌트별로 서로 다른 난수열을 사용합니다.
+    :param workers: 구간 블록을 병렬 생성할 프로세스 수 (1이면 현재 프로세스에서 생성)
+    :param sampler: 구간 내 추출 방식 ("uniform", "sobol", "lhs"). sobol/lhs는 scipy 필요.
+    :return: pandas DataFrame ("SampleID" + 각 축 컬럼).
+             df.attrs["sampler"], df.attrs["discrepancy"] (구간별 centered L2 discrepancy 평균)를 함께 기록합니다.
+    """
+    require_sampler(sampler)
+    grid = build_bin_grid(axes)
+    n_combinations = len(grid[0][0]) if grid else 0
+    if n_combinations == 0 or total_samples <= 0:
+        return empty_frame(axes)
+
+    seed = resolve_seed(seed)
+    counts = split_counts(total_samples, n_combinations)
+    scales = {axis["name"]: axis["scale"] for axis in axes}
+    tasks = [
+        (component, seed, block, counts[block],
+         {axis["name"]: (lows[block], highs[block]) for axis, (lows, highs) in zip(axes, grid)},
+         scales, accept, max_attempts_per_sample, sampler)
+        for block in split_bin_blocks(n_combinations, workers)
+    ]
+    results = list(map_bin_blocks(sample_bin_block, tasks, workers))
+
+    values = {name: np.concatenate([result[name] for result, _ in results]) for name in scales}
+    discrepancies = [d for _, block_discrepancies in results for d in block_discrepancies]
+    n_rows = len(values[axes[0]["name"]])
+    columns = {"SampleID": np.arange(1, n_rows + 1)}
+    for axis in axes:
+        arr = values[axis["name"]]
+        if axis["decimals"] is not None:
+            arr = np.round(arr, axis["decimals"])
+        columns[axis["name"]] = arr.astype(axis["dtype"])
+    df = pd.DataFrame(columns)
+    df.attrs["sampler"] = sampler
+    df.attrs["discrepancy"] = float(np.mean(discrepancies)) if discrepancies else float("nan")
+    return df
+
+def describe_sampling(df):
+    """generate_stratified_samples 결과의 추출 방식과 불일치도를 한 줄 요약으로 반환합니다."""
+    sampler = df.attrs.get("sampler", "uniform")
+    discrepancy = df.attrs.get("discrepancy", float("nan"))
+    if np.isnan(discrepancy):
+        return f"sampler={sampler}, 구간 평균 centered L2 discrepancy=n/a (fewer than 2 points per bin)"
+    return f"sampler={sampler}, 구간 평균 centered L2 discrepancy={discrepancy:.6g} (낮을수록 고르게 분포)"
+
+# === 전수조사(exhaustive) 격자 ===
+
+def exhaustive_axis(name, values_in, scale=1.0, decimals=4, dtype=float):
+    """전수조사용 축을 정의합니다. values_in의 모든 값이 격자에 포함되며 scale로 단위를 변환합니다."""
+    return {"name": name, "values": np.asarray(values_in, dtype=float), "scale": scale, "decimals": decimals, "dtype": dtype}
+
+def count_exhaustive_grid(axes):
+    """조건 마스크 적용 전 전체 격자 조합 수."""
+    return int(np.prod([len(axis["values"]) for axis in axes], dtype=np.int64))
+
+def iter_exhaustive_chunks(axes, accept=None, chunk_size=1_000_000):
+    """
+    모든 축 값의 데카르트 곱을 itertools.product 순서로 chunk_size개씩 나누어 생성합니다.
+    각 청크는 평탄화된 격자 인덱스를 np.unravel_index로 축별 인덱스로 변환해 배열 연산으로 만들며,
+    accept 마스크(예: D1 > D2)를 벡터 연산으로 적용한 뒤 DataFrame으로 yield 합니다.
+    전체 격자를 메모리에 올리지 않으므로 수천만 조합도 청크 크기에 비례하는 메모리로 처리됩니다.
+    SampleID는 조건을 만족한 행에 대해 청크를 넘어 1부터 연속으로 부여됩니다.
+    """
+    shape = tuple(len(axis["values"]) for axis in axes)
+    total = count_exhaustive_grid(axes)
+    next_id = 1
+    for start in range(0, total, chunk_size):
+        flat = np.arange(start, min(start + chunk_size, total), dtype=np.int64)
+        grid_idx = np.unravel_index(flat, shape)
+        values = {axis["name"]: axis["values"][idx] * axis["scale"] for axis, idx in zip(axes, grid_idx)}
+        if accept is not None:
+            ok = accept(values)
+            values = {name: arr[ok] for name, arr in values.items()}
+
+        n_rows = len(next(iter(values.values())))
+        if n_rows == 0:
+            continue
+        columns = {"SampleID": np.arange(next_id, next_id + n_rows)}
+        for axis in axes:
+            arr = values[axis["name"]]
+            if axis["decimals"] is not None:
+                arr = np.round(arr, axis["decimals"])
+            columns[axis["name"]] = arr.astype(axis["dtype"])
+        next_id += n_rows
+        yield pd.DataFrame(columns)
@@ -4,14 +4,45 @@
 import numpy as np
 import pandas as pd
 import argparse
+import os
 from tqdm import tqdm
+try:
+    from .samplingCore import save_samples, resolve_seed, bin_generator, map_bin_blocks, split_bin_blocks
+except ImportError:
+    from samplingCore import save_samples, resolve_seed, bin_generator, map_bin_blocks, split_bin_blocks
 
 def calculate_theta_deg(d1_cm, d2_cm, length_cm):
-    """주어진 형상에 대해 콘의 각도(theta)를 계산합니다."""
-    if length_cm <= 0: return np.inf
-    delta_d = np.abs(d1_cm - d2_cm)
-    if delta_d == 0: return 0.0
-    return 2 * np.degrees(np.arctan(delta_d / (2 * length_cm)))
+    """주어진 형상에 대해 콘의 각도(theta)를 계산합니다. 스칼라와 NumPy 배열 입력을 모두 지원합니다."""
+    delta_d = np.abs(np.asarray(d1_cm, dtype=float) - np.asarray(d2_cm, dtype=float))
+    length_cm = np.asarray(length_cm, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        theta = 2 * np.degrees(np.arctan(delta_d / (2 * length_cm)))
+    theta = np.where(delta_d == 0, 0.0, theta)
+    theta = np.where(length_cm <= 0, np.inf, theta)
+    return float(theta) if theta.ndim == 0 else theta
+
+def theta_bounds_for_bin(item_type, d1_bin_in, d2_bin_in, len_bin_mm):
+    """
+    (D1, D2, Length) 구간 모서리로부터 해당 구간에서 나올 수 있는 theta(deg)의 최소/최대값을 계산합니다.
+    theta는 |D1-D2|에 대해 증가, Length에 대해 감소하므로 구간 모서리 값만으로 범위가 결정됩니다.
+    item_type의 직경 대소 조건을 만족하는 조합이 없으면 None을 반환합니다.
+    """
+    d1_low_cm, d1_high_cm = d1_bin_in[0] * 2.54, d1_bin_in[1] * 2.54
+    d2_low_cm, d2_high_cm = d2_bin_in[0] * 2.54, d2_bin_in[1] * 2.54
+    len_low_cm, len_high_cm = len_bin_mm[0] / 10.0, len_bin_mm[1] / 10.0
+
+    if item_type == 'reducer':
+        delta_max = d1_high_cm - d2_low_cm
+        delta_min = max(0.0, d1_low_cm - d2_high_cm)
+    else:
+        delta_max = d2_high_cm - d1_low_cm
+        delta_min = max(0.0, d2_low_cm - d1_high_cm)
+    if delta_max <= 0:
+        return None
+
+    theta_min = 2 * np.degrees(np.arctan2(delta_min, 2 * len_high_cm))
+    theta_max = 2 * np.degrees(np.arctan2(delta_max, 2 * len_low_cm)) if len_low_cm > 0 else np.inf
+    return theta_min, theta_max
 
 def create_bins_from_spec(spec):
     """(start, end, increment) 스펙으로부터 [low, high) 구간 리스트를 생성합니다."""
@@ -24,76 +55,260 @@ def create_bins_from_spec(spec):
 
     return [(edges[i], edges[i+1]) for i in range(len(edges)-1)]
 
-def generate_structured_by_theta(
+SAMPLER_MODES = ('rejection', 'direct')
+
+def diameter_order_mask(item_type, d1_cm, d2_cm):
+    """item_type별 직경 대소 조건 마스크 (reducer: D1 > D2, expander: D2 > D1)."""
+    return d1_cm > d2_cm if item_type == 'reducer' else d2_cm > d1_cm
+
+def scan_bin_rejection(item_type, d1_bin_in, d2_bin_in, len_bin_mm, theta_deg_ranges, active, samples_per_bin, attempt_budget, rng):
+    """
+    기존 방식: (D1, D2, Length)를 구간 내에서 균등 추출한 뒤 theta를 계산하여
+    활성 theta 범위에 들어오는 샘플만 채택합니다. 모든 난수는 해당 구간 전용 rng(np.random.Generator)에서 추출합니다.
+
+    :return: ({범위 인덱스: [샘플 배열, ...]}, 시도 횟수, 조건을 만족한 추출 수)
+    """
+    needed = {r: samples_per_bin for r in active}
+    found = {r: [] for r in active}
+    attempts = 0
+    hits = 0
+
+    while needed and attempts < attempt_budget:
+        batch_size = int(min(max(256, 4 * sum(needed.values())), attempt_budget - attempts))
+        attempts += batch_size
+
+        d1_cm = rng.uniform(d1_bin_in[0], d1_bin_in[1], size=batch_size) * 2.54
+        d2_cm = rng.uniform(d2_bin_in[0], d2_bin_in[1], size=batch_size) * 2.54
+        len_cm = rng.uniform(len_bin_mm[0], len_bin_mm[1], size=batch_size) / 10.0
+
+        valid = diameter_order_mask(item_type, d1_cm, d2_cm)
+        d1_cm, d2_cm, len_cm = d1_cm[valid], d2_cm[valid], len_cm[valid]
+        theta = calculate_theta_deg(d1_cm, d2_cm, len_cm)
+
+        for r in list(needed):
+            theta_min, theta_max = theta_deg_ranges[r]
+            idx = np.flatnonzero((theta_min <= theta) & (theta < theta_max))
+            hits += idx.size
+            idx = idx[:needed[r]]
+            if idx.size == 0:
+                continue
+            found[r].append(np.column_stack((d1_cm[idx], d2_cm[idx], len_cm[idx], theta[idx])))
+            needed[r] -= idx.size
+            if needed[r] == 0:
+                del needed[r]
+
+    return found, attempts, hits
+
+def scan_bin_direct(item_type, d1_bin_in, d2_bin_in, len_bin_mm, theta_deg_ranges, active, samples_per_bin, attempt_budget, rng):
+    """
+    직접 샘플링 방식: (D1, D2, theta)를 추출하고 콘 관계식 L = |D1-D2| / (2 tan(theta/2))로 길이를 계산합니다.
+    D1, D2는 목표 theta 범위와 길이 구간이 허용하는 |D1-D2| 범위 안에서만 추출하고, theta는 목표 범위와
+    '해당 D1, D2가 길이 구간 안에서 만들 수 있는 theta 범위'의 교집합에서 균등 추출합니다.
+    따라서 계산된 L은 길이 구간 안에 들어와 거의 모든 시도가 채택됩니다 (부동소수점 경계값만 기각).
+    theta가 균등 분포를 따르므로 직경과 길이는 구간 내에서 균등 분포가 아닙니다.
+    모든 난수는 해당 구간 전용 rng(np.random.Generator)에서 추출합니다.
+
+    :return: ({범위 인덱스: [샘플 배열, ...]}, 시도 횟수, 조건을 만족한 추출 수)
+    """
+    len_low_cm, len_high_cm = len_bin_mm[0] / 10.0, len_bin_mm[1] / 10.0
+    found = {r: [] for r in active}
+    attempts = 0
+    hits = 0
+    budget_per_range = attempt_budget // max(len(active), 1)
+
+    for r in active:
+        theta_min, theta_max = theta_deg_ranges[r]
+        # 목표 theta 범위와 길이 구간으로 만들 수 있는 |D1-D2| 범위 (cm)
+        delta_min = 2 * len_low_cm * np.tan(np.radians(theta_min) / 2)
+        delta_max = 2 * len_high_cm * np.tan(np.radians(min(theta_max, 179.999)) / 2)
+        # 가능한 D2가 존재하는 D1 범위로 D1 구간을 좁힘
+        if item_type == 'reducer':
+            d1_lo = max(d1_bin_in[0] * 2.54, d2_bin_in[0] * 2.54 + delta_min)
+            d1_hi = min(d1_bin_in[1] * 2.54, d2_bin_in[1] * 2.54 + delta_max)
+        else:
+            d1_lo = max(d1_bin_in[0] * 2.54, d2_bin_in[0] * 2.54 - delta_max)
+            d1_hi = min(d1_bin_in[1] * 2.54, d2_bin_in[1] * 2.54 - delta_min)
+        if d1_hi <= d1_lo:
+            continue
+
+        needed = samples_per_bin
+        range_attempts = 0
+        while needed > 0 and range_attempts < budget_per_range:
+            batch_size = int(min(max(16, 2 * needed), budget_per_range - range_attempts))
+            range_attempts += batch_size
+
+            d1_cm = rng.uniform(d1_lo, d1_hi, size=batch_size)
+            if item_type == 'reducer':
+                d2_lo = np.maximum(d2_bin_in[0] * 2.54, d1_cm - delta_max)
+                d2_hi = np.minimum(d2_bin_in[1] * 2.54, d1_cm - delta_min)
+            else:
+                d2_lo = np.maximum(d2_bin_in[0] * 2.54, d1_cm + delta_min)
+                d2_hi = np.minimum(d2_bin_in[1] * 2.54, d1_cm + delta_max)
+            d2_cm = rng.uniform(0.0, 1.0, size=batch_size) * (d2_hi - d2_lo) + d2_lo
+            delta_d = np.abs(d1_cm - d2_cm)
+
+            # 길이 구간 [L_low, L_high)에 대응하는 theta 범위와 목표 범위의 교집합
+            theta_lo = np.maximum(theta_min, 2 * np.degrees(np.arctan2(delta_d, 2 * len_high_cm)))
+            theta_hi = np.minimum(theta_max, 2 * np.degrees(np.arctan2(delta_d, 2 * len_low_cm)))
+            theta_draw = rng.uniform(0.0, 1.0, size=batch_size) * (theta_hi - theta_lo) + theta_lo
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                len_cm = delta_d / (2 * np.tan(np.radians(theta_draw) / 2))
+            theta = calculate_theta_deg(d1_cm, d2_cm, len_cm)
+
+            valid = (diameter_order_mask(item_type, d1_cm, d2_cm) & (d2_hi > d2_lo) & (theta_hi > theta_lo)
+                     & (len_low_cm <= len_cm) & (len_cm < len_high_cm)
+                     & (theta_min <= theta) & (theta < theta_max))
+            hits += int(valid.sum())
+            idx = np.flatnonzero(valid)[:needed]
+            if idx.size:
+                found[r].append(np.column_stack((d1_cm[idx], d2_cm[idx], len_cm[idx], theta[idx])))
+                needed -= idx.size
+        attempts += range_attempts
+
+    return found, attempts, hits
+
+def scan_bin_block(block):
+    """
+    구간 작업 블록을 순서대로 탐색합니다 (map_bin_blocks 작업 단위, 프로세스 풀에서 실행될 수 있음).
+    각 구간의 rng는 bin_generator(seed, item_type, 구간 인덱스)로 만들어 블록 분할과 무관하게 같은 난수열을 사용합니다.
+
+    :return: 구간별 (found, attempts, hits) 리스트
+    """
+    results = []
+    for (item_type, sampler_mode, seed, bin_idx, d1_bin_in, d2_bin_in, len_bin_mm,
+         theta_deg_ranges, active, samples_per_bin, attempt_budget) in block:
+        scan_bin = scan_bin_direct if sampler_mode == 'direct' else scan_bin_rejection
+        results.append(scan_bin(
+            item_type, d1_bin_in, d2_bin_in, len_bin_mm,
+            theta_deg_ranges, active, samples_per_bin,
+            attempt_budget=attempt_budget,
+            rng=bin_generator(seed, item_type, bin_idx)
+        ))
+    return results
+
+def generate_structured_by_theta_ranges(
     item_type,
     d1_inch_spec,
     d2_inch_spec,
     length_mm_spec,
-    theta_deg_range,
+    theta_deg_ranges,
     samples_per_bin,
-    seed=None
+    seed=None,
+    max_attempts_per_bin=50000,
+    sampler_mode='rejection',
+    workers=1
 ):
     """
-    D1, D2, Length의 각 구간(bin) 조합을 순차적으로 탐색하며,
-    지정된 단일 theta_deg 범위에 맞는 샘플을 `samples_per_bin` 개수만큼 찾습니다.
+    D1, D2, Length의 각 구간(bin) 조합을 한 번만 탐색하면서, 추출된 샘플을
+    요청된 모든 theta_deg 범위에 동시에 분류하여 범위별로 `samples_per_bin` 개수만큼 찾습니다.
+    구간 모서리로 계산한 theta 최소/최대값이 어떤 범위와도 겹치지 않는 구간은 건너뜁니다.
+    구간당 시도 횟수는 `max_attempts_per_bin` x (겹치는 theta 범위 수)로 제한됩니다.
+    각 구간은 bin_generator(seed, item_type, 구간 인덱스)의 독립 난수열을 사용하므로,
+    `workers` 개의 프로세스로 나누어 탐색해도 같은 seed에 대해 결과가 동일합니다.
+
+    sampler_mode:
+        'rejection' - (D1, D2, L) 균등 추출 후 theta 조건으로 기각 (scan_bin_rejection)
+        'direct'    - (D1, D2, theta) 추출 후 L 계산 (scan_bin_direct)
+
+    :return: (theta 범위 순서대로 정렬된 DataFrame 리스트, 탐색한 구간별 시도/채택 통계 DataFrame)
     """
-    if seed is not None:
-        np.random.seed(seed)
+    if sampler_mode not in SAMPLER_MODES:
+        raise ValueError(f"Unknown sampler_mode '{sampler_mode}'. Choose from {SAMPLER_MODES}.")
+    seed = resolve_seed(seed)
 
     d1_bins_in = create_bins_from_spec(d1_inch_spec)
     d2_bins_in = create_bins_from_spec(d2_inch_spec)
     len_bins_mm = create_bins_from_spec(length_mm_spec)
-    
-    theta_min, theta_max = theta_deg_range
-    
-    all_found_records = []
-    max_attempts_per_bin = 50000
+
+    columns = ["D1_cm", "D2_cm", "Length_cm", "theta_deg"]
+    found_per_range = [[] for _ in theta_deg_ranges]
+    bin_stats = []
+    pruned_bins = 0
 
     total_combinations = len(d1_bins_in) * len(d2_bins_in) * len(len_bins_mm)
-    pbar = tqdm(total=total_combinations, desc=f"Scanning bins for theta {theta_min:.1f}°-{theta_max:.1f}°", leave=False)
-
-    for d1_low_in, d1_high_in in d1_bins_in:
-        for d2_low_in, d2_high_in in d2_bins_in:
-            for len_low_mm, len_high_mm in len_bins_mm:
-                pbar.update(1)
-                
-                found_in_this_bin = []
-                attempts = 0
-                
-                while len(found_in_this_bin) < samples_per_bin and attempts < max_attempts_per_bin:
-                    attempts += 1
-                    
-                    d1_in_sample = np.random.uniform(d1_low_in, d1_high_in)
-                    d2_in_sample = np.random.uniform(d2_low_in, d2_high_in)
-                    len_mm_sample = np.random.uniform(len_low_mm, len_high_mm)
-
-                    d1_cm = d1_in_sample * 2.54
-                    d2_cm = d2_in_sample * 2.54
-                    len_cm = len_mm_sample / 10.0
-
-                    if item_type == 'reducer' and d1_cm <= d2_cm: continue
-                    if item_type == 'expander' and d2_cm <= d1_cm: continue
-                    
-                    theta = calculate_theta_deg(d1_cm, d2_cm, len_cm)
-                    
-                    if theta_min <= theta < theta_max:
-                        record = {
-                            "D1_cm": round(d1_cm, 4),
-                            "D2_cm": round(d2_cm, 4),
-                            "Length_cm": round(len_cm, 4),
-                            "theta_deg": round(theta, 4)
-                        }
-                        found_in_this_bin.append(record)
-
-                if found_in_this_bin:
-                    all_found_records.extend(found_in_this_bin)
-    
+    # 1) 구간 모서리로 도달 가능한 theta 범위를 계산하여 탐색할 구간만 추림 (구간 인덱스는 전체 조합 순서 기준)
+    tasks = []
+    bin_idx = -1
+    for d1_bin_in in d1_bins_in:
+        for d2_bin_in in d2_bins_in:
+            for len_bin_mm in len_bins_mm:
+                bin_idx += 1
+                bounds = theta_bounds_for_bin(item_type, d1_bin_in, d2_bin_in, len_bin_mm)
+                if bounds is None:
+                    pruned_bins += 1
+                    continue
+                bin_theta_min, bin_theta_max = bounds
+                # 이 구간에서 도달 가능한 theta 범위만 대상으로 함 ([theta_min, theta_max) 반열린 구간)
+                active = [r for r, (theta_min, theta_max) in enumerate(theta_deg_ranges)
+                          if theta_min <= bin_theta_max and theta_max > bin_theta_min]
+                if not active:
+                    pruned_bins += 1
+                    continue
+                tasks.append((item_type, sampler_mode, seed, bin_idx, d1_bin_in, d2_bin_in, len_bin_mm,
+                              theta_deg_ranges, active, samples_per_bin, max_attempts_per_bin * len(active)))
+
+    # 2) 구간별 독립 난수열로 탐색 (workers > 1 이면 구간 블록 단위 병렬 처리, 결과는 구간 순서대로 수집)
+    if workers is None or workers <= 1:
+        blocks = [[task] for task in tasks]
+    else:
+        blocks = [[tasks[i] for i in block] for block in split_bin_blocks(len(tasks), workers)]
+
+    pbar = tqdm(total=total_combinations, initial=pruned_bins,
+                desc=f"Scanning bins for {len(theta_deg_ranges)} theta ranges ({sampler_mode}, workers={workers})", leave=False)
+    for block, block_results in zip(blocks, map_bin_blocks(scan_bin_block, blocks, workers)):
+        pbar.update(len(block))
+        for task, (found_in_this_bin, attempts, hits) in zip(block, block_results):
+            _, _, _, _, d1_bin_in, d2_bin_in, len_bin_mm, _, active, _, _ = task
+            accepted = 0
+            for r, parts in found_in_this_bin.items():
+                found_per_range[r].extend(parts)
+                accepted += sum(len(p) for p in parts)
+            bin_stats.append({
+                "D1_bin_in": f"{d1_bin_in[0]:g}-{d1_bin_in[1]:g}",
+                "D2_bin_in": f"{d2_bin_in[0]:g}-{d2_bin_in[1]:g}",
+                "Length_bin_mm": f"{len_bin_mm[0]:g}-{len_bin_mm[1]:g}",
+                "theta_ranges": len(active),
+                "attempts": attempts,
+                "accepted": accepted,
+                "target": samples_per_bin * len(active),
+                "acceptance_rate": round(hits / attempts, 6) if attempts else 0.0
+            })
+
     pbar.close()
+    if pruned_bins:
+        print(f"  -> Skipped {pruned_bins}/{total_combinations} bins that cannot reach any requested theta range.")
 
-    if not all_found_records:
-        return pd.DataFrame(columns=["D1_cm", "D2_cm", "Length_cm", "theta_deg"])
+    range_dfs = []
+    for parts in found_per_range:
+        if parts:
+            range_dfs.append(pd.DataFrame(np.round(np.vstack(parts), 4), columns=columns))
+        else:
+            range_dfs.append(pd.DataFrame(columns=columns))
+    return range_dfs, pd.DataFrame(bin_stats)
 
-    return pd.DataFrame(all_found_records)
+def generate_structured_by_theta(
+    item_type,
+    d1_inch_spec,
+    d2_inch_spec,
+    length_mm_spec,
+    theta_deg_range,
+    samples_per_bin,
+    seed=None
+):
+    """
+    D1, D2, Length의 각 구간(bin) 조합을 순차적으로 탐색하며,
+    지정된 단일 theta_deg 범위에 맞는 샘플을 `samples_per_bin` 개수만큼 찾습니다.
+    """
+    return generate_structured_by_theta_ranges(
+        item_type=item_type,
+        d1_inch_spec=d1_inch_spec,
+        d2_inch_spec=d2_inch_spec,
+        length_mm_spec=length_mm_spec,
+        theta_deg_ranges=[theta_deg_range],
+        samples_per_bin=samples_per_bin,
+        seed=seed
+    )[0][0]
 
 def parse_spec(s):
     """'start,end,increment' 형식의 문자열을 파싱하는 함수"""
@@ -114,13 +329,16 @@ def main():
         formatter_class=argparse.RawTextHelpFormatter
     )
     parser.add_argument("item_type", choices=['reducer', 'expander'], help="생성할 아이템 타입")
-    parser.add_argument("-o", "--output", help="출력 엑셀 파일명. 지정하지 않으면 'item_type_structured_samples.xlsx'로 자동 설정됩니다.")
+    parser.add_argument("-o", "--output", help="출력 파일명 (.npz/.parquet/.feather/.csv/.xlsx). 지정하지 않으면 'item_type_structured_samples.xlsx'로 자동 설정됩니다.")
     parser.add_argument("--d1_spec", type=parse_spec, required=True, help="D1 직경 스펙 (inch): 'start,end,increment'")
     parser.add_argument("--d2_spec", type=parse_spec, required=True, help="D2 직경 스펙 (inch): 'start,end,increment'")
     parser.add_argument("--length_spec", type=parse_spec, required=True, help="길이 스펙 (mm): 'start,end,increment'")
     parser.add_argument("--theta_spec", type=parse_spec, required=True, help="찾고자 하는 Theta 각도 스펙 (deg): 'start,end,increment'")
     parser.add_argument("--samples_per_bin", type=int, default=5, help="각 파라미터 구간(bin) 조합 당 찾을 샘플 수")
     parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--mode", choices=SAMPLER_MODES, default='rejection',
+                        help="샘플링 방식: 'rejection' = (D1, D2, L) 추출 후 theta로 기각, 'direct' = (D1, D2, theta) 추출 후 L 계산 (좁은 theta 구간에 유리)")
+    parser.add_argument("--workers", type=int, default=1, help="구간(bin)을 병렬 탐색할 프로세스 수 (결과는 워커 수와 무관하게 동일)")
     
     args = parser.parse_args()
 
@@ -132,6 +350,7 @@ def main():
     print(f"Length Spec (mm): {args.length_spec}")
     print(f"Target Theta Spec (deg): start={args.theta_spec[0]}, end={args.theta_spec[1]}, step={args.theta_spec[2]}")
     print(f"Samples to find per bin: {args.samples_per_bin}")
+    print(f"Sampler mode: {args.mode}, workers: {args.workers}")
     print("-" * 20)
 
     # Theta 스펙에 따라 탐색할 각도 구간들 생성
@@ -142,23 +361,35 @@ def main():
         theta_ranges_to_scan.append((current_theta, current_theta + theta_step))
         current_theta += theta_step
 
+    # 모든 theta 구간을 한 번의 구간(bin) 탐색으로 동시에 채웁니다.
+    dfs_per_range, bin_stats_df = generate_structured_by_theta_ranges(
+        item_type=args.item_type,
+        d1_inch_spec=args.d1_spec,
+        d2_inch_spec=args.d2_spec,
+        length_mm_spec=args.length_spec,
+        theta_deg_ranges=theta_ranges_to_scan,
+        samples_per_bin=args.samples_per_bin,
+        seed=args.seed,
+        sampler_mode=args.mode,
+        workers=args.workers
+    )
+
+    # 구간별 채택률 보고 (상세 내역은 별도 CSV로 저장)
+    if not bin_stats_df.empty:
+        bin_stats_path = os.path.splitext(output_filename)[0] + "_bin_stats.csv"
+        bin_stats_df.to_csv(bin_stats_path, index=False)
+        rates = bin_stats_df["acceptance_rate"]
+        short_bins = int((bin_stats_df["accepted"] < bin_stats_df["target"]).sum())
+        print(f">>> Acceptance rate per bin ({args.mode}): mean={rates.mean():.4f}, min={rates.min():.4f}, max={rates.max():.4f} "
+              f"over {len(bin_stats_df)} bins; {short_bins} bins below target. Details: '{bin_stats_path}'")
+
     all_found_dfs = []
-    for theta_range in theta_ranges_to_scan:
-        print(f"\n>>> Now searching for theta range: {theta_range[0]:.1f}° <= theta < {theta_range[1]:.1f}°")
-        df_for_range = generate_structured_by_theta(
-            item_type=args.item_type,
-            d1_inch_spec=args.d1_spec,
-            d2_inch_spec=args.d2_spec,
-            length_mm_spec=args.length_spec,
-            theta_deg_range=theta_range,
-            samples_per_bin=args.samples_per_bin,
-            seed=args.seed
-        )
+    for theta_range, df_for_range in zip(theta_ranges_to_scan, dfs_per_range):
         if not df_for_range.empty:
-            print(f">>> Found {len(df_for_range)} samples for this theta range.")
+            print(f">>> Found {len(df_for_range)} samples for theta range {theta_range[0]:.1f}° <= theta < {theta_range[1]:.1f}°.")
             all_found_dfs.append(df_for_range)
         else:
-            print(f">>> No samples found for this theta range.")
+            print(f">>> No samples found for theta range {theta_range[0]:.1f}° <= theta < {theta_range[1]:.1f}°.")
 
     if not all_found_dfs:
         print("\n작업이 완료되었지만, 전체 Theta 범위에서 조건을 만족하는 샘플을 찾지 못했습니다.")
@@ -172,7 +403,7 @@ def main():
     cols = ["SampleID"] + [col for col in final_df.columns if col != "SampleID"]
     final_df = final_df[cols]
     
-    final_df.to_excel(output_filename, index=False)
+    save_samples(final_df, output_filename)
     print(f"\n\n완료: '{output_filename}'에 총 {len(final_df)}개의 샘플을 저장했습니다.")
 
 if __name__ == "__main__":
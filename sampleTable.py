@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+1단계(sampleDataGen)와 2단계(genVtser) 사이의 샘플 테이블 입출력 모듈.
+
+파일 확장자로 형식을 판별합니다.
+    .npz      - NumPy 압축 배열 (추가 의존성 없음, mainPipeline 기본값)
+    .parquet  - Apache Parquet (pyarrow 필요)
+    .feather  - Apache Arrow Feather (pyarrow 필요)
+    .csv      - CSV
+    .xlsx     - Excel (openpyxl 필요, 사람이 읽기 위한 부가 출력용. 1,048,576행 제한)
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+SAMPLE_FORMATS = {
+    "npz": ".npz",
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "csv": ".csv",
+    "xlsx": ".xlsx",
+}
+EXCEL_MAX_DATA_ROWS = 1048575 # 헤더 1행을 제외한 Excel 시트 최대 데이터 행 수
+NPZ_COLUMNS_KEY = "__columns__" # npz 파일에 컬럼 순서를 보존하기 위한 키
+
+def sample_format_of(path):
+    """파일 확장자로부터 샘플 테이블 형식 이름을 반환합니다."""
+    ext = os.path.splitext(path)[1].lower()
+    for fmt, fmt_ext in SAMPLE_FORMATS.items():
+        if ext == fmt_ext:
+            return fmt
+    raise ValueError(f"지원하지 않는 샘플 테이블 형식입니다: '{path}' (지원: {', '.join(SAMPLE_FORMATS.values())})")
+
+def with_sample_format(path, fmt):
+    """path의 확장자를 fmt 형식의 확장자로 바꾼 경로를 반환합니다."""
+    return os.path.splitext(path)[0] + SAMPLE_FORMATS[fmt]
+
+def write_sample_table(df, path):
+    """DataFrame을 확장자에 맞는 형식으로 저장합니다."""
+    fmt = sample_format_of(path)
+    if fmt == "npz":
+        arrays = {}
+        for col in df.columns:
+            arr = df[col].to_numpy()
+            if arr.dtype == object:
+                # 빈 DataFrame(columns=...)의 컬럼은 object dtype이라 allow_pickle 없이 읽을 수 없으므로 숫자 배열로 저장합니다.
+                arr = arr.astype(float)
+            arrays[col] = arr
+        np.savez_compressed(path, **{NPZ_COLUMNS_KEY: np.array(list(df.columns))}, **arrays)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "feather":
+        df.reset_index(drop=True).to_feather(path)
+    elif fmt == "csv":
+        df.to_csv(path, index=False)
+    else:
+        if len(df) > EXCEL_MAX_DATA_ROWS:
+            raise ValueError(f"Excel 시트 최대 행 수({EXCEL_MAX_DATA_ROWS})를 초과합니다 ({len(df)}행). 다른 형식을 사용하세요.")
+        df.to_excel(path, index=False)
+
+def read_sample_table(path):
+    """확장자에 맞는 형식으로 샘플 테이블을 읽어 DataFrame으로 반환합니다."""
+    fmt = sample_format_of(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    if fmt == "npz":
+        with np.load(path, allow_pickle=False) as data:
+            columns = [str(c) for c in data[NPZ_COLUMNS_KEY]]
+            return pd.DataFrame({col: data[col] for col in columns})
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    if fmt == "feather":
+        return pd.read_feather(path)
+    if fmt == "csv":
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+def with_empty_chunk(chunks, columns):
+    """청크가 하나도 없으면 columns만 있는 빈 DataFrame 하나를 대신 내보냅니다."""
+    produced = False
+    for chunk in chunks:
+        produced = True
+        yield chunk
+    if not produced and columns is not None:
+        yield pd.DataFrame(columns=columns)
+
+def write_sample_chunks(chunks, path, columns=None):
+    """
+    DataFrame 청크 이터레이터를 출력 파일에 순차적으로 기록하고 총 행 수를 반환합니다.
+    청크가 하나도 없을 때 columns가 주어지면 헤더(컬럼)만 있는 빈 테이블을 기록합니다.
+    .csv 는 청크 단위로 이어 쓰고, .parquet 는 pyarrow ParquetWriter로 row group 단위로 기록하며,
+    .xlsx 는 openpyxl write-only 모드로 행을 스트리밍합니다 (시트 행 제한 초과 시 ValueError).
+    .npz / .feather 는 파일 형식상 이어 쓰기가 불가능하므로 컬럼 배열을 모은 뒤 한 번에 저장합니다.
+    """
+    fmt = sample_format_of(path)
+    chunks = with_empty_chunk(chunks, columns)
+    total_rows = 0
+
+    if fmt == "csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            for chunk in chunks:
+                chunk.to_csv(f, index=False, header=(total_rows == 0), lineterminator="\n")
+                total_rows += len(chunk)
+        return total_rows
+
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                total_rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return total_rows
+
+    if fmt == "xlsx":
+        from openpyxl import Workbook
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Sheet1")
+        for chunk in chunks:
+            if total_rows == 0:
+                ws.append(list(chunk.columns))
+            if total_rows + len(chunk) > EXCEL_MAX_DATA_ROWS:
+                raise ValueError(f"Excel 시트 최대 행 수({EXCEL_MAX_DATA_ROWS})를 초과합니다. 출력 파일을 .csv/.parquet로 지정하세요.")
+            for row in chunk.itertuples(index=False):
+                ws.append([v.item() if hasattr(v, "item") else v for v in row])
+            total_rows += len(chunk)
+        wb.save(path)
+        return total_rows
+
+    parts = list(chunks)
+    if parts:
+        df = pd.concat(parts, ignore_index=True)
+        write_sample_table(df, path)
+        total_rows = len(df)
+    return total_rows
+
+def save_samples(df, path, excel_copy=False):
+    """
+    샘플 테이블을 저장하고, excel_copy=True 이면 같은 이름의 .xlsx 사본을 사람이 읽기 위한 부가 출력으로 함께 저장합니다.
+
+    :return: 저장된 파일 경로 리스트
+    """
+    write_sample_table(df, path)
+    saved = [path]
+    if excel_copy and sample_format_of(path) != "xlsx":
+        excel_path = with_sample_format(path, "xlsx")
+        if len(df) > EXCEL_MAX_DATA_ROWS:
+            print(f"경고: {len(df)}행은 Excel 시트 행 제한을 넘으므로 Excel 사본을 건너뜁니다.")
+        else:
+            write_sample_table(df, excel_path)
+            saved.append(excel_path)
+    return saved
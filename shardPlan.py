@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+파이프라인 실행 하나를 공유 인프라 없이 여러 기계에 정적으로 나누는 샤드(shard) 계획과 병합.
+
+각 기계는 같은 인자와 --shard i/N으로 mainPipeline을 실행합니다. 1~2단계는 시드로 정해지므로 모든 기계가 같은 샘플과
+같은 VTSER 파일 목록을 만들고, 정렬된 VTSER 파일 목록의 k번째 파일(0부터)은 k % N == i - 1인 샤드에 속합니다
+(라운드 로빈이라 샤드마다 파일 수가 최대 한 개 차이). 샤드는 자기 파일만 남기고 3단계를 실행하며, 4단계는 건너뛰고
+실행 디렉터리에 shard.json(실행 인자와 전체/샤드 파일 목록)을 남깁니다.
+
+병합(python mainPipeline.py merge <샤드 실행 디렉터리>...)은 모든 샤드의 shard.json이 같은 실행인지 확인하고
+03_vactran_txt_output의 .txt/_model.txt를 한 디렉터리로 모은 뒤 4단계를 실행합니다. 4단계는 정렬된 결과 파일 순서로
+SampleID를 매기고 (혼합 시리즈는 슬롯 매니페스트의 SampleID를 사용) 결과 파일 이름과 내용이 샤드와 무관하므로,
+병합한 CSV는 샤드 없이 한 기계에서 실행한 CSV와 같은 SampleID 순서를 갖습니다.
+단일 타입 4단계는 있는 결과 파일을 순서대로 번호 매기므로, 완료 기록(runManifest)이 done이 아닌 파일이 하나라도 있으면
+병합을 중단하고 그 샤드를 --resume으로 다시 실행하도록 안내합니다 (--allow_missing이면 빼고 병합).
+"""
+
+import os
+import json
+import shutil
+from typing import List, Dict, Any, Tuple
+
+import runManifest
+from chunkStore import result_paths
+
+SHARD_INFO_NAME = "shard.json"
+SHARD_RUN_KEYS = ("item_type", "num_samples", "seed", "sampler", "chunk_size", "shards") # 모든 샤드에서 같아야 하는 실행 인자
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """'i/N' -> (i, N) (1 <= i <= N). argparse type으로 사용합니다."""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"샤드는 'i/N' 형식이어야 합니다: {text}")
+    if not 1 <= index <= count:
+        raise ValueError(f"샤드 번호는 1..N이어야 합니다: {text}")
+    return index, count
+
+def shard_files(vtser_files: List[str], shard: Tuple[int, int]) -> List[str]:
+    """정렬된 VTSER 파일 목록 중 shard=(i, N)에 속하는 파일 (k % N == i - 1)"""
+    index, count = shard
+    return [fname for k, fname in enumerate(sorted(vtser_files)) if k % count == index - 1]
+
+def select_shard(vtser_dir: str, shard: Tuple[int, int]) -> Tuple[List[str], List[str]]:
+    """
+    2단계가 만든 VTSER 파일 중 이 샤드에 속하지 않는 파일을 지웁니다 (3단계는 남은 파일만 실행).
+    슬롯 매니페스트 등 VTSER가 아닌 파일은 병합에 필요하므로 그대로 둡니다.
+    :return: (전체 VTSER 파일 목록, 이 샤드의 파일 목록)
+    """
+    all_files = sorted(f for f in os.listdir(vtser_dir) if f.lower().endswith(".vtser"))
+    mine = shard_files(all_files, shard)
+    keep = set(mine)
+    for fname in all_files:
+        if fname not in keep:
+            os.remove(os.path.join(vtser_dir, fname))
+    return all_files, mine
+
+def write_shard_info(run_dir: str, run_args: Dict[str, Any], shard: Tuple[int, int], all_files: List[str], mine: List[str]):
+    info = {**run_args, "shard": shard[0], "shards": shard[1], "files": all_files, "shard_files": mine}
+    with open(os.path.join(run_dir, SHARD_INFO_NAME), "w", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False, indent=1)
+
+def load_shards(run_dirs: List[str]) -> List[Dict[str, Any]]:
+    """
+    샤드 실행 디렉터리들의 shard.json을 읽어 같은 실행의 1..N번 샤드가 하나씩 모두 있는지 확인합니다 (아니면 ValueError).
+    :return: 샤드 번호 순서의 shard.json 내용 리스트 (각각 'run_dir' 추가)
+    """
+    infos = []
+    for run_dir in run_dirs:
+        path = os.path.join(run_dir, SHARD_INFO_NAME)
+        if not os.path.exists(path):
+            raise ValueError(f"샤드 실행 디렉터리가 아닙니다 ({SHARD_INFO_NAME} 없음): {run_dir}")
+        with open(path, "r", encoding="utf-8") as f:
+            infos.append({**json.load(f), "run_dir": run_dir})
+    first = infos[0]
+    for info in infos[1:]:
+        different = [key for key in SHARD_RUN_KEYS + ("files",) if info[key] != first[key]]
+        if different:
+            raise ValueError(f"다른 실행의 샤드입니다 ({', '.join(different)}): {first['run_dir']} / {info['run_dir']}")
+    numbers = sorted(info["shard"] for info in infos)
+    if numbers != list(range(1, first["shards"] + 1)):
+        raise ValueError(f"샤드 1..{first['shards']}이 하나씩 모두 있어야 합니다 (주어진 샤드: {numbers})")
+    return sorted(infos, key=lambda info: info["shard"])
+
+def shard_dirs(info: Dict[str, Any]) -> Tuple[str, str]:
+    """샤드 실행 디렉터리의 (VTSER 디렉터리, 3단계 결과 디렉터리)"""
+    return os.path.join(info["run_dir"], "02_vtser_files"), os.path.join(info["run_dir"], "03_vactran_txt_output")
+
+def missing_results(infos: List[Dict[str, Any]]) -> Dict[int, List[str]]:
+    """
+    샤드마다 자기 파일 중 완료 기록의 마지막 상태가 done이 아니거나 결과가 기록과 다른 파일 (runManifest.completed_files 기준).
+    :return: {샤드 번호: VTSER 파일 목록} (모두 완료면 빈 dict)
+    """
+    missing = {}
+    for info in infos:
+        vtser_dir, txt_dir = shard_dirs(info)
+        done = runManifest.completed_files(vtser_dir, txt_dir, info["shard_files"])
+        not_done = [fname for fname in info["shard_files"] if fname not in done]
+        if not_done:
+            missing[info["shard"]] = not_done
+    return missing
+
+def resume_command(info: Dict[str, Any]) -> str:
+    """샤드 하나를 같은 인자로 이어서 실행하는 명령"""
+    return (f"python mainPipeline.py {info['item_type']} {info['num_samples']} --seed {info['seed']} --sampler {info['sampler']} "
+            f"--chunk_size {info['chunk_size']} --shard {info['shard']}/{info['shards']} --resume \"{info['run_dir']}\"")
+
+def collect_results(infos: List[Dict[str, Any]], txt_dir: str, missing: Dict[int, List[str]]):
+    """샤드마다 missing(missing_results)에 없는 자기 파일의 .txt/_model.txt를 txt_dir로 복사합니다."""
+    os.makedirs(txt_dir, exist_ok=True)
+    for info in infos:
+        _, shard_txt_dir = shard_dirs(info)
+        skip = set(missing.get(info["shard"], []))
+        for fname in info["shard_files"]:
+            if fname in skip:
+                continue
+            for src, dst in zip(result_paths(shard_txt_dir, fname), result_paths(txt_dir, fname)):
+                shutil.copyfile(src, dst)
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VacTran 없이 (Linux 포함) autoVacModule의 스케줄링/재시도/처리량을 실행하고 측정하기 위한 가짜 드라이버.
+
+pywinautoDriver와 같은 함수(launch, attach, open_file, generate_graph, wait_graph,
+show_text_window, copy_selection, read_clipboard, write_clipboard, clipboard_timeout, healthy, popup_text, kill, close,
+init_thread, configure)를 제공합니다. 시스템 클립보드는 모든 인스턴스가 공유하는 CLIPBOARD 하나로 흉내 내므로,
+복사 실패(클립보드가 바뀌지 않음)나 잘린 복사는 autoVacModule 클립보드 브로커가 실제와 같은 방식으로 확인합니다.
+VTSER 파일의 섹션(PIPE/ELBOW/CONE)을 읽어 실제 VacTran 출력과 같은 형식의
+"Data for Conductance N" 텍스트와 "N Pipe(s)/ELBOW(s)/Cone(s)" 모델 텍스트를 만들므로,
+결과는 dataPreprosessor의 파서와 seriesRouter로 그대로 파싱됩니다. 수치는 공기(20°C) 기준 근사식으로 계산한
+그럴듯한 값일 뿐 VacTran 결과를 대신하지 않습니다.
+
+단계별 지연 시간과 실패 확률은 PROFILE로 정하고 configure(options)로 바꿉니다. 지연 값은 숫자(고정 초) 또는
+{"dist": "lognormal", "median": m, "sigma": s} / {"dist": "uniform", "low": a, "high": b} 입니다.
+그래프 계산은 PROFILE['cores']개 코어를 동시에 계산 중인 인스턴스들이 나눠 쓰는 것으로 모델링하므로,
+동시 실행 수를 코어 수 이상으로 올리면 파일당 계산 시간이 늘어납니다. 포커스가 필요한 단계(launch, open_file,
+generate_graph, show_text_window, copy_selection)는 autoVacModule이 실제 드라이버와 똑같이 UI_LOCK 안에서 호출합니다.
+모든 지연은 kill()로 즉시 중단되며 (진행 중인 호출은 RuntimeError), p_modal_hang은 예상하지 못한 모달 대화상자 때문에
+텍스트 창 전환이 modal_stall초 동안 멈추는 긴 꼬리(tail) 지연을 만듭니다 (autoVacModule watchdog 시험용).
+
+    python -m vacDriver.fakeDriver SERIES.VTSER   # 가짜 출력 텍스트 확인
+"""
+
+import math
+import time
+import random
+import argparse
+import itertools
+import threading
+from typing import Dict, Any, List, Optional
+
+try:
+    from .waitLog import POLL_INTERVAL, record_wait
+except ImportError:
+    from waitLog import POLL_INTERVAL, record_wait
+
+DEFAULT_PROFILE = {
+    "seed": None, # 정수면 같은 파일, 같은 시도 횟수(실행 내)에 같은 지연/실패가 나옵니다. None이면 실행(configure)마다 무작위.
+    "time_scale": 1.0, # 모든 지연에 곱하는 배율 (예: 0.05면 20배 빠른 시뮬레이션)
+    "cores": 4, # 그래프 계산에 쓰는 CPU 코어 수
+    "launch": {"dist": "lognormal", "median": 2.5, "sigma": 0.3}, # 프로세스 시작 ~ 첫 창 (포커스)
+    "attach": {"dist": "lognormal", "median": 0.5, "sigma": 0.4}, # 메인 창 탐색
+    "popup": {"dist": "uniform", "low": 0.2, "high": 0.6}, # 시작/열기 직후 오류 팝업 닫기 (포커스)
+    "open_file": {"dist": "lognormal", "median": 0.8, "sigma": 0.2}, # 웜 인스턴스 파일 열기 (포커스)
+    "graph_keys": {"dist": "lognormal", "median": 1.0, "sigma": 0.15}, # 그래프 생성 키 입력 (포커스)
+    "graph_per_section": {"dist": "lognormal", "median": 0.08, "sigma": 0.3}, # 섹션당 그래프 계산 (코어 1개 기준)
+    "extract": {"dist": "lognormal", "median": 0.9, "sigma": 0.2}, # 텍스트 창 전환, 창마다 (포커스)
+    "copy": 0.03, # 전체 선택 + 복사 키 입력 한 번 (포커스)
+    "close": 0.2, # 프로세스 종료
+    "attach_timeout": 20, # 메인 창이 나타나지 않을 때 실패까지 걸리는 시간
+    "graph_timeout": 30, # 그래프 계산이 끝나지 않을 때 대기 상한
+    "clipboard_timeout": 5.0, # 클립보드 브로커가 복사 실패로 판단할 때까지 기다리는 시간
+    "modal_stall": 300, # 모달 대화상자가 뜬 인스턴스에서 텍스트 창 전환이 실패할 때까지 멈춰 있는 시간
+    "p_launch_failure": 0.01, # 메인 창이 나타나지 않음 (attach 실패)
+    "p_error_popup": 0.05, # 시작/열기 직후 오류 팝업
+    "p_graph_hang": 0.01, # 그래프 계산이 끝나지 않고 창이 응답하지 않음 (이후 복사 실패, 상태 확인 실패)
+    "p_modal_hang": 0.0, # 그래프 생성 키 입력 중 예상하지 못한 모달 대화상자가 뜸 (이후 텍스트 창 전환이 modal_stall초 동안 멈춘 뒤 실패)
+    "p_clipboard_failure": 0.01, # 텍스트 창 하나의 복사 키 입력이 무시됨 (클립보드가 바뀌지 않음)
+    "p_overload_failure": 0.0, # 살아 있는 인스턴스가 cores개를 넘을 때 초과 인스턴스 하나당 더해지는 복사 실패 확률 (UI 응답 지연)
+    "p_partial_text": 0.0, # 복사 한 번의 텍스트가 중간에 잘림 (창이 아직 채워지는 중, 오류 없이 클립보드에 들어감)
+    "p_crash": 0.005, # 파일 하나를 처리한 뒤 프로세스가 종료됨 (웜 풀 상태 확인 실패)
+}
+PROFILE = dict(DEFAULT_PROFILE)
+
+PRESSURES_TORR = [10 ** (exponent / 4) for exponent in range(-16, 9)] # 1E-4 ~ 1E+2 Torr, 25점
+MOLECULAR_LPS_PER_CM2 = 11.6 # 공기 20°C 오리피스 분자류 컨덕턴스 (L/s/cm²)
+VISCOUS_LPS_COEF = 182.0 # 공기 20°C 장관 층류 컨덕턴스 C = 182 D^4 P / L (L/s, D/L cm, P Torr)
+KNUDSEN_A, KNUDSEN_B = 192.0, 237.0 # 전이 영역 보정 (1 + A D P) / (1 + B D P)
+
+STATE_LOCK = threading.Lock()
+STATE = {'computing': 0, 'live': 0, 'attempts': {}}
+PIDS = itertools.count(40001)
+CLIPBOARD = {'text': ""} # 모든 인스턴스가 공유하는 시스템 클립보드
+MODAL_POPUP = "VacTran: Run-time error '6': Overflow" # p_modal_hang 대화상자 제목/내용
+
+def configure(options: Optional[Dict[str, Any]]):
+    """PROFILE을 DEFAULT_PROFILE에 options를 덮어쓴 값으로 바꾸고 파일별 시도 횟수를 초기화합니다 (알 수 없는 키는 ValueError)."""
+    unknown = set(options or {}) - set(DEFAULT_PROFILE)
+    if unknown:
+        raise ValueError(f"알 수 없는 fake 드라이버 설정: {', '.join(sorted(unknown))} (가능: {', '.join(DEFAULT_PROFILE)})")
+    PROFILE.clear()
+    PROFILE.update(DEFAULT_PROFILE)
+    PROFILE.update(options or {})
+    if PROFILE["seed"] is None:
+        PROFILE["seed"] = random.SystemRandom().randrange(1 << 32)
+    with STATE_LOCK:
+        STATE['attempts'].clear()
+
+
+def init_thread():
+    pass
+
+
+# === VTSER 읽기와 가짜 출력 텍스트 ===
+
+def read_vtser_sections(path: str) -> List[Dict[str, str]]:
+    """VTSER 파일의 [0], [1], ... 섹션을 {키: 값} 리스트로 읽습니다 ([General] 제외)."""
+    sections = []
+    current = None
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('[') and line.endswith(']'):
+                current = None if line == '[General]' else {}
+                if current is not None:
+                    sections.append(current)
+            elif '=' in line and current is not None:
+                key, value = line.split('=', 1)
+                current[key] = value
+    return sections
+
+
+def tube_model(diameter: float, length: float) -> Dict[str, float]:
+    """원형 관 (직경, 길이 cm)의 분자류/층류 근사 값"""
+    alpha = 1.0 / (1.0 + 3.0 * length / (4.0 * diameter)) # 긴 관 투과 확률 근사
+    area = math.pi * diameter ** 2 / 4.0
+    friction = 0.02 * (1.0 + diameter / (length + diameter))
+    return {
+        'alpha': alpha,
+        'molecular_lps': MOLECULAR_LPS_PER_CM2 * area * alpha,
+        'viscous_coef': VISCOUS_LPS_COEF * diameter ** 4 / length,
+        'friction': friction,
+        'k_total': 0.5 + 1.0 + friction * length / diameter,
+        'viscous_above': 0.5 / diameter, # D/λ > 100
+        'molecular_below': 0.005 / diameter, # D/λ < 1
+        'volume_l': area * length / 1000.0,
+    }
+
+
+def conductance_lpm(model: Dict[str, float], diameter: float, pressure: float) -> float:
+    """분자류 + 층류 합성 컨덕턴스 (Liters/Minute)"""
+    knudsen = (1.0 + KNUDSEN_A * diameter * pressure) / (1.0 + KNUDSEN_B * diameter * pressure)
+    return (model['viscous_coef'] * pressure + model['molecular_lps'] * knudsen) * 60.0
+
+
+def section_geometry(section: Dict[str, str]):
+    """섹션 -> (컴포넌트, 수량, 계산용 직경, 계산용 길이)"""
+    component = section.get('Description', 'PIPE').upper()
+    quantity = max(int(float(section.get('Quantity', '1'))), 1)
+    diameter = float(section['Diameter'])
+    if component == 'ELBOW':
+        # 곡률 반경 1.5D 중심선 길이를 등가 관 길이로 사용
+        angle = float(section.get('BendAngle', '90'))
+        length = quantity * max(1.5 * diameter * math.radians(angle), 0.1 * diameter)
+    elif component == 'CONE':
+        d1, d2 = float(section['EntranceDiameter']), float(section['ExitDiameter'])
+        diameter = (2.0 * d1 ** 2 * d2 ** 2 / (d1 + d2)) ** (1.0 / 3.0) # 분자류 등가 직경
+        length = float(section['ModelLength'])
+    else:
+        length = quantity * float(section['ModelLength'])
+    return component, quantity, diameter, length
+
+
+def format_geometry_line(section: Dict[str, str]) -> str:
+    component, quantity, _, _ = section_geometry(section)
+    if component == 'ELBOW':
+        return f"{quantity} ELBOW(s), {float(section['BendAngle']):.1f} Degrees, D= {float(section['Diameter']):.4f} Cm"
+    if component == 'CONE':
+        return (f"{quantity} CONE, L= {float(section['ModelLength']):.4f} Cm, "
+                f"Entrance D= {float(section['EntranceDiameter']):.4f} , Exit D= {float(section['ExitDiameter']):.4f} Cm")
+    return f"{quantity} PIPE, L= {float(section['ModelLength']):.4f} Cm, D= {float(section['Diameter']):.4f} Cm"
+
+
+def conductance_text(sections: List[Dict[str, str]]) -> str:
+    """Main Text Window 형식: 섹션마다 "Data for Conductance N", 형상 줄, "k) 압력, 컨덕턴스" 줄"""
+    lines = ["VacTran 3 - Conductance Data", ""]
+    for index, section in enumerate(sections, start=1):
+        _, _, diameter, length = section_geometry(section)
+        model = tube_model(diameter, length)
+        lines.append(f"Data for Conductance {index}")
+        lines.append(format_geometry_line(section))
+        lines.append("Pressure (Torr), Conductance (Liters/Minute)")
+        lines.extend(f"{k}) {p:.4E}, {conductance_lpm(model, diameter, p):.4E}" for k, p in enumerate(PRESSURES_TORR, start=1))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def model_block(section: Dict[str, str]) -> List[str]:
+    """Series Text Window 형식의 섹션 하나 (pipe/elbow/reducerPrepro의 블록 파서가 읽는 항목 포함)"""
+    component, quantity, diameter, length = section_geometry(section)
+    model = tube_model(diameter, length)
+    common_tail = [
+        f"   Molecular Flow Conductance= {model['molecular_lps'] * 60.0:.4E} Liters/Minute",
+        f"   Viscous flow region at pressures > {model['viscous_above']:.4E} Torr",
+        f"   Molecular flow region at pressures < {model['molecular_below']:.4E} Torr",
+    ]
+    if component == 'ELBOW':
+        angle = float(section['BendAngle'])
+        return [
+            f"{quantity} ELBOW(s)",
+            f"   Diameter = {diameter:.4f} Cm",
+            f"   Bend Angle = {angle:.1f} Degrees",
+            f"   Volume = {model['volume_l']:.4E} Liters",
+            f"   Viscous flow elbow K factor = {0.2 + 0.3 * angle / 90.0:.4f}",
+            f"   Viscous flow Total K factor = {quantity * (0.2 + 0.3 * angle / 90.0):.4f}",
+            f"   Long tube alpha = {model['alpha']:.4E}",
+        ] + common_tail
+    if component == 'CONE':
+        d1, d2 = float(section['EntranceDiameter']), float(section['ExitDiameter'])
+        cone_length = float(section['ModelLength'])
+        beta = min(d1, d2) / max(d1, d2)
+        theta = math.degrees(2.0 * math.atan(abs(d1 - d2) / (2.0 * cone_length)))
+        k_entrance = 0.5 * (1.0 - beta ** 2) if d2 < d1 else 0.0
+        k_exit = (1.0 - beta ** 2) ** 2 if d2 > d1 else 0.0
+        k_body = model['friction'] * cone_length / diameter
+        exit_alpha = 1.0 / (1.0 + 0.5 * (1.0 - beta))
+        combined = 1.0 / (1.0 / model['alpha'] + 1.0 / exit_alpha - 1.0)
+        sonic_co = 0.6 + 0.25 * beta
+        return [
+            f"{quantity} Cone(s)",
+            f"   Entrance Diameter = {d1:.4f} Cm",
+            f"   Exit Diameter = {d2:.4f} Cm",
+            f"   Length = {cone_length:.4f} Cm",
+            f"   Volume = {math.pi * cone_length * (d1 ** 2 + d1 * d2 + d2 ** 2) / 12000.0:.4E} Liters",
+            f"   Average diameter= {(d1 + d2) / 2.0:.4f} Cm",
+            f"   Beta (small diameter/large diameter)= {beta:.4f}",
+            f"   Theta (cone angle)= {theta:.4f} Degrees",
+            f"   Zero Angle Cone Factor= {(1.0 + beta + beta ** 2) / 3.0:.4f}",
+            f"   Viscous flow entrance K factor = {k_entrance:.4f}",
+            f"   Viscous flow body K factor = {k_body:.4f}",
+            f"   Viscous flow exit K factor = {k_exit:.4f}",
+            f"   Viscous flow Total K factor = {k_entrance + k_body + k_exit:.4f}",
+            f"   Friction factor= {model['friction']:.4f}",
+            f"   Molecular flow equivalent diameter= {diameter:.4f} Cm",
+            f"   Sonic Flow coefficient (Co) = {sonic_co:.4f}",
+            f"   Sonic Flow Conductance = {sonic_co * 20.0 * math.pi * min(d1, d2) ** 2 / 4.0 * 60.0:.4E} Liters/Minute",
+            f"   Equiv pipe length for body loss= {cone_length * (diameter / ((d1 + d2) / 2.0)) ** 4:.4f} Cm",
+            f"   Equivalent pipe length for exit loss= {k_exit * diameter / model['friction']:.4f} Cm",
+            f"   Long tube alpha = {model['alpha']:.4E}",
+            f"   Exit loss alpha = {exit_alpha:.4E}",
+            f"   Combined alpha = {combined:.4E}",
+        ] + common_tail
+    return [
+        f"{quantity} Pipe(s)",
+        f"   Diameter = {diameter:.4f} Cm",
+        f"   Length = {length:.4f} Cm",
+        f"   Volume = {model['volume_l']:.4E} Liters",
+        f"   Viscous flow Total K factor = {model['k_total']:.4f}",
+        f"   Friction factor= {model['friction']:.4f}",
+        f"   Long tube alpha = {model['alpha']:.4E}",
+    ] + common_tail
+
+
+def model_text(sections: List[Dict[str, str]]) -> str:
+    """Series Text Window 형식: 섹션마다 "N Pipe(s)/ELBOW(s)/Cone(s)" 블록"""
+    lines = ["VacTran 3 - Series Model", ""]
+    for section in sections:
+        lines.extend(model_block(section))
+        lines.append("")
+    return "\n".join(lines)
+
+
+# === 지연/실패 모델 ===
+
+def sample_seconds(spec, rng: random.Random) -> float:
+    """지연 값 spec (숫자 또는 분포 dict)에서 초 단위 값을 하나 뽑습니다 (time_scale 적용 전)."""
+    if isinstance(spec, (int, float)):
+        return float(spec)
+    dist = spec.get("dist")
+    if dist == "lognormal":
+        return spec["median"] * math.exp(rng.gauss(0.0, spec["sigma"]))
+    if dist == "uniform":
+        return rng.uniform(spec["low"], spec["high"])
+    raise ValueError(f"알 수 없는 지연 분포: {spec}")
+
+
+def delay(proc_info: Dict[str, Any], label: str, seconds: float, ok: bool = True):
+    """seconds(time_scale 적용 전)만큼 기다리고 대기 기록에 남깁니다. 기다리는 중에 kill()되면 RuntimeError."""
+    start = time.perf_counter()
+    killed = proc_info['fake']['killed'].wait(seconds * PROFILE["time_scale"])
+    record_wait(proc_info, label, time.perf_counter() - start, ok and not killed)
+    if killed:
+        raise RuntimeError(f"VacTran 프로세스가 강제 종료되었습니다 (프로세스 ID: {proc_info['pid']}, fake).")
+
+
+def chance(proc_info: Dict[str, Any], key: str, extra: float = 0.0) -> bool:
+    return proc_info['fake']['rng'].random() < PROFILE[key] + extra
+
+
+def set_dead(proc_info: Dict[str, Any]):
+    """프로세스를 종료된 상태로 바꿉니다 (살아 있는 인스턴스 수 갱신)."""
+    fake = proc_info['fake']
+    with STATE_LOCK:
+        if fake['alive']:
+            fake['alive'] = False
+            STATE['live'] -= 1
+
+
+def load_file(proc_info: Dict[str, Any]):
+    """proc_info['in_path']를 읽고, (seed, 파일 이름, 시도 횟수)로 이 파일 처리의 난수 생성기를 만듭니다."""
+    with STATE_LOCK:
+        attempt = STATE['attempts'].get(proc_info['fname'], 0)
+        STATE['attempts'][proc_info['fname']] = attempt + 1
+    fake = proc_info['fake']
+    fake.update({
+        'rng': random.Random(f"{PROFILE['seed']}:{proc_info['fname']}:{attempt}"),
+        'sections': read_vtser_sections(proc_info['in_path']),
+        'hung': False,
+        'modal': None,
+        'window': None,
+        'copy_ignored': False,
+    })
+
+
+def dismiss_popup(proc_info: Dict[str, Any]):
+    start = time.perf_counter()
+    if chance(proc_info, "p_error_popup"):
+        print(f"  -> Error popup detected: 'Error' (fake). Pressing ENTER. (Attempt 1)")
+        delay(proc_info, "popup_close", sample_seconds(PROFILE["popup"], proc_info['fake']['rng']))
+    record_wait(proc_info, "popup_check", time.perf_counter() - start)
+
+
+# === 드라이버 함수 ===
+
+def launch(proc_info: Dict[str, Any]):
+    proc_info.update({'pid': next(PIDS), 'fake': {'alive': True, 'killed': threading.Event()}})
+    with STATE_LOCK:
+        STATE['live'] += 1
+    load_file(proc_info)
+    delay(proc_info, "launch_window", sample_seconds(PROFILE["launch"], proc_info['fake']['rng']))
+    dismiss_popup(proc_info)
+
+
+def attach(proc_info: Dict[str, Any]):
+    if chance(proc_info, "p_launch_failure"):
+        delay(proc_info, "main_window", PROFILE["attach_timeout"], ok=False)
+        set_dead(proc_info)
+        raise RuntimeError(f"VacTran 메인 윈도우를 찾지 못했습니다 (프로세스 ID: {proc_info['pid']}, fake).")
+    delay(proc_info, "main_window", sample_seconds(PROFILE["attach"], proc_info['fake']['rng']))
+
+
+def open_file(proc_info: Dict[str, Any]):
+    load_file(proc_info)
+    delay(proc_info, "open_file", sample_seconds(PROFILE["open_file"], proc_info['fake']['rng']))
+    dismiss_popup(proc_info)
+
+
+def generate_graph(proc_info: Dict[str, Any]):
+    fake = proc_info['fake']
+    delay(proc_info, "ui_settle", sample_seconds(PROFILE["graph_keys"], fake['rng']))
+    fake['hung'] = chance(proc_info, "p_graph_hang")
+    if chance(proc_info, "p_modal_hang"):
+        fake['modal'] = MODAL_POPUP
+
+
+def wait_graph(proc_info: Dict[str, Any]):
+    """그래프 계산: 섹션 수에 비례하는 계산량을 동시에 계산 중인 인스턴스들과 PROFILE['cores']개 코어로 나눠 처리합니다."""
+    fake = proc_info['fake']
+    work = sum(sample_seconds(PROFILE["graph_per_section"], fake['rng']) for _ in fake['sections'])
+    work = math.inf if fake['hung'] else work * PROFILE["time_scale"]
+    timeout = PROFILE["graph_timeout"] * PROFILE["time_scale"]
+    start = time.perf_counter()
+    with STATE_LOCK:
+        STATE['computing'] += 1
+    try:
+        while work > 0 and time.perf_counter() - start < timeout:
+            step = min(POLL_INTERVAL, work, timeout)
+            if fake['killed'].wait(step):
+                break
+            with STATE_LOCK:
+                work -= step * min(1.0, PROFILE["cores"] / STATE['computing'])
+    finally:
+        with STATE_LOCK:
+            STATE['computing'] -= 1
+    ok = work <= 0
+    if not ok and not fake['killed'].is_set():
+        print(f"    [wait] graph_compute: {PROFILE['graph_timeout']}s timeout ({proc_info['fname']}): fake graph hang")
+    record_wait(proc_info, "graph_compute", time.perf_counter() - start, ok)
+
+
+def show_text_window(proc_info: Dict[str, Any], window: str):
+    """텍스트 창("conductance" 또는 "model")으로 전환하고, 이 창의 복사가 무시될지(p_clipboard_failure) 정합니다."""
+    fake = proc_info['fake']
+    if fake['modal']:
+        delay(proc_info, f"{window}_window", PROFILE["modal_stall"], ok=False)
+        raise RuntimeError(f"대화상자 '{fake['modal']}' 때문에 텍스트 창으로 전환하지 못했습니다 ({window}).")
+    delay(proc_info, f"{window}_window", sample_seconds(PROFILE["extract"], fake['rng']))
+    overload = PROFILE["p_overload_failure"] * max(0, STATE['live'] - PROFILE["cores"])
+    fake['window'] = window
+    fake['copy_ignored'] = fake['hung'] or chance(proc_info, "p_clipboard_failure", overload)
+    if window == "model" and chance(proc_info, "p_crash"):
+        set_dead(proc_info) # 열려 있는 텍스트 창은 복사되지만 다음 상태 확인에서 실패
+
+
+def copy_selection(proc_info: Dict[str, Any]):
+    """현재 텍스트 창 내용을 공유 클립보드에 복사합니다 (무시되거나 p_partial_text 확률로 잘린 내용)."""
+    fake = proc_info['fake']
+    delay(proc_info, "copy_keys", PROFILE["copy"])
+    if fake['copy_ignored']:
+        return
+    sections = fake['sections']
+    text = conductance_text(sections) if fake['window'] == "conductance" else model_text(sections)
+    if chance(proc_info, "p_partial_text"):
+        text = text[:int(len(text) * fake['rng'].uniform(0.1, 0.9))]
+    with STATE_LOCK:
+        CLIPBOARD['text'] = text
+
+
+def read_clipboard() -> str:
+    with STATE_LOCK:
+        return CLIPBOARD['text']
+
+
+def write_clipboard(text: str):
+    with STATE_LOCK:
+        CLIPBOARD['text'] = text
+
+
+def clipboard_timeout() -> float:
+    """복사 대기 상한. 클립보드 브로커는 실제 시간 간격으로 폴링하므로 time_scale을 적용하지 않습니다."""
+    return PROFILE["clipboard_timeout"]
+
+
+def healthy(proc_info: Dict[str, Any]) -> bool:
+    fake = proc_info.get('fake', {})
+    return fake.get('alive', False) and not fake.get('hung', False) and not fake.get('modal')
+
+
+def popup_text(proc_info: Dict[str, Any]) -> Optional[str]:
+    return proc_info.get('fake', {}).get('modal')
+
+
+def kill(proc_info: Dict[str, Any]):
+    fake = proc_info.get('fake')
+    if fake is not None and fake.get('alive'):
+        set_dead(proc_info)
+        fake['killed'].set()
+
+
+def close(proc_info: Dict[str, Any]):
+    fake = proc_info.get('fake')
+    if fake is not None and fake.get('alive'):
+        delay(proc_info, "process_exit", sample_seconds(PROFILE["close"], fake['rng']))
+        set_dead(proc_info)
+        print(f"  -> Closed process for: {proc_info['fname']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VTSER 파일 하나에 대한 가짜 VacTran 출력(Conductance/모델 텍스트)을 출력합니다.")
+    parser.add_argument("vtser_path", help="VTSER 파일 경로")
+    parser.add_argument("--model", action="store_true", help="Conductance 텍스트 대신 Series(모델) 텍스트 출력")
+    args = parser.parse_args()
+    sections = read_vtser_sections(args.vtser_path)
+    print(model_text(sections) if args.model else conductance_text(sections))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+실제 VacTran 3을 pywinauto 키 입력과 클립보드로 조작하는 Windows 드라이버.
+
+드라이버는 아래 함수를 가진 모듈이며, autoVacModule.load_driver로 실행 시점에 불러옵니다
+(그래서 pywinauto/clipboard가 없는 Linux에서도 autoVacModule 자체는 import됩니다).
+모든 함수는 autoVacModule이 만든 proc_info(in_path, fname, waits 등)를 받아 필요한 상태를 추가합니다.
+
+    launch(proc_info)                    파일 하나로 프로세스 시작, 첫 창 대기, 오류 팝업 닫기 (포커스 필요) -> proc_info['pid']
+    attach(proc_info)                    메인 창 찾기 (포커스 불필요)
+    open_file(proc_info)                 실행 중인 인스턴스에 proc_info['in_path']를 불러오기 (웜 풀, 포커스 필요)
+    generate_graph(proc_info)            그래프 생성 키 입력 (포커스 필요)
+    wait_graph(proc_info)                그래프 계산이 끝날 때까지 대기 (포커스 불필요)
+    show_text_window(proc_info, window)  "conductance"(Main Text Window) 또는 "model"(Series Text Window) 텍스트 창으로 전환 (포커스 필요)
+    copy_selection(proc_info)            현재 텍스트 창 전체 선택 + 복사 키 입력 (포커스 필요)
+    read_clipboard() / write_clipboard(text) / clipboard_timeout()
+                                         시스템 클립보드 읽기/쓰기, 복사 대기 상한 (표식/폴링/구조 확인은 autoVacModule 클립보드 브로커)
+    healthy(proc_info)                   웜 인스턴스 상태 확인
+    popup_text(proc_info)                메인 창이 아닌 대화상자의 제목/내용 (watchdog 기록용, 다른 스레드에서 호출)
+    kill(proc_info)                      멈춘 프로세스 강제 종료 (watchdog, 다른 스레드에서 호출)
+    close(proc_info)                     프로세스 종료
+    init_thread()                        작업 스레드 초기화
+    configure(options)                   드라이버 옵션 적용
+"""
+
+import os
+import time
+import ctypes
+import clipboard
+from pywinauto import Application, Desktop, keyboard
+from typing import Dict, Any, Optional
+
+try:
+    from .waitLog import POLL_INTERVAL, record_wait, wait_until
+except ImportError:
+    from waitLog import POLL_INTERVAL, record_wait, wait_until
+
+# === 환경 설정 ===
+VACTRAN_PATH = r"C:\Program Files (x86)\PEC\VacTran 3\VacTran.exe" # VacTran 설치 경로 확인 필요 (configure({'vactran_path': ...})로도 변경 가능)
+# 대기 시간 상한(timeout). 고정 대기 대신 실제 준비 조건을 폴링하고, 조건이 만족되는 즉시 다음 단계로 넘어갑니다.
+LAUNCH_TIMEOUT = 20 # 프로세스 시작 후 창이 나타날 때까지
+GRAPH_TIMEOUT = 30 # 그래프 생성 명령 후 VacTran CPU 사용률이 떨어질 때까지 (계산/렌더링 완료)
+GRAPH_CPU_IDLE_PERCENT = 2.5 # 이 값 이하이면 그래프 계산이 끝난 것으로 판단 (전체 코어 대비 %)
+MENU_TIMEOUT = 2.0 # 메뉴/창 키 입력 후 창 구성이 바뀔 때까지
+UI_SETTLE_QUIET = 0.1 # 키 입력 후 창 구성이 이 시간 동안 변하지 않으면 입력이 처리된 것으로 판단
+CLIPBOARD_TIMEOUT = 5.0 # Ctrl+A/Ctrl+C 후 클립보드 내용이 바뀔 때까지 (autoVacModule 클립보드 브로커가 사용)
+EXIT_TIMEOUT = 5.0 # 프로세스 종료 후 실제로 사라질 때까지
+KEY_GAP = 0.02 # 한 컨트롤 안의 연속 키 입력(방향키) 간격
+OPEN_FILE_KEYS = '^o' # 파일 열기 대화상자 단축키 (Ctrl + O)
+OPEN_TIMEOUT = 10 # 파일 열기 대화상자에서 ENTER 후 대화상자가 닫힐 때까지
+
+def configure(options: Optional[Dict[str, Any]]):
+    """드라이버 옵션을 적용합니다. 지원 키: 'vactran_path'."""
+    global VACTRAN_PATH
+    if options and options.get('vactran_path'):
+        VACTRAN_PATH = options['vactran_path']
+
+
+def init_thread():
+    """작업 스레드에서 UI Automation(COM)을 쓰기 위해 스레드별 COM을 초기화합니다."""
+    try:
+        import comtypes
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+    except Exception:
+        pass
+
+
+def find_main_window(app: Application, timeout: int = 20) -> Any:
+    """VacTran 메인 윈도우를 찾습니다."""
+    end_time = time.time() + timeout
+    while time.time() < end_time:
+        # 새로 시작된 프로세스에 속한 창만 대상으로 검색하여 정확도 향상
+        windows = Desktop(backend="uia").windows(process=app.process, title_re=".*VacTran.*", visible_only=True, enabled_only=True)
+        if windows:
+            try:
+                # connect 호출은 특정 창에 대한 제어권을 더 안정적으로 가져올 수 있습니다.
+                return app.connect(handle=windows[0].handle).window(handle=windows[0].handle)
+            except Exception:
+                # 예외 발생 시 이전 방식으로 재시도
+                return app.window(title_re=".*VacTran.*")
+        time.sleep(POLL_INTERVAL)
+    raise RuntimeError(f"VacTran 메인 윈도우를 찾지 못했습니다 (프로세스 ID: {app.process}). 프로그램이 정상적으로 실행되었는지 확인하세요.")
+
+
+def ui_snapshot(proc_info: Dict[str, Any]):
+    """VacTran 프로세스의 보이는 최상위 창(대화상자, 팝업 메뉴 포함) 핸들 목록. 키 입력 처리 여부 판단에 사용합니다."""
+    return tuple(sorted(w.handle for w in Desktop(backend="win32").windows(process=proc_info['app'].process, visible_only=True)))
+
+
+def wait_ui_settled(proc_info: Dict[str, Any], timeout: float, before=None):
+    """
+    키 입력 후 창 구성이 UI_SETTLE_QUIET초 동안 변하지 않을 때까지 (최대 timeout초) 기다립니다.
+    before(키 입력 전 스냅샷)가 주어지면 먼저 창 구성이 바뀔 때까지 (최대 MENU_TIMEOUT초) 기다립니다.
+    """
+    if before is not None:
+        wait_until(lambda: ui_snapshot(proc_info) != before, MENU_TIMEOUT, "ui_change", proc_info)
+    state = {'snapshot': None, 'since': time.perf_counter()}
+
+    def settled():
+        snapshot = ui_snapshot(proc_info)
+        now = time.perf_counter()
+        if snapshot != state['snapshot']:
+            state['snapshot'], state['since'] = snapshot, now
+        return now - state['since'] >= UI_SETTLE_QUIET
+
+    # timeout은 상한일 뿐이므로 시간이 다 되어도 경고하지 않습니다 (기존 고정 대기와 같은 동작).
+    start = time.perf_counter()
+    deadline = start + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if settled():
+                break
+        except Exception:
+            pass
+        time.sleep(POLL_INTERVAL)
+    record_wait(proc_info, "ui_settle", time.perf_counter() - start)
+
+
+def press(proc_info: Dict[str, Any], keys: str, timeout: float, expect_change: bool = False):
+    """
+    키를 보내고 VacTran이 입력을 처리할 때까지 기다립니다.
+    expect_change=True면 메뉴/창이 열리거나 닫힐 때까지 먼저 기다립니다 (Alt+메뉴, 창 전환 키).
+    """
+    before = ui_snapshot(proc_info) if expect_change else None
+    keyboard.send_keys(keys)
+    wait_ui_settled(proc_info, timeout, before)
+
+
+def copy_selection(proc_info: Dict[str, Any]):
+    """현재 텍스트 창 내용을 Ctrl+A/Ctrl+C로 복사합니다 (클립보드가 바뀌었는지는 autoVacModule 클립보드 브로커가 확인)."""
+    keyboard.send_keys('^a')
+    keyboard.send_keys('^c')
+
+
+def read_clipboard() -> str:
+    return clipboard.paste()
+
+
+def write_clipboard(text: str):
+    clipboard.copy(text)
+
+
+def clipboard_timeout() -> float:
+    return CLIPBOARD_TIMEOUT
+
+
+def dismiss_error_popups(proc_info: Dict[str, Any]):
+    """시작 직후 뜨는 'Error' 팝업을 ENTER로 닫습니다 (키 입력 사용). 팝업 확인에 쓴 전체 시간은 popup_check로 기록합니다."""
+    app = proc_info['app']
+    start = time.perf_counter()
+    for attempt in range(10):
+        try:
+            # 제목에 'Error'가 포함된 창을 찾습니다 (대소문자 무관).
+            # timeout=0.5 로 설정하여 창이 없으면 즉시 다음으로 넘어갑니다.
+            error_window = app.window(title_re=".*[Ee]rror.*", top_level_only=True, timeout=0.5)
+
+            print(f"  -> Error popup detected: '{error_window.window_text()}'. Pressing ENTER. (Attempt {attempt + 1})")
+            error_window.send_keys('{ENTER}')
+            wait_until(lambda: not error_window.exists(timeout=0), 0.5, "popup_close", proc_info)  # 팝업이 닫힐 때까지
+
+        except (TimeoutError, NameError): # pywinauto.timings.TimeoutError, pywinauto.findwindows.ElementNotFoundError
+            # 'Error' 창을 찾지 못한 경우로, 정상적인 상황입니다.
+            # 팝업 확인 루프를 중단하고 다음 단계로 진행합니다.
+            break
+        except Exception as e:
+            # 예기치 못한 다른 오류가 발생하면 루프를 중단합니다.
+            print(f"  -> An unexpected error occurred while checking for popups: {e}")
+            break
+    record_wait(proc_info, "popup_check", time.perf_counter() - start)
+
+
+def launch(proc_info: Dict[str, Any]):
+    """proc_info['in_path'] 시리즈 파일로 VacTran 프로세스를 시작하고, 첫 창이 나타나면 오류 팝업을 닫습니다."""
+    app = Application(backend="uia").start(f'"{VACTRAN_PATH}" "{proc_info["in_path"]}"')
+    proc_info.update({'app': app, 'pid': app.process, 'main_win': None})
+    # 프로세스의 첫 창(메인 창 또는 오류 팝업)이 나타날 때까지 기다립니다.
+    wait_until(lambda: Desktop(backend="uia").windows(process=app.process, visible_only=True),
+               LAUNCH_TIMEOUT, "launch_window", proc_info)
+    dismiss_error_popups(proc_info)
+
+
+def attach(proc_info: Dict[str, Any]):
+    """메인 윈도우를 찾아 proc_info['main_win']에 저장합니다 (탐색 시간 기록)."""
+    start = time.perf_counter()
+    proc_info['main_win'] = find_main_window(proc_info['app'])
+    record_wait(proc_info, "main_window", time.perf_counter() - start)
+
+
+def escape_keys(text: str) -> str:
+    """send_keys 특수 문자(+^%~(){}[])를 중괄호로 감싸 그대로 입력되게 합니다."""
+    return "".join("{%s}" % c if c in "+^%~(){}[]" else c for c in text)
+
+
+def open_file(proc_info: Dict[str, Any]):
+    """실행 중인 VacTran에 파일 열기 대화상자로 proc_info['in_path'] 시리즈 파일을 불러옵니다 (포커스 필요)."""
+    proc_info['main_win'].set_focus()
+    press(proc_info, OPEN_FILE_KEYS, 0.5, expect_change=True)
+    dialog_open = ui_snapshot(proc_info)
+    # 파일 열기 대화상자는 파일 이름 입력란에 포커스가 있으므로 전체 경로를 입력하고 ENTER로 엽니다.
+    keyboard.send_keys(escape_keys(os.path.abspath(proc_info['in_path'])), with_spaces=True)
+    keyboard.send_keys('{ENTER}')
+    if not wait_until(lambda: ui_snapshot(proc_info) != dialog_open, OPEN_TIMEOUT, "open_file", proc_info):
+        raise RuntimeError(f"파일 열기 대화상자가 {OPEN_TIMEOUT}초 안에 닫히지 않았습니다: {proc_info['fname']}")
+    dismiss_error_popups(proc_info)
+    wait_ui_settled(proc_info, 0.5)
+
+
+def generate_graph(proc_info: Dict[str, Any]):
+    """그래프 생성 키 입력을 보냅니다 (포커스 필요)."""
+    proc_info['main_win'].set_focus()
+
+    press(proc_info, '%W', 0.2, expect_change=True)  # Alt + W
+    press(proc_info, '6', 0.2)
+    press(proc_info, '{ENTER}', 0.5)
+    press(proc_info, '%G', 0.5, expect_change=True)  # Alt + G
+    for _ in range(12):
+        keyboard.send_keys('{UP}')
+        time.sleep(KEY_GAP)
+    keyboard.send_keys('{ENTER}')
+
+
+def wait_graph(proc_info: Dict[str, Any]):
+    """그래프 생성 명령 후 VacTran의 CPU 사용률이 GRAPH_CPU_IDLE_PERCENT 이하로 떨어질 때까지 (최대 GRAPH_TIMEOUT초) 기다립니다."""
+    start = time.perf_counter()
+    ok = True
+    try:
+        proc_info['app'].wait_cpu_usage_lower(threshold=GRAPH_CPU_IDLE_PERCENT, timeout=GRAPH_TIMEOUT, usage_interval=0.2)
+    except Exception as e:
+        ok = False
+        print(f"    [wait] graph_compute: {GRAPH_TIMEOUT}s timeout ({proc_info['fname']}): {e}")
+    record_wait(proc_info, "graph_compute", time.perf_counter() - start, ok)
+
+
+def show_text_window(proc_info: Dict[str, Any], window: str):
+    """
+    Main Text Window (window="conductance", Conductance 데이터) 또는 Series Text Window (window="model", 모델 데이터)로
+    전환합니다 (포커스 필요).
+    """
+    proc_info['main_win'].set_focus()
+    if window == "conductance":
+        wait_ui_settled(proc_info, 0.3)
+        press(proc_info, '%W', 0.2, expect_change=True)
+        press(proc_info, '2', 0.2)
+        press(proc_info, '{ENTER}', 0.5)
+    else:
+        wait_ui_settled(proc_info, 0.5)
+        press(proc_info, '%W', 0.3, expect_change=True)
+        press(proc_info, '6', 1.0)
+        press(proc_info, '{ENTER}', 0.2)
+        press(proc_info, '{ENTER}', 0.2)
+        press(proc_info, '{RIGHT}', 0.2)
+        press(proc_info, '{TAB}', 0.5)
+
+
+def window_hung(handle: int) -> bool:
+    """창이 메시지에 응답하지 않는지 (IsHungAppWindow). Windows가 아니면 항상 False."""
+    try:
+        return bool(ctypes.windll.user32.IsHungAppWindow(handle))
+    except AttributeError:
+        return False
+
+
+def healthy(proc_info: Dict[str, Any]) -> bool:
+    """웜 인스턴스 상태 확인: 프로세스 실행 중, 메인 창 존재, 메인 창이 응답함."""
+    try:
+        main_win = proc_info['main_win']
+        return (proc_info['app'].is_process_running() and main_win.exists(timeout=0)
+                and not window_hung(main_win.wrapper_object().handle))
+    except Exception:
+        return False
+
+
+def popup_text(proc_info: Dict[str, Any]) -> Optional[str]:
+    """
+    프로세스의 보이는 최상위 창 중 메인 창이 아닌 창(예상하지 못한 모달 대화상자 등)의 '제목: 내용' (없으면 None).
+    응답하지 않는 창에서도 멈추지 않도록 win32 백엔드(SendMessageTimeout 기반 텍스트 조회)를 사용합니다.
+    """
+    try:
+        main_handle = proc_info['main_win'].wrapper_object().handle
+    except Exception:
+        main_handle = None
+    texts = []
+    for win in Desktop(backend="win32").windows(process=proc_info['pid'], visible_only=True):
+        if win.handle == main_handle:
+            continue
+        body = " ".join(text for child in win.children() for text in child.texts() if text)
+        texts.append(f"{win.window_text()}: {body}".strip())
+    return " | ".join(texts) or None
+
+
+def kill(proc_info: Dict[str, Any]):
+    """멈춘 VacTran 프로세스를 즉시 강제 종료합니다 (창 닫기 요청 없이 TerminateProcess). 진행 중인 드라이버 호출은 실패로 끝납니다."""
+    app = proc_info.get('app')
+    if app and app.is_process_running():
+        app.kill(soft=False)
+
+
+def close(proc_info: Dict[str, Any]):
+    """VacTran 프로세스를 종료합니다 (성공 여부와 관계없이 정리)."""
+    app = proc_info.get('app')
+    if app and app.is_process_running():
+        try:
+            app.kill()
+            wait_until(lambda: not app.is_process_running(), EXIT_TIMEOUT, "process_exit", proc_info)
+            print(f"  -> Closed process for: {proc_info['fname']}")
+        except Exception as e_close:
+            print(f"      Error closing process for {proc_info['fname']}: {e_close}")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VacTran 드라이버 공용 대기 도구.
+
+고정 대기 대신 준비 조건을 폴링하는 wait_until과, 파일 하나를 처리하는 동안의 대기 시간을
+proc_info['waits'][label] = [합계 초, 횟수, timeout 횟수]로 누적하는 기록 함수입니다.
+autoVacModule은 format_waits로 파일별 대기 기록을 출력합니다.
+"""
+
+import time
+from typing import Dict, Any, Optional
+
+POLL_INTERVAL = 0.05 # 준비 조건 폴링 간격
+
+def record_wait(proc_info: Optional[Dict[str, Any]], label: str, elapsed: float, ok: bool = True):
+    """대기 한 번의 실제 소요 시간을 proc_info['waits'][label] = [합계 초, 횟수, timeout 횟수]에 누적합니다."""
+    if proc_info is None:
+        return
+    entry = proc_info.setdefault('waits', {}).setdefault(label, [0.0, 0, 0])
+    entry[0] += elapsed
+    entry[1] += 1
+    entry[2] += 0 if ok else 1
+
+
+def wait_until(condition, timeout: float, label: str, proc_info: Optional[Dict[str, Any]] = None,
+               interval: float = POLL_INTERVAL) -> bool:
+    """
+    condition()이 참이 될 때까지 최대 timeout초 동안 폴링합니다 (condition에서 발생한 예외는 '아직 아님'으로 간주).
+    :return: 조건 만족 여부 (False면 timeout)
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    while True:
+        try:
+            ok = bool(condition())
+        except Exception:
+            ok = False
+        if ok or time.perf_counter() >= deadline:
+            break
+        time.sleep(interval)
+    elapsed = time.perf_counter() - start
+    record_wait(proc_info, label, elapsed, ok)
+    if not ok:
+        print(f"    [wait] {label}: {timeout:.1f}s timeout ({proc_info['fname'] if proc_info else ''})")
+    return ok
+
+
+def format_waits(proc_info: Dict[str, Any]) -> str:
+    """파일 하나의 대기 기록을 'launch_window 0.42s, ui_settle 1.30s (x14)' 형식으로 만듭니다."""
+    parts = []
+    for label, (total, count, timeouts) in proc_info.get('waits', {}).items():
+        part = f"{label} {total:.2f}s" + (f" (x{count})" if count > 1 else "")
+        parts.append(part + (f" [timeout x{timeouts}]" if timeouts else ""))
+    return ", ".join(parts)